@@ -0,0 +1,192 @@
+"""End-to-end throughput benchmarks against the fake Publer API.
+
+Each scenario starts a fresh ``FakePublerServer``, points the client at it
+through ``PUBLER_BASE_URL`` and runs the real code path in a temporary
+workspace:
+
+- apply:     ``planner.apply_plan`` for N approved drafts
+- sync:      ``QueueManager.sync`` with N queued posts
+- analytics: ``insights.sync_insights`` for every account over 4 months, N posts
+
+Reported per scenario and size: request count, errors, requests/sec,
+p50/p99 request latency and total wall time.
+
+    python -m benchmarks.bench_api --sizes 10,1000 --latency 0.005
+    python -m benchmarks.bench_api --scenarios sync --json bench_api.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_publer import FakeConfig, FakePublerServer  # noqa: E402
+from benchmarks.workspace import isolated_workspace  # noqa: E402
+
+
+class RequestRecorder:
+    """Times every ``requests.Session.request`` call while installed."""
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.statuses: list[int] = []
+        self._lock = threading.Lock()
+        self._original: Callable[..., Any] = requests.Session.request
+
+    @contextmanager
+    def installed(self) -> Iterator["RequestRecorder"]:
+        original = self._original
+        recorder = self
+
+        def timed(session: requests.Session, *args: Any, **kwargs: Any) -> requests.Response:
+            start = time.perf_counter()
+            status = 0
+            try:
+                response = original(session, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                with recorder._lock:
+                    recorder.latencies.append(time.perf_counter() - start)
+                    recorder.statuses.append(status)
+
+        requests.Session.request = timed  # type: ignore[method-assign]
+        try:
+            yield self
+        finally:
+            requests.Session.request = original  # type: ignore[method-assign]
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1)))]
+
+
+def scenario_apply(server: FakePublerServer, root: Path, n: int) -> Callable[[], Any]:
+    from src.planner import apply_plan
+    from src.records import PlanItem
+
+    drafts = root / "drafts"
+    drafts.mkdir()
+    accounts = server.state.accounts
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    items = []
+    for i in range(n):
+        account = accounts[i % len(accounts)]
+        path = drafts / f"bench-{i}-{account['provider']}.md"
+        path.write_text(
+            f"---\nplatform: {account['provider']}\nstatus: approved\n---\n"
+            f"# Post\n\nBenchmark post number {i}.\n"
+        )
+        items.append(PlanItem(
+            draft=str(path),
+            platform=account["provider"],
+            account_id=account["id"],
+            scheduled_at=(start + timedelta(minutes=45 * i)).isoformat(),
+        ))
+    plan = {"timezone": "UTC", "items": items}
+    return lambda: apply_plan(plan, job_timeout=120)
+
+
+def scenario_sync(server: FakePublerServer, root: Path, n: int) -> Callable[[], Any]:
+    from src.queue_manager import QueueManager
+
+    server.state.seed_posts(n)
+    return lambda: QueueManager().sync()
+
+
+def scenario_analytics(server: FakePublerServer, root: Path, n: int) -> Callable[[], Any]:
+    from src.insights import sync_insights
+    from src.publer.client import PublerClient, PublerClientConfig
+
+    server.state.seed_posts(n)
+    client = PublerClient(PublerClientConfig(api_key="bench", base_url=server.base_url))
+    today = datetime.now(timezone.utc).date()
+    date_from, date_to = today - timedelta(days=30), today + timedelta(days=90)
+    return lambda: sync_insights(client, server.state.accounts, date_from, date_to)
+
+
+SCENARIOS = {
+    "apply": scenario_apply,
+    "sync": scenario_sync,
+    "analytics": scenario_analytics,
+}
+
+
+def run_scenario(name: str, n: int, config: FakeConfig) -> dict[str, Any]:
+    server = FakePublerServer(config).start()
+    try:
+        with isolated_workspace(server.base_url) as root:
+            run = SCENARIOS[name](server, root, n)
+            recorder = RequestRecorder()
+            with recorder.installed():
+                start = time.perf_counter()
+                run()
+                wall = time.perf_counter() - start
+    finally:
+        server.stop()
+
+    count = len(recorder.latencies)
+    return {
+        "scenario": name,
+        "size": n,
+        "requests": count,
+        "errors": sum(1 for s in recorder.statuses if not 200 <= s < 300),
+        "requests_per_sec": count / wall if wall else 0.0,
+        "p50_ms": _percentile(recorder.latencies, 0.50) * 1000,
+        "p99_ms": _percentile(recorder.latencies, 0.99) * 1000,
+        "wall_s": wall,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark API paths against a fake Publer")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios")
+    parser.add_argument("--sizes", default="10,1000,10000", help="Comma-separated post counts")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake server latency (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Fake server latency jitter (seconds)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--job-delay", type=float, default=0.0, help="Seconds before jobs complete")
+    parser.add_argument("--json", dest="json_out", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_429=args.rate_429,
+        job_delay=args.job_delay,
+    )
+    results = []
+    print(f"{'scenario':10} {'size':>6} {'reqs':>6} {'errs':>5} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'wall s':>8}")
+    for name in args.scenarios.split(","):
+        for size in (int(s) for s in args.sizes.split(",")):
+            r = run_scenario(name.strip(), size, config)
+            results.append(r)
+            print(f"{r['scenario']:10} {r['size']:>6} {r['requests']:>6} {r['errors']:>5} "
+                  f"{r['requests_per_sec']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['wall_s']:>8.2f}")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps({
+            "config": vars(args),
+            "results": results,
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
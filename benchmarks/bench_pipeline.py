@@ -0,0 +1,218 @@
+"""Benchmarks for the file-based pipeline over a synthetic corpus.
+
+Generates ``ideas/`` and ``drafts/`` trees with mixed statuses and
+platforms in a temporary workspace, then times:
+
+- ``drafts.list_ideas``
+- ``drafts.list_drafts``
+- ``planner.get_approved_drafts``
+- ``planner.create_plan_from_approved``
+- ``social.cmd_status``
+
+Each operation runs once cold (in-process parse caches cleared) and
+``--repeat`` times warm. The results include wall time, peak traced memory
+and files opened for reading per call. The Publer API is replaced by the
+local fake server, so results only reflect local work.
+
+    python -m benchmarks.bench_pipeline --sizes 1000,10000 --json pipeline.json
+    python -m benchmarks.bench_pipeline --sizes 1000 --compare pipeline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_publer import FakeConfig, FakePublerServer  # noqa: E402
+from benchmarks.workspace import isolated_workspace  # noqa: E402
+
+IDEA_STATUSES = [("ready", 0.4), ("drafted", 0.5), ("review", 0.1)]
+DRAFT_STATUSES = [("draft", 0.6), ("approved", 0.4)]
+
+
+def generate_corpus(root: Path, n_files: int, seed: int = 0) -> dict[str, int]:
+    """Write about ``n_files`` markdown files: one third ideas, two thirds drafts."""
+    rng = random.Random(seed)
+    ideas_dir = root / "ideas"
+    drafts_dir = root / "drafts"
+    ideas_dir.mkdir(parents=True, exist_ok=True)
+    drafts_dir.mkdir(parents=True, exist_ok=True)
+
+    n_ideas = max(1, n_files // 3)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    counts = {"ideas": 0, "drafts": 0}
+    for i in range(n_ideas):
+        created = (start + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        idea_id = f"{created.replace(':', '-')}__synthetic-idea-{i}"
+        status = rng.choices([s for s, _ in IDEA_STATUSES], [w for _, w in IDEA_STATUSES])[0]
+        source = rng.choice(["prompts:idea.md", "transcripts:call.md#intro", "agents:README.md"])
+        body = " ".join(rng.choice(["agents", "latency", "scale", "python", "ship", "users"])
+                        for _ in range(rng.randint(40, 200)))
+        (ideas_dir / f"{idea_id}.md").write_text(
+            f"---\nid: {idea_id}\nsource: {source}\nstatus: {status}\ntags: []\n"
+            f"created_at: {created}\n---\n{body}\n"
+        )
+        counts["ideas"] += 1
+
+        for platform in ("linkedin", "twitter"):
+            if counts["ideas"] + counts["drafts"] >= n_files:
+                break
+            draft_status = rng.choices([s for s, _ in DRAFT_STATUSES], [w for _, w in DRAFT_STATUSES])[0]
+            (drafts_dir / f"{idea_id}-{platform}.md").write_text(
+                f"---\nidea_id: {idea_id}\nplatform: {platform}\nstatus: {draft_status}\n"
+                f"created_at: {created}\n---\n# Post\n\n{body[:1200 if platform == 'linkedin' else 240]}\n"
+            )
+            counts["drafts"] += 1
+    return counts
+
+
+class ReadCounter:
+    """Counts files opened for reading while installed."""
+
+    def __init__(self) -> None:
+        self.reads = 0
+
+    @contextmanager
+    def installed(self) -> Iterator["ReadCounter"]:
+        original_open = builtins.open
+        counter = self
+
+        def counting_open(file: Any, mode: str = "r", *args: Any, **kwargs: Any) -> Any:
+            if "r" in mode and "+" not in mode:
+                counter.reads += 1
+            return original_open(file, mode, *args, **kwargs)
+
+        builtins.open = counting_open  # type: ignore[assignment]
+        io.open = counting_open  # type: ignore[assignment]
+        try:
+            yield self
+        finally:
+            builtins.open = original_open
+            io.open = original_open
+
+
+def _clear_caches() -> None:
+    import src.drafts
+    import src.planner
+
+    src.drafts._markdown_cache.clear()
+    src.planner._draft_cache.clear()
+
+
+def _measure(fn: Callable[[], Any]) -> dict[str, float]:
+    counter = ReadCounter()
+    tracemalloc.start()
+    with counter.installed(), contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_mb": peak / 1e6, "file_reads": counter.reads}
+
+
+def _operations() -> dict[str, Callable[[], Any]]:
+    import social
+    from src.drafts import list_drafts, list_ideas
+    from src.planner import create_plan_from_approved, get_approved_drafts
+
+    return {
+        "list_ideas": lambda: list_ideas(status="ready"),
+        "list_drafts": lambda: list_drafts(),
+        "get_approved_drafts": lambda: get_approved_drafts(),
+        "create_plan_from_approved": lambda: create_plan_from_approved(start_date="2027-01-01"),
+        "cmd_status": lambda: social.cmd_status(SimpleNamespace()),
+    }
+
+
+def run_size(n_files: int, repeat: int) -> list[dict[str, Any]]:
+    server = FakePublerServer(FakeConfig()).start()
+    results = []
+    try:
+        with isolated_workspace(server.base_url) as root:
+            counts = generate_corpus(root, n_files)
+            for name, fn in _operations().items():
+                _clear_caches()
+                cold = _measure(fn)
+                warm = [_measure(fn) for _ in range(repeat)]
+                best = min(warm, key=lambda m: m["seconds"]) if warm else cold
+                results.append({
+                    "operation": name,
+                    "files": n_files,
+                    "ideas": counts["ideas"],
+                    "drafts": counts["drafts"],
+                    "cold_s": cold["seconds"],
+                    "warm_s": best["seconds"],
+                    "peak_mb": cold["peak_mb"],
+                    "file_reads_cold": cold["file_reads"],
+                    "file_reads_warm": best["file_reads"],
+                })
+    finally:
+        server.stop()
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the file-based pipeline")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated file counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Warm runs per operation")
+    parser.add_argument("--json", dest="json_out", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    baseline: dict[tuple[str, int], dict[str, Any]] = {}
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())
+        baseline = {(r["operation"], r["files"]): r for r in previous["results"]}
+        print(f"Comparing against {args.compare} (commit {previous.get('commit', '?')})")
+
+    results = []
+    header = f"{'operation':26} {'files':>7} {'cold s':>8} {'warm s':>8} {'peak MB':>8} {'reads':>7} {'warm reads':>10}"
+    print(header + ("   Δ cold" if baseline else ""))
+    for size in (int(s) for s in args.sizes.split(",")):
+        for r in run_size(size, args.repeat):
+            results.append(r)
+            line = (f"{r['operation']:26} {r['files']:>7} {r['cold_s']:>8.3f} {r['warm_s']:>8.3f} "
+                    f"{r['peak_mb']:>8.1f} {r['file_reads_cold']:>7} {r['file_reads_warm']:>10}")
+            before = baseline.get((r["operation"], r["files"]))
+            if before and before["cold_s"]:
+                line += f"  {(r['cold_s'] / before['cold_s'] - 1) * 100:+6.1f}%"
+            print(line)
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps({
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "results": results,
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+"""Benchmarks for the pipeline's record types against plain dicts.
+
+Builds N ideas, drafts, plan items and queued posts both as the dicts the
+pipeline used to pass around and as the slotted dataclasses in
+``src.records``, and reports for each:
+
+- memory held by the N records (traced, field values excluded)
+- construction time
+- ``to_dict`` time (the cost of turning records back into JSON shapes)
+
+    python -m benchmarks.bench_records --sizes 10000,100000 --json records.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.records import Draft, Idea, PlanItem, QueuedPost  # noqa: E402
+
+
+def _values(n: int) -> list[dict[str, Any]]:
+    """Field values shared by both representations, so only containers differ."""
+    body = "Benchmark post body " * 20
+    return [
+        {
+            "id": f"idea-{i}",
+            "post_id": str(10_000_000 + i),
+            "path": f"/tmp/drafts/idea-{i}-linkedin.md",
+            "filename": f"idea-{i}-linkedin.md",
+            "source": "prompts:idea.md",
+            "platform": "linkedin",
+            "status": "approved",
+            "created_at": "2026-01-01T09:00:00Z",
+            "scheduled_at": f"2026-02-01T{i % 24:02d}:00:00+00:00",
+            "account_id": f"acct-{i % 8}",
+            "workspace": "default",
+            "content": body,
+        }
+        for i in range(n)
+    ]
+
+
+def _builders() -> dict[str, tuple[Callable[[dict[str, Any]], Any], Callable[[dict[str, Any]], Any]]]:
+    """record type -> (dict builder, dataclass builder)."""
+    return {
+        "Idea": (
+            lambda v: {"id": v["id"], "source": v["source"], "content": v["content"], "status": v["status"],
+                       "path": v["path"]},
+            lambda v: Idea(id=v["id"], source=v["source"], content=v["content"], status=v["status"],
+                           path=v["path"]),
+        ),
+        "Draft": (
+            lambda v: {"filename": v["filename"], "path": v["path"], "idea_id": v["id"], "platform": v["platform"],
+                       "status": v["status"], "created_at": v["created_at"], "content": v["content"]},
+            lambda v: Draft(path=v["path"], idea_id=v["id"], platform=v["platform"], status=v["status"],
+                            created_at=v["created_at"], content=v["content"]),
+        ),
+        "PlanItem": (
+            lambda v: {"draft": v["path"], "platform": v["platform"], "scheduled_at": v["scheduled_at"],
+                       "account_id": v["account_id"], "workspace": v["workspace"]},
+            lambda v: PlanItem(draft=v["path"], platform=v["platform"], scheduled_at=v["scheduled_at"],
+                               account_id=v["account_id"], workspace=v["workspace"]),
+        ),
+        "QueuedPost": (
+            lambda v: {"id": v["post_id"], "text": v["content"], "scheduled_at": v["scheduled_at"],
+                       "network": v["platform"], "platform": v["platform"]},
+            lambda v: QueuedPost(id=v["post_id"], platform=v["platform"], scheduled_at=v["scheduled_at"],
+                                 text=v["content"], account_id=v["account_id"], workspace=v["workspace"]),
+        ),
+    }
+
+
+def _held_mb(build: Callable[[dict[str, Any]], Any], values: list[dict[str, Any]]) -> float:
+    """Traced memory held by one record per value."""
+    gc.collect()
+    tracemalloc.start()
+    records = [build(v) for v in values]
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return held / 1e6
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    """Fastest of ``repeat`` untraced runs of ``fn``."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run_size(n: int, repeat: int) -> list[dict[str, Any]]:
+    values = _values(n)
+    results = []
+    for name, (as_dict, as_record) in _builders().items():
+        records = [as_record(v) for v in values]
+        results.append({
+            "record": name,
+            "n": n,
+            "dict_mb": _held_mb(as_dict, values),
+            "record_mb": _held_mb(as_record, values),
+            "dict_build_s": _best(lambda: [as_dict(v) for v in values], repeat),
+            "record_build_s": _best(lambda: [as_record(v) for v in values], repeat),
+            "to_dict_s": _best(lambda: [record.to_dict() for record in records], repeat),
+        })
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark record dataclasses against dicts")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated record counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement (best is kept)")
+    parser.add_argument("--json", dest="json_out", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'record':11} {'n':>7} {'dict MB':>8} {'rec MB':>8} {'mem':>6} "
+          f"{'dict s':>8} {'rec s':>8} {'to_dict s':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for r in run_size(size, args.repeat):
+            results.append(r)
+            print(f"{r['record']:11} {r['n']:>7} {r['dict_mb']:>8.1f} {r['record_mb']:>8.1f} "
+                  f"{r['record_mb'] / r['dict_mb'] * 100:>5.0f}% "
+                  f"{r['dict_build_s']:>8.3f} {r['record_build_s']:>8.3f} {r['to_dict_s']:>9.3f}")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps({
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "results": results,
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
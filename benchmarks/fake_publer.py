@@ -0,0 +1,314 @@
+"""Local stand-in for the Publer API.
+
+Implements the endpoints this project uses, backed by in-memory state:
+
+- GET    /me, /workspaces, /accounts
+- GET    /posts                        (``state`` and ``account_ids[]`` filters)
+- POST   /posts/schedule               (bulk payload, returns a ``job_id``)
+- GET    /job_status/{id}              (``working`` until ``job_delay`` passes)
+- PUT    /posts/{id}, DELETE /posts/{id}
+- GET    /analytics/{account_id}/post_insights
+
+Latency, random 500s and 429s (with ``Retry-After``) can be injected to
+exercise error handling and measure throughput. Run it standalone and point
+the CLI at it with ``PUBLER_BASE_URL``::
+
+    python -m benchmarks.fake_publer --port 8765 --latency 0.02 --rate-429 0.01
+    PUBLER_BASE_URL=http://127.0.0.1:8765/api/v1 PUBLER_API_KEY=test python social.py queue ls
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = "/api/v1"
+
+
+@dataclass
+class FakeConfig:
+    """Behaviour knobs for the fake server."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_429: float = 0.0
+    job_delay: float = 0.0
+    accounts_per_network: int = 1
+    seed: int = 0
+    # Posts whose text contains this are rejected (keyed by account, like Publer).
+    reject_text: Optional[str] = None
+
+
+class FakePublerState:
+    """In-memory accounts, posts and jobs."""
+
+    def __init__(self, config: FakeConfig) -> None:
+        self.config = config
+        self.lock = threading.Lock()
+        self.random = random.Random(config.seed)
+        self.accounts = [
+            {"id": f"{network}-{i}", "provider": network, "name": f"{network} account {i}"}
+            for network in ("linkedin", "twitter")
+            for i in range(config.accounts_per_network)
+        ]
+        self.posts: dict[str, dict[str, Any]] = {}
+        self.jobs: dict[str, dict[str, Any]] = {}
+        self.request_count = 0
+
+    def seed_posts(self, count: int, state: str = "scheduled") -> None:
+        """Create ``count`` posts spread over the accounts and the next 90 days."""
+        start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        with self.lock:
+            for i in range(count):
+                account = self.accounts[i % len(self.accounts)]
+                post_id = uuid.uuid4().hex[:24]
+                self.posts[post_id] = {
+                    "id": post_id,
+                    "account_id": account["id"],
+                    "network": account["provider"],
+                    "state": state,
+                    "text": f"Seeded post {i} for {account['name']}",
+                    "scheduled_at": (start + timedelta(minutes=37 * i)).isoformat(),
+                }
+
+    def schedule(self, payload: dict[str, Any]) -> dict[str, Any]:
+        bulk = payload.get("bulk", {})
+        created, failures = [], {}
+        known = {a["id"] for a in self.accounts}
+        with self.lock:
+            for post in bulk.get("posts", []):
+                networks = post.get("networks", {})
+                network, content = next(iter(networks.items()), ("", {}))
+                for account in post.get("accounts", []):
+                    if account.get("id") not in known:
+                        failures[account.get("id", "?")] = "Unknown account"
+                        continue
+                    if self.config.reject_text and self.config.reject_text in content.get("text", ""):
+                        failures[account["id"]] = "Post rejected"
+                        continue
+                    post_id = uuid.uuid4().hex[:24]
+                    self.posts[post_id] = {
+                        "id": post_id,
+                        "account_id": account["id"],
+                        "network": network,
+                        "state": bulk.get("state", "scheduled"),
+                        "text": content.get("text", ""),
+                        "scheduled_at": account.get("scheduled_at"),
+                    }
+                    created.append({"id": post_id})
+            job_id = uuid.uuid4().hex
+            self.jobs[job_id] = {
+                "ready_at": time.monotonic() + self.config.job_delay,
+                "payload": {"failures": failures, "posts": created},
+            }
+        return {"job_id": job_id}
+
+    def job_status(self, job_id: str) -> Optional[dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if time.monotonic() < job["ready_at"]:
+            return {"status": "working"}
+        return {"status": "complete", "payload": job["payload"]}
+
+    def list_posts(self, query: dict[str, list[str]]) -> dict[str, Any]:
+        state = (query.get("state") or [None])[0]
+        account_ids = set(query.get("account_ids[]", []))
+        with self.lock:
+            posts = [
+                p for p in self.posts.values()
+                if (not state or p["state"] == state)
+                and (not account_ids or p["account_id"] in account_ids)
+            ]
+        return {"posts": posts, "total": len(posts)}
+
+    def insights(self, account_id: str, query: dict[str, list[str]]) -> dict[str, Any]:
+        date_from = (query.get("from") or ["1970-01-01"])[0]
+        date_to = (query.get("to") or ["9999-12-31"])[0]
+        with self.lock:
+            posts = [p for p in self.posts.values() if p["account_id"] == account_id]
+        rows = []
+        for p in posts:
+            day = (p.get("scheduled_at") or "")[:10]
+            if not date_from <= day <= date_to:
+                continue
+            rng = random.Random(p["id"])
+            impressions = rng.randint(100, 10000)
+            rows.append({
+                "post_id": p["id"],
+                "account_id": account_id,
+                "network": p["network"],
+                "published_at": p["scheduled_at"],
+                "text": p["text"],
+                "impressions": impressions,
+                "reach": int(impressions * rng.uniform(0.5, 0.9)),
+                "engagements": int(impressions * rng.uniform(0.01, 0.08)),
+                "clicks": int(impressions * rng.uniform(0.002, 0.03)),
+                "likes": rng.randint(0, 200),
+                "comments": rng.randint(0, 40),
+                "shares": rng.randint(0, 30),
+            })
+        return {"posts": rows, "total": len(rows)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakePublerServer"
+    # Keep-alive, so client-side connection pooling shows up in the numbers;
+    # without TCP_NODELAY small replies stall on delayed ACKs (~40 ms).
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _reply(self, status: int, body: Any = None, headers: Optional[dict[str, str]] = None) -> None:
+        data = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _handle(self, method: str) -> None:
+        # Always drain the body so an early error reply leaves the kept-alive
+        # connection clean for the next request.
+        body = self._body()
+        state = self.server.state
+        config = state.config
+        with state.lock:
+            state.request_count += 1
+            roll = state.random.random()
+            delay = config.latency + (state.random.uniform(0, config.jitter) if config.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        if not self.headers.get("Authorization", "").startswith("Bearer-API "):
+            return self._reply(401, {"errors": ["Unauthorized"]})
+        if roll < config.rate_429:
+            return self._reply(429, {"errors": ["Too many requests"]}, {"Retry-After": "1"})
+        if roll < config.rate_429 + config.error_rate:
+            return self._reply(500, {"errors": ["Injected failure"]})
+
+        url = urlparse(self.path)
+        if not url.path.startswith(API_PREFIX):
+            return self._reply(404, {"errors": ["Not found"]})
+        parts = url.path[len(API_PREFIX):].strip("/").split("/")
+        query = parse_qs(url.query)
+
+        if method == "GET" and parts == ["me"]:
+            return self._reply(200, {"id": "fake-user", "name": "Fake User"})
+        if method == "GET" and parts == ["workspaces"]:
+            return self._reply(200, [{"id": "fake-workspace", "name": "Fake"}])
+        if method == "GET" and parts == ["accounts"]:
+            return self._reply(200, state.accounts)
+        if method == "GET" and parts == ["posts"]:
+            return self._reply(200, state.list_posts(query))
+        if method == "POST" and parts == ["posts", "schedule"]:
+            return self._reply(200, state.schedule(body))
+        if method == "GET" and len(parts) == 2 and parts[0] == "job_status":
+            status = state.job_status(parts[1])
+            return self._reply(200, status) if status else self._reply(404, {"errors": ["No job"]})
+        if len(parts) == 2 and parts[0] == "posts" and method in ("PUT", "DELETE"):
+            changes = body if method == "PUT" else {}
+            with state.lock:
+                post = state.posts.get(parts[1])
+                if post is not None and method == "DELETE":
+                    del state.posts[parts[1]]
+                elif post is not None:
+                    post.update(changes)
+                    post = dict(post)
+            if post is None:
+                return self._reply(404, {"errors": ["No post"]})
+            return self._reply(204) if method == "DELETE" else self._reply(200, post)
+        if method == "GET" and len(parts) == 3 and parts[0] == "analytics" and parts[2] == "post_insights":
+            return self._reply(200, state.insights(parts[1], query))
+        return self._reply(404, {"errors": ["Not found"]})
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+class FakePublerServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding a ``FakePublerState``."""
+
+    daemon_threads = True
+
+    def __init__(self, config: Optional[FakeConfig] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.state = FakePublerState(config or FakeConfig())
+        super().__init__((host, port), _Handler)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "FakePublerServer":
+        """Serve on a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a fake Publer API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency, up to N seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 500")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered 429")
+    parser.add_argument("--job-delay", type=float, default=0.0, help="Seconds before a job completes")
+    parser.add_argument("--accounts", type=int, default=1, help="Accounts per network")
+    parser.add_argument("--seed-posts", type=int, default=0, help="Scheduled posts to pre-create")
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_429=args.rate_429,
+        job_delay=args.job_delay,
+        accounts_per_network=args.accounts,
+    )
+    server = FakePublerServer(config, args.host, args.port)
+    server.state.seed_posts(args.seed_posts)
+    print(f"Fake Publer API on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
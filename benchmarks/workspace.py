@@ -0,0 +1,62 @@
+"""Temporary, isolated workspaces for benchmarks."""
+
+from __future__ import annotations
+
+import importlib
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+# (module, attribute, path relative to the workspace root) for every
+# module-level path the pipeline writes to or scans.
+WORKSPACE_PATHS = [
+    ("src.state", "STATE_DIR", "state"),
+    ("src.drafts", "IDEAS_DIR", "ideas"),
+    ("src.drafts", "DRAFTS_DIR", "drafts"),
+    ("src.planner", "STATE_DIR", "state"),
+    ("src.planner", "DRAFTS_DIR", "drafts"),
+    ("src.planner", "QUEUE_DIR", "queue"),
+    ("src.journal", "JOURNAL_DIR", "state/journals"),
+    ("src.publer.jobs", "PENDING_JOBS_FILE", "state/pending_jobs.json"),
+    ("src.metrics", "METRICS_FILE", "state/metrics.json"),
+    ("src.insights", "INSIGHTS_DB", "state/analytics.db"),
+    ("src.linkage", "LINKS_DB", "state/links.db"),
+    ("src.snapshot", "SNAPSHOT_DB", "state/snapshot.db"),
+    ("src.workspaces", "WORKSPACES_CONFIG", "config/workspaces.json"),
+    ("src.publer.cache", "CACHE_DB", "state/http_cache.db"),
+]
+
+
+@contextmanager
+def isolated_workspace(base_url: Optional[str] = None) -> Iterator[Path]:
+    """Run inside a temp dir with every state path (and optionally the API) redirected.
+
+    Relative paths (``state/``, ``queue/plan.json``) resolve against the
+    temp dir because the working directory changes too.
+    """
+    saved_env = {k: os.environ.get(k) for k in ("PUBLER_BASE_URL", "PUBLER_API_KEY")}
+    saved_paths = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="social-bench-") as tmp:
+        root = Path(tmp)
+        if base_url:
+            os.environ["PUBLER_BASE_URL"] = base_url
+            os.environ["PUBLER_API_KEY"] = "bench"
+        for module_name, attr, rel in WORKSPACE_PATHS:
+            module = importlib.import_module(module_name)
+            saved_paths.append((module, attr, getattr(module, attr)))
+            setattr(module, attr, root / rel)
+        os.chdir(root)
+        try:
+            yield root
+        finally:
+            os.chdir(cwd)
+            for module, attr, value in reversed(saved_paths):
+                setattr(module, attr, value)
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
@@ -7,7 +7,7 @@ from typing import Optional
 
 from dotenv import load_dotenv
 
-from src.publer.client import PublerClient, PublerClientConfig
+from src.publer.client import PublerClient, PublerClientConfig, base_url_from_env
 
 
 def load_api_key() -> str:
@@ -29,7 +29,9 @@ def main() -> int:
     load_dotenv()
     api_key = load_api_key()
     workspace_id = load_workspace_id()
-    client = PublerClient(PublerClientConfig(api_key=api_key, workspace_id=workspace_id))
+    client = PublerClient(
+        PublerClientConfig(api_key=api_key, workspace_id=workspace_id, base_url=base_url_from_env())
+    )
     response = client.get_me()
     print("Auth OK:", response)
     return 0
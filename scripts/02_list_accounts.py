@@ -9,7 +9,7 @@ from typing import Optional
 
 from dotenv import load_dotenv
 
-from src.publer.client import PublerClient, PublerClientConfig
+from src.publer.client import PublerClient, PublerClientConfig, base_url_from_env
 
 
 def load_api_key() -> str:
@@ -30,7 +30,9 @@ def main() -> int:
     """Fetch accounts and store them in state/accounts.json."""
     load_dotenv()
     client = PublerClient(
-        PublerClientConfig(api_key=load_api_key(), workspace_id=load_workspace_id())
+        PublerClientConfig(
+            api_key=load_api_key(), workspace_id=load_workspace_id(), base_url=base_url_from_env()
+        )
     )
     response = client.list_accounts()
     print(json.dumps(response, indent=2))
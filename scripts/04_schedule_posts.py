@@ -9,7 +9,7 @@ from typing import Optional
 
 from dotenv import load_dotenv
 
-from src.publer.client import PublerClient, PublerClientConfig
+from src.publer.client import PublerClient, PublerClientConfig, base_url_from_env
 from src.publer.scheduler import PublerScheduler, ScheduleRequest
 
 
@@ -43,6 +43,9 @@ def main() -> int:
     """Schedule all drafts in the drafts folder."""
     parser = argparse.ArgumentParser(description="Schedule drafts")
     parser.add_argument("--dry-run", action="store_true", help="Print payloads only")
+    # One post per request: Publer reports failures per account, so a rejected
+    # post in a larger batch can fail the account's other posts with it.
+    parser.add_argument("--batch-size", type=int, default=1, help="Posts per /posts/schedule request")
     args = parser.parse_args()
 
     load_dotenv()
@@ -50,14 +53,17 @@ def main() -> int:
     workspace_id = os.getenv("PUBLER_WORKSPACE_ID", "").strip() or None
     dry_run = args.dry_run or os.getenv("PUBLER_DRY_RUN", "1") == "1"
 
-    client = PublerClient(PublerClientConfig(api_key=api_key, workspace_id=workspace_id))
+    client = PublerClient(
+        PublerClientConfig(api_key=api_key, workspace_id=workspace_id, base_url=base_url_from_env())
+    )
     scheduler = PublerScheduler(client)
 
     drafts_dir = Path("drafts")
     if not drafts_dir.exists():
         raise FileNotFoundError("drafts/ not found. Run 03_generate_drafts.py first.")
 
-    for draft_file in drafts_dir.glob("*.md"):
+    files, requests = [], []
+    for draft_file in sorted(drafts_dir.glob("*.md")):
         platform, text = parse_draft(draft_file)
         if platform == "twitter":
             account_id = load_env_value("PUBLER_X_ACCOUNT_ID")
@@ -70,10 +76,17 @@ def main() -> int:
         if dry_run:
             print(f"[DRY RUN] Would schedule {draft_file.name} to {network}")
             continue
-        response = scheduler.schedule(request)
-        print(f"Scheduled {draft_file.name}: {response}")
+        files.append(draft_file)
+        requests.append(request)
 
-    return 0
+    results = scheduler.schedule_many(requests, batch_size=args.batch_size)
+    for draft_file, result in zip(files, results):
+        if result.ok:
+            print(f"Scheduled {draft_file.name}: {result.state} (job {result.job_id}, post {result.post_id})")
+        else:
+            print(f"Failed {draft_file.name}: {result.error}")
+
+    return 0 if all(result.ok for result in results) else 1
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ import os
 from dotenv import load_dotenv
 
 from src.publer.analytics import AnalyticsRequest, PublerAnalytics
-from src.publer.client import PublerClient, PublerClientConfig
+from src.publer.client import PublerClient, PublerClientConfig, base_url_from_env
 
 
 def load_env_value(key: str) -> str:
@@ -32,7 +32,9 @@ def main() -> int:
     workspace_id = os.getenv("PUBLER_WORKSPACE_ID", "").strip() or None
     account_id = args.account_id or load_env_value("PUBLER_LINKEDIN_ACCOUNT_ID")
 
-    client = PublerClient(PublerClientConfig(api_key=api_key, workspace_id=workspace_id))
+    client = PublerClient(
+        PublerClientConfig(api_key=api_key, workspace_id=workspace_id, base_url=base_url_from_env())
+    )
     analytics = PublerAnalytics(client)
     response = analytics.post_insights(
         AnalyticsRequest(account_id=account_id, date_from=args.date_from, date_to=args.date_to)
@@ -8,21 +8,30 @@ from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 import requests
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.publer.client import base_url_from_env
+from src.publer.scheduler import PublerScheduler, ScheduleRequest
+from src.workspaces import select
+
 # Load environment variables
 env_path = Path(__file__).parent.parent / "config" / ".env"
 load_dotenv(env_path)
 
-API_KEY = os.getenv("PUBLER_API_KEY")
-WORKSPACE_ID = "69717f7a2820f00c7aec83f3"
-BASE_URL = "https://app.publer.com/api/v1"
+# First configured workspace, or the one named by PUBLER_WORKSPACE (see src/workspaces.py)
+WORKSPACE = select([os.getenv("PUBLER_WORKSPACE", "")])[0]
+API_KEY = os.getenv(WORKSPACE.api_key_env)
+BASE_URL = base_url_from_env()
 
 
 def get_headers():
-    return {
+    headers = {
         "Authorization": f"Bearer-API {API_KEY}",
-        "Publer-Workspace-Id": WORKSPACE_ID,
         "Content-Type": "application/json"
     }
+    if WORKSPACE.id:
+        headers["Publer-Workspace-Id"] = WORKSPACE.id
+    return headers
 
 
 def get_accounts():
@@ -57,37 +66,15 @@ def publish_post(text: str, platform: str = "x", minutes_from_now: int = 1) -> d
     
     schedule_time = (datetime.now(timezone.utc) + timedelta(minutes=minutes_from_now)).strftime('%Y-%m-%dT%H:%M:%S+00:00')
     
-    response = requests.post(
-        f"{BASE_URL}/posts/schedule",
-        headers=get_headers(),
-        json={
-            "bulk": {
-                "state": "scheduled",
-                "posts": [{
-                    "networks": {
-                        provider: {
-                            "type": "status",
-                            "text": text
-                        }
-                    },
-                    "accounts": [{
-                        "id": account_id,
-                        "scheduled_at": schedule_time
-                    }]
-                }]
-            }
-        }
-    )
-    
-    result = response.json()
-    
-    if "job_id" in result:
-        import time
-        time.sleep(2)
-        status = check_job_status(result["job_id"])
-        return {"status": response.status_code, "job_id": result["job_id"], "job_status": status}
-    
-    return {"status": response.status_code, "response": result}
+    request = ScheduleRequest(network=provider, account_id=account_id, text=text, scheduled_at=schedule_time)
+    result = PublerScheduler(WORKSPACE.client()).schedule_many([request], job_timeout=30)[0]
+    return {
+        "state": result.state,
+        "job_id": result.job_id,
+        "post_id": result.post_id,
+        "job_seconds": result.job_seconds,
+        "error": result.error,
+    }
 
 
 if __name__ == "__main__":
@@ -95,12 +82,11 @@ if __name__ == "__main__":
     platform = sys.argv[2] if len(sys.argv) > 2 else "x"
     
     result = publish_post(text, platform)
-    print(f"Status: {result['status']}")
-    if "job_status" in result:
-        failures = result["job_status"].get("payload", {}).get("failures", {})
-        if failures:
-            print(f"Failures: {failures}")
-        else:
-            print(f"Success! Job ID: {result['job_id']}")
+    if result["state"] == "failed":
+        print(f"Failed: {result['error']}")
+    elif result["state"] == "pending":
+        print(f"Still processing. Job ID: {result['job_id']} (run 'python social.py jobs' later)")
+    elif result["job_id"]:
+        print(f"Success! Job ID: {result['job_id']} ({result['job_seconds']:.1f}s)")
     else:
-        print(f"Response: {result.get('response', result)}")
+        print("Success!")
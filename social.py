@@ -2,7 +2,9 @@
 """Social Engine CLI - Unified command interface for social media content workflow."""
 
 import argparse
+import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -12,36 +14,59 @@ sys.path.insert(0, str(Path(__file__).parent))
 from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent / "config" / ".env")
 
+from src import tracing
+
+
+def _workspaces(args):
+    """Workspaces selected with --workspace (all configured ones by default)."""
+    from src.workspaces import select
+    return select(getattr(args, "workspace", None))
+
+
+def _print_workspace_errors(errors):
+    for name, error in errors.items():
+        print(f"  ✗ [{name}] {error}")
+
 
 def cmd_ingest(args):
     """Ingest ideas from various sources."""
-    from src.ingest import ingest_prompts, ingest_transcripts, ingest_agents_campaigns
+    from src.drafts import IDEAS_DIR
+    from src.ingest import ingest_prompts, ingest_transcripts, ingest_agents_campaigns, ingest_notes
     
     source = args.source
     results = []
     
     if source == "prompts":
         prompts_dir = Path("prompts")
-        created = ingest_prompts(prompts_dir)
+        created = ingest_prompts(prompts_dir, IDEAS_DIR)
         results.extend(created)
         print(f"✓ Ingested {len(created)} ideas from prompts/")
         
     elif source == "transcripts":
         transcripts_dir = Path(args.path) if args.path else Path("inputs/transcripts")
-        created = ingest_transcripts(transcripts_dir)
+        created = ingest_transcripts(transcripts_dir, IDEAS_DIR)
         results.extend(created)
         print(f"✓ Ingested {len(created)} ideas from {transcripts_dir}")
         
+    elif source == "notes":
+        notes_path = Path(args.path) if args.path else Path("state/quick_notes.txt")
+        created = ingest_notes(notes_path, IDEAS_DIR)
+        results.extend(created)
+        print(f"✓ Ingested {len(created)} new notes from {notes_path}")
+        
     elif source == "agents":
         repo_path = Path(args.repo) if args.repo else Path.home() / "Servando/controlthrive/agents-campaigns"
         since_days = int(args.since.rstrip('d')) if args.since else 7
-        created = ingest_agents_campaigns(repo_path, since_days)
+        created = ingest_agents_campaigns(repo_path, IDEAS_DIR, since_days)
         results.extend(created)
         print(f"✓ Ingested {len(created)} ideas from agents-campaigns (last {since_days} days)")
         
     elif source == "all":
         from src.ingest import ingest_all
-        results = ingest_all()
+        repo_path = Path(args.repo) if args.repo else None
+        since_days = int(args.since.rstrip('d')) if args.since else 7
+        by_source = ingest_all(Path("."), repo_path, since_days, ideas_dir=IDEAS_DIR)
+        results = [idea_id for created in by_source.values() for idea_id in created]
         print(f"✓ Ingested {len(results)} ideas from all sources")
     
     if results:
@@ -76,9 +101,9 @@ def cmd_draft(args):
         total_created = []
         
         for idea in ideas:
-            created = create_drafts_from_idea(idea["id"], platforms)
+            created = create_drafts_from_idea(idea.id, platforms)
             total_created.extend(created)
-            print(f"✓ {idea['id']} → {len(created)} drafts")
+            print(f"✓ {idea.id} → {len(created)} drafts")
         
         print(f"\n✓ Created {len(total_created)} total drafts from {len(ideas)} ideas")
     
@@ -86,7 +111,7 @@ def cmd_draft(args):
         ideas = list_ideas(status="ready")
         print(f"Found {len(ideas)} ideas ready for drafting:")
         for idea in ideas[:10]:
-            print(f"  - {idea['id']}: {idea.get('content', '')[:50]}...")
+            print(f"  - {idea.id}: {idea.content[:50]}...")
         if len(ideas) > 10:
             print(f"  ... and {len(ideas) - 10} more")
         print("\nUse --idea <id> or --batch to generate drafts")
@@ -112,11 +137,11 @@ def cmd_review(args):
     
     print(f"Drafts ({len(drafts)}):\n")
     for draft in drafts:
-        status_icon = "✓" if draft.get("status") == "approved" else "○"
-        platform_tag = f"[{draft.get('platform', '?')}]"
-        print(f"  {status_icon} {platform_tag:12} {draft['path']}")
+        status_icon = "✓" if draft.status == "approved" else "○"
+        platform_tag = f"[{draft.platform or '?'}]"
+        print(f"  {status_icon} {platform_tag:12} {draft.path}")
         if args.verbose:
-            content = draft.get("content", "")[:100]
+            content = draft.content[:100]
             print(f"              {content}...")
     
     print(f"\nTo approve: python social.py review --approve <path>")
@@ -124,18 +149,26 @@ def cmd_review(args):
 
 def cmd_plan(args):
     """Create a schedule plan."""
-    from src.planner import create_plan_from_approved, save_plan, load_plan
+    from src.planner import create_plan_from_approved, is_streamed, iter_plan, read_plan_header, save_plan, load_plan
     from src.drafts import list_drafts
     
     if args.show:
         plan_path = Path(args.show) if args.show != "default" else Path("queue/plan.json")
         if plan_path.exists():
-            plan = load_plan(plan_path)
+            if is_streamed(plan_path):
+                # Stream the items rather than loading a huge plan.
+                plan = read_plan_header(plan_path)
+                items = (item for _, item in iter_plan(plan_path))
+            else:
+                plan = load_plan(plan_path)
+                items = plan["items"]
             print(f"Plan: {plan_path}")
-            print(f"Created: {plan.get('created_at', 'unknown')}")
-            print(f"Items: {len(plan.get('items', []))}\n")
-            for item in plan.get("items", []):
-                print(f"  [{item.get('platform', '?'):8}] {item.get('scheduled_at', '?')} → {item.get('draft', '?')}")
+            print(f"Created: {plan.get('created_at', 'unknown')}\n")
+            shown = 0
+            for item in items:
+                print(f"  [{item.platform:8}] {item.scheduled_at} → {item.draft}")
+                shown += 1
+            print(f"\nItems: {shown}")
         else:
             print(f"No plan found at {plan_path}")
         return
@@ -149,33 +182,225 @@ def cmd_plan(args):
     if isinstance(interval, str):
         interval = int(interval.rstrip('d'))
     
+    out = Path(args.out) if args.out else None
+    streamed = out is not None and is_streamed(out)
+    
+    templates = None
+    if args.slots or args.learned:
+        from src.slots import load_templates
+        slots_path = args.slots if args.slots and args.slots != "default" else None
+        templates = load_templates(Path(slots_path) if slots_path else None)
+    
     plan = create_plan_from_approved(
         platform=platform,
         count=count,
         start_date=start_date,
         start_time=start_time,
-        interval_days=interval
+        interval_days=interval,
+        templates=templates,
+        learn_slots=args.learned,
+        targets=_workspaces(args),
+        stream=streamed,
     )
     
-    if not plan.get("items"):
+    if streamed:
+        # Items go straight from the planner to the file; read back a preview.
+        plan_path = save_plan(plan, out)
+        total, names, preview = 0, set(), []
+        for _, item in iter_plan(plan_path):
+            total += 1
+            names.add(item.workspace)
+            if len(preview) < 20:
+                preview.append(item)
+        hidden = total - len(preview)
+    else:
+        plan_path = None
+        preview = plan["items"]
+        total, names, hidden = len(preview), {item.workspace for item in preview}, 0
+    
+    if not total:
+        if plan_path:
+            plan_path.unlink()
         print("No approved drafts found to plan.")
         print("Use 'python social.py review --approve <path>' to approve drafts first.")
         return
     
-    plan_path = save_plan(plan)
+    plan_path = plan_path or save_plan(plan, out)
     
-    print(f"✓ Created plan with {len(plan['items'])} posts → {plan_path}")
+    multi = len(names) > 1
+    print(f"✓ Created plan with {total} posts → {plan_path}")
     print("\nSchedule:")
-    for item in plan["items"]:
-        print(f"  [{item.get('platform', '?'):8}] {item.get('scheduled_at', '?')} → {Path(item.get('draft', '')).name}")
+    for item in preview:
+        where = f"{item.workspace}/" if multi else ""
+        print(f"  [{where}{item.platform:8}] {item.scheduled_at} → {Path(item.draft).name}")
+    if hidden:
+        print(f"  ... and {hidden} more (python social.py plan --show {plan_path})")
     
     print(f"\nReview and edit {plan_path}, then run:")
     print(f"  python social.py apply {plan_path}")
 
 
+def _parse_minutes(value):
+    """Parse a duration like 30m, 2h or 1d into minutes."""
+    units = {"m": 1, "h": 60, "d": 1440}
+    value = str(value).strip().lower()
+    if value and value[-1] in units:
+        return int(value[:-1]) * units[value[-1]]
+    return int(value)
+
+
+def _density_rules(args):
+    """Density rules from ``--min-gap``/``--max-per-day`` (caps default to the slot templates')."""
+    from src.conflicts import DensityRules
+    from src.slots import load_templates
+    
+    if args.max_per_day is not None:
+        if args.max_per_day < 1:
+            raise ValueError(f"--max-per-day must be at least 1 (got {args.max_per_day})")
+        caps = {platform: args.max_per_day for platform in ("linkedin", "twitter")}
+    else:
+        caps = {platform: t.max_per_day for platform, t in load_templates().items()}
+    return DensityRules(min_gap_minutes=_parse_minutes(args.min_gap), max_per_day=caps)
+
+
+def _queued_posts(account_ids, first, last, rules, own, fix=False):
+    """Snapshot posts that can conflict with plan items between ``first`` and ``last``, and the sync time.
+    
+    ``own`` are the IDs of posts the plan already created; the mirror holds
+    them too, but they are not conflicts.
+    """
+    from datetime import timedelta
+    
+    from src.snapshot import SnapshotStore
+    
+    # Only queued posts near the plan's items can conflict with them (fixing
+    # may shift items later, so it reads everything after the first).
+    margin = timedelta(days=1, minutes=rules.min_gap_minutes)
+    with SnapshotStore() as snapshot:
+        posts = snapshot.posts(
+            account_ids=account_ids,
+            start=first - margin,
+            end=None if fix else last + margin,
+        ) if first is not None else []
+        synced = snapshot.synced_at() or "never"
+    return [post for post in posts if post["id"] not in own], synced
+
+
+def _print_conflicts(conflicts):
+    for c in conflicts:
+        print(f"  ✗ {c.kind:9} {c.scheduled_at} {Path(c.draft).name}: {c.detail}")
+
+
+def _check_plan(plan, args, fix=False):
+    """Validate a plan against the last queue snapshot; print and return the result."""
+    from src.conflicts import validate_plan
+    from src.planner import plan_post_ids
+    from src.slots import parse_datetime
+    
+    rules = _density_rules(args)
+    items = plan["items"]
+    times = [parse_datetime(item.scheduled_at) for item in items if item.scheduled_at]
+    posts, synced = _queued_posts(
+        {item.account_id for item in items},
+        min(times, default=None),
+        max(times, default=None),
+        rules,
+        plan_post_ids(plan),
+        fix,
+    )
+    result = validate_plan(plan, posts, rules, fix=fix)
+    
+    print(f"Checked {len(items)} items against {len(posts)} queued posts (synced: {synced})")
+    _print_conflicts(result.conflicts)
+    if result.ok:
+        print("✓ No conflicts")
+    return result
+
+
+def _check_plan_file(path, args, only=None, fix=False):
+    """Validate a .jsonl plan chunk by chunk, without loading it; print and return the validator.
+    
+    A first pass over the file finds the accounts and time span to read from
+    the snapshot, and the hash naming the plan's journal (the posts it
+    already created); a second checks ``PLAN_CHUNK_SIZE`` items at a time.
+    Only items passing ``only`` are checked, as ``apply_plan_file`` applies
+    them. With ``fix`` the whole plan is rewritten with the shifted times as
+    it is checked.
+    """
+    from itertools import islice
+    
+    from src.conflicts import PlanValidator
+    from src.journal import PlanJournal, items_hash
+    from src.planner import PLAN_CHUNK_SIZE, iter_plan, read_plan_header, save_plan
+    from src.slots import parse_datetime
+    
+    def selected():
+        return (item for _, item in iter_plan(path) if only is None or only(item))
+    
+    count, first, last, account_ids = 0, None, None, set()
+    
+    def scanned():
+        nonlocal count, first, last
+        for item in selected():
+            count += 1
+            account_ids.add(item.account_id)
+            if item.scheduled_at:
+                when = parse_datetime(item.scheduled_at)
+                first = when if first is None else min(first, when)
+                last = when if last is None else max(last, when)
+            yield item
+    
+    rules = _density_rules(args)
+    own = PlanJournal.for_hash(items_hash(scanned())).post_ids()
+    posts, synced = _queued_posts(account_ids, first, last, rules, own, fix)
+    header = read_plan_header(path)
+    validator = PlanValidator(posts, rules, header.get("timezone", "UTC"), fix)
+    print(f"Checked {count} items against {len(posts)} queued posts (synced: {synced})")
+    
+    def checked():
+        stream, start = selected(), 0
+        while chunk := list(islice(stream, PLAN_CHUNK_SIZE)):
+            reported = len(validator.conflicts)
+            yield from validator.check(chunk, start)
+            _print_conflicts(validator.conflicts[reported:])
+            start += len(chunk)
+    
+    if fix:
+        save_plan({**header, "items": checked()}, path)
+    else:
+        for _ in checked():
+            pass
+    if validator.ok:
+        print("✓ No conflicts")
+    return validator
+
+
+def cmd_check(args):
+    """Check a plan for collisions, spacing and daily caps."""
+    from src.planner import is_streamed, iter_plan, load_plan, save_plan
+    
+    plan_path = Path(args.plan) if args.plan else Path("queue/plan.json")
+    if not plan_path.exists():
+        print(f"Plan not found: {plan_path}")
+        return
+    
+    if is_streamed(plan_path):
+        # Rewrites the plan itself when fixing.
+        result = _check_plan_file(plan_path, args, fix=args.fix)
+    else:
+        result = _check_plan(load_plan(plan_path), args, fix=args.fix)
+        if args.fix and result.shifted:
+            save_plan(result.plan, plan_path)
+    if args.fix and result.shifted:
+        print(f"\n✓ Shifted {result.shifted} items → {plan_path}")
+        for _, item in iter_plan(plan_path):
+            if item.shifted_from:
+                print(f"  {item.shifted_from} → {item.scheduled_at}  {Path(item.draft).name}")
+
+
 def cmd_apply(args):
     """Apply a schedule plan to Publer."""
-    from src.planner import load_plan, apply_plan
+    from src.planner import apply_plan_file, is_streamed, load_plan
     
     plan_path = Path(args.plan) if args.plan else Path("queue/plan.json")
     
@@ -183,39 +408,218 @@ def cmd_apply(args):
         print(f"Plan not found: {plan_path}")
         print("Create one with: python social.py plan --from-approved")
         return
+    if (args.offset or args.resume) and not is_streamed(plan_path):
+        print("--offset and --resume need a .jsonl plan (python social.py plan --from-approved --out queue/plan.jsonl)")
+        return
     
-    plan = load_plan(plan_path)
     dry_run = args.dry_run
+    only = None
+    if args.workspace:
+        from src.workspaces import load_workspaces
+        selected = {w.name for w in _workspaces(args)}
+        default = load_workspaces()[0].name
+        only = lambda item: (item.workspace or default) in selected
+    
+    if not args.force:
+        if is_streamed(plan_path):
+            result = _check_plan_file(plan_path, args, only=only)
+        else:
+            plan = load_plan(plan_path)
+            if only is not None:
+                plan = {**plan, "items": [item for item in plan["items"] if only(item)]}
+            result = _check_plan(plan, args)
+        if not result.ok:
+            print("\nResolve with: python social.py check --fix (or apply --force)")
+            return
+        print()
     
     if dry_run:
         print("=== DRY RUN ===\n")
     
-    results = apply_plan(plan, dry_run=dry_run)
+    results = apply_plan_file(plan_path, dry_run=dry_run, job_timeout=args.job_timeout,
+                              offset=args.offset, resume=args.resume, only=only, rerender=args.rerender)
     
     successes = results.get("successes", [])
     failures = results.get("failures", [])
+    skipped = results.get("skipped", [])
     
     if dry_run:
-        print(f"\nWould schedule {len(plan.get('items', []))} posts.")
+        print(f"\nWould schedule {len(successes)} posts.")
         print("Remove --dry-run to apply for real.")
     else:
         print(f"\n✓ Scheduled: {len(successes)}")
+        if skipped:
+            print(f"↷ Already scheduled by an earlier run: {len(skipped)}")
+        if results.get("pending"):
+            print(f"… Still processing at Publer: {len(results['pending'])}")
+            print("  Run 'python social.py jobs' later to confirm them.")
         if failures:
             print(f"✗ Failed: {len(failures)}")
             for f in failures:
                 print(f"  - {f}")
 
 
+def cmd_jobs(args):
+    """Finish confirming schedule jobs left pending by earlier runs."""
+    from src.planner import resume_pending_jobs
+    
+    results = resume_pending_jobs(timeout=args.timeout, targets=_workspaces(args))
+    successes = results["successes"]
+    failures = results["failures"]
+    pending = results["pending"]
+    
+    if not (successes or failures or pending):
+        print("No pending jobs.")
+        return
+    
+    for s in successes:
+        took = f"{s['job_seconds']:.1f}s" if s.get("job_seconds") is not None else "?"
+        print(f"  ✓ {Path(s['draft']).name} (job {s['job_id']}, {took})")
+    for f in failures:
+        print(f"  ✗ {Path(f['draft']).name}: {f['error']}")
+    for p in pending:
+        print(f"  … {Path(p['draft']).name} (job {p['job_id']})")
+    print(f"\nConfirmed: {len(successes)}  Failed: {len(failures)}  Still pending: {len(pending)}")
+
+
+def _parse_day(value, default):
+    """Parse YYYY-MM-DD or a relative 'Nd' (N days ago) into a date."""
+    from datetime import date, timedelta
+    
+    if not value:
+        return default
+    value = value.strip().lower()
+    if value == "today":
+        return date.today()
+    if value.endswith("d") and value[:-1].isdigit():
+        return date.today() - timedelta(days=int(value[:-1]))
+    return date.fromisoformat(value)
+
+
+def _print_totals(label, totals):
+    print(f"  {label:14} {totals.posts:>6} {totals.impressions:>11,} "
+          f"{totals.engagement_rate * 100:>7.2f}% {totals.ctr * 100:>6.2f}%")
+
+
+def cmd_analytics(args):
+    """Sync post insights locally and report on them."""
+    from datetime import date, timedelta
+    
+    if args.action == "report":
+        import json
+        from src.insights import InsightsStore, build_report, idea_sources_by_post
+        from src.publer.accounts import normalize_platform
+        from src.slots import WEEKDAYS
+        
+        with InsightsStore() as store:
+            report = build_report(
+                store,
+                tz=args.tz,
+                date_from=_parse_day(args.date_from, None),
+                date_to=_parse_day(args.date_to, None),
+                platform=normalize_platform(args.platform) if args.platform else None,
+                sources=idea_sources_by_post(),
+            )
+        if args.json:
+            print(json.dumps(report.to_dict(), indent=2))
+            return
+        if not report.platforms:
+            print("No insights stored. Run: python social.py analytics sync")
+            return
+        
+        header = f"  {'':14} {'posts':>6} {'impressions':>11} {'eng rate':>8} {'CTR':>7}"
+        print(f"=== Insights ({args.tz}) ===\n\nBy platform:\n{header}")
+        for name, totals in sorted(report.platforms.items()):
+            _print_totals(name, totals)
+        print(f"\nBy idea source:\n{header}")
+        for name, totals in sorted(report.sources.items(), key=lambda kv: -kv[1].engagement_rate):
+            _print_totals(name, totals)
+        print(f"\nBy weekday:\n{header}")
+        for day, totals in sorted(report.weekdays.items()):
+            _print_totals(WEEKDAYS[day], totals)
+        print(f"\nBy hour:\n{header}")
+        for hour, totals in sorted(report.hours.items()):
+            _print_totals(f"{hour:02d}:00", totals)
+        best = sorted(
+            ((slot, t) for slot, t in report.slots.items() if t.posts >= args.min_posts),
+            key=lambda kv: -kv[1].engagement_rate,
+        )[:args.top]
+        if best:
+            print(f"\nBest slots (≥{args.min_posts} posts):\n{header}")
+            for (day, hour), totals in best:
+                _print_totals(f"{WEEKDAYS[day]} {hour:02d}:00", totals)
+        return
+    
+    from src.insights import sync_insights
+    from src.publer.accounts import normalize_platform
+    from src.workspaces import fan_out
+    
+    date_from = _parse_day(args.date_from, date.today() - timedelta(days=90))
+    date_to = _parse_day(args.date_to, date.today())
+    
+    def sync(workspace):
+        accounts = workspace.registry().accounts()
+        if args.platform:
+            wanted = normalize_platform(args.platform)
+            accounts = [a for a in accounts if normalize_platform(a.get("provider", "")) == wanted]
+        result = sync_insights(
+            workspace.client(),
+            accounts,
+            date_from,
+            date_to,
+            window_days=args.window,
+            refresh_days=args.refresh_days,
+            max_workers=args.workers,
+        )
+        return len(accounts), result
+    
+    synced, errors = fan_out(_workspaces(args), sync)
+    for name, (account_count, result) in synced.items():
+        where = f" [{name}]" if len(synced) > 1 else ""
+        print(f"✓ Synced insights{where} {date_from} → {date_to} for {account_count} accounts")
+        print(f"  Windows fetched: {result.windows_fetched}  "
+              f"already stored: {result.windows_skipped}  posts: {result.posts}")
+        for error in result.errors[:10]:
+            print(f"  ✗ {error}")
+        if len(result.errors) > 10:
+            print(f"  ... and {len(result.errors) - 10} more errors")
+    _print_workspace_errors(errors)
+
+
+def _post_workspace(targets, post_id):
+    """The selected workspace a post belongs to, found through the snapshot."""
+    if len(targets) == 1:
+        return targets[0]
+    from src.snapshot import SnapshotStore
+    with SnapshotStore() as snapshot:
+        post = snapshot.get(post_id)
+    for workspace in targets:
+        if post and post["workspace"] == workspace.name:
+            return workspace
+    raise ValueError(f"Post {post_id} is not in the synced queue; choose its workspace with --workspace")
+
+
 def cmd_queue(args):
     """Manage the Publer queue."""
     from src.queue_manager import QueueManager
+    from src.workspaces import fan_out
     
-    qm = QueueManager()
+    targets = _workspaces(args)
+    multi = len(targets) > 1
     action = args.action
     
     if action == "ls":
         platform = args.platform
-        posts = qm.list_scheduled(platform=platform)
+        
+        def list_posts(workspace):
+            qm = QueueManager(workspace=workspace)
+            if args.refresh:
+                _print_drift(workspace, qm.reconcile()[1], multi)
+            return qm.list_scheduled(platform=platform, live=args.live)
+        
+        found, errors = fan_out(targets, list_posts)
+        posts = [post for w in targets for post in found.get(w.name, [])]
+        _print_workspace_errors(errors)
         
         if not posts:
             print(f"No scheduled posts{' for ' + platform if platform else ''}.")
@@ -223,47 +627,153 @@ def cmd_queue(args):
         
         print(f"Scheduled posts ({len(posts)}):\n")
         for post in posts:
-            plat = post.get("network", post.get("platform", "?"))
-            scheduled = post.get("scheduled_at", "?")
-            text = post.get("text", "")[:60]
-            post_id = post.get("id", "?")
-            print(f"  [{plat:8}] {scheduled}")
-            print(f"            {text}...")
-            print(f"            ID: {post_id}\n")
+            where = f"  ({post.workspace})" if multi else ""
+            print(f"  [{post.platform:8}] {post.scheduled_at or '?'}{where}")
+            print(f"            {post.text[:60]}...")
+            print(f"            ID: {post.id}\n")
     
     elif action == "sync":
-        result = qm.sync()
+        synced, errors = fan_out(targets, lambda w: QueueManager(workspace=w).reconcile())
         print(f"✓ Synced queue from Publer")
-        print(f"  LinkedIn: {result.get('linkedin', 0)} posts")
-        print(f"  X/Twitter: {result.get('twitter', 0)} posts")
-        print(f"  Saved to: state/publer_snapshot.json")
+        for workspace in targets:
+            if workspace.name not in synced:
+                continue
+            result, drift = synced[workspace.name]
+            where = f" [{workspace.name}]" if multi else ""
+            print(f"  LinkedIn{where}: {result.get('linkedin', 0)} posts")
+            print(f"  X/Twitter{where}: {result.get('twitter', 0)} posts")
+            for platform, error in result.get("errors", {}).items():
+                print(f"  ✗ {platform}{where}: could not fetch ({error}); kept the last synced posts")
+            _print_drift(workspace, drift, multi)
+        _print_workspace_errors(errors)
+        print(f"  Saved to: state/snapshot.db")
     
-    elif action == "cancel":
-        if not args.post_id:
-            print("Usage: python social.py queue cancel <post_id>")
-            return
-        result = qm.cancel(args.post_id)
-        if result.get("success"):
-            print(f"✓ Cancelled post {args.post_id}")
-        else:
-            print(f"✗ Failed to cancel: {result.get('error', 'unknown')}")
+    elif action in ("cancel", "move"):
+        _queue_bulk(args, targets)
+
+
+def _print_drift(workspace, drift, multi):
+    """Report posts changed in Publer outside the engine."""
+    if not drift:
+        return
+    where = f" [{workspace.name}]" if multi else ""
+    print(f"  ! Drift{where}: {len(drift.added)} added, {len(drift.removed)} removed, "
+          f"{len(drift.changed)} edited outside the engine")
+    shown = 10
+    for post in drift.added[:shown]:
+        print(f"    + {post['id']}  {post.get('scheduled_at')}  {(post.get('text') or '')[:50]}")
+    for post in drift.removed[:shown]:
+        print(f"    - {post['id']}  {post.get('scheduled_at')}  {(post.get('text') or '')[:50]}")
+    for change in drift.changed[:shown]:
+        print(f"    ~ {change['id']}  {', '.join(change['fields'])}")
+    hidden = sum(max(len(posts) - shown, 0) for posts in (drift.added, drift.removed, drift.changed))
+    if hidden:
+        print(f"    ... and {hidden} more (see state/queue_events.json)")
+
+
+def _queue_bulk(args, targets):
+    """Cancel or move posts given by id and/or selected from the synced queue."""
+    from src.queue_manager import QueueManager, log_bulk, parse_shift
+    from src.records import QueuedPost
+    from src.slots import parse_datetime
+    from src.workspaces import fan_out
     
-    elif action == "move":
-        if not args.post_id or not args.to:
-            print("Usage: python social.py queue move <post_id> --to <datetime>")
+    action = args.action
+    ids = args.post_id
+    filtered = any([args.platform, args.account, args.after, args.before, args.match])
+    if not ids and not filtered:
+        print(f"Usage: python social.py queue {action} <post_id>... "
+              f"[--platform P] [--account ID] [--after T] [--before T] [--match TEXT]")
+        return
+    if action == "move":
+        if bool(args.to) == bool(args.shift):
+            print("Usage: python social.py queue move <post_id>... (--to <datetime> | --shift +2d) [filters]")
             return
-        result = qm.reschedule(args.post_id, args.to)
-        if result.get("success"):
-            print(f"✓ Rescheduled post {args.post_id} to {args.to}")
-        else:
-            print(f"✗ Failed to reschedule: {result.get('error', 'unknown')}")
+        if args.to and (filtered or len(ids) > 1):
+            print("--to moves a single post; use --shift to move several.")
+            return
+    shift = parse_shift(args.shift) if action == "move" and args.shift else None
+    
+    # Filters and relative moves need the synced queue; plain ids do not.
+    from_snapshot = filtered or shift is not None
+    by_workspace = {}
+    if not from_snapshot:
+        for post_id in ids:
+            workspace = _post_workspace(targets, post_id)
+            by_workspace.setdefault(workspace.name, []).append(QueuedPost.from_row({"id": post_id}))
+    
+    def select(workspace):
+        if not from_snapshot:
+            return by_workspace.get(workspace.name, [])
+        return QueueManager(workspace=workspace).select(
+            post_ids=ids or None, platform=args.platform, account_id=args.account,
+            start=args.after, end=args.before, text=args.match,
+        )
+    
+    selected, errors = fan_out(targets, select)
+    _print_workspace_errors(errors)
+    if from_snapshot and ids:
+        found = {post.id for posts in selected.values() for post in posts}
+        for post_id in ids:
+            if post_id not in found:
+                print(f"  ! {post_id} is not in the synced queue (run: python social.py queue sync)")
+    total = sum(len(posts) for posts in selected.values())
+    if not total:
+        print("No matching posts.")
+        return
+    
+    if args.dry_run:
+        verb = "cancel" if action == "cancel" else "move"
+        print(f"Would {verb} {total} post(s):")
+        for name, posts in selected.items():
+            for post in posts:
+                when = post.scheduled_at
+                if shift is not None and when:
+                    when = f"{when} -> {(parse_datetime(when) + shift).isoformat()}"
+                elif args.to:
+                    when = f"{when or '?'} -> {args.to}"
+                print(f"  {post.id}  {when or ''}  {post.text[:50]}")
+        return
+    
+    def run(workspace):
+        qm = QueueManager(workspace=workspace)
+        posts = selected.get(workspace.name, [])
+        if action == "cancel":
+            return qm.cancel_many([post.id for post in posts], max_workers=args.workers)
+        moves, unscheduled = [], []
+        for post in posts:
+            if args.to:
+                moves.append((post.id, args.to))
+            elif post.scheduled_at:
+                moves.append((post.id, (parse_datetime(post.scheduled_at) + shift).isoformat()))
+            else:
+                unscheduled.append({"success": False, "post_id": post.id, "error": "no scheduled time in snapshot"})
+        return qm.reschedule_many(moves, max_workers=args.workers) + unscheduled
+    
+    done, errors = fan_out([w for w in targets if selected.get(w.name)], run)
+    _print_workspace_errors(errors)
+    results = [result for w in targets for result in done.get(w.name, [])]
+    log_bulk("cancel" if action == "cancel" else "reschedule", results)
+    
+    ok = [r for r in results if r.get("success")]
+    failed = [r for r in results if not r.get("success")]
+    if action == "cancel":
+        print(f"✓ Cancelled {len(ok)} post(s)")
+    else:
+        print(f"✓ Rescheduled {len(ok)} post(s) {'to ' + args.to if args.to else 'by ' + args.shift}")
+    if failed:
+        print(f"✗ {len(failed)} failed:")
+        for result in failed:
+            print(f"  {result['post_id']}: {result.get('error', 'unknown')}")
 
 
 def cmd_status(args):
     """Show overall status of the content pipeline."""
     from src.drafts import list_drafts, list_ideas
     from src.queue_manager import QueueManager
+    from src.workspaces import fan_out
     
+    targets = _workspaces(args)
     ideas_ready = len(list_ideas(status="ready"))
     ideas_drafted = len(list_ideas(status="drafted"))
     
@@ -284,28 +794,89 @@ def cmd_status(args):
     print(f"  LinkedIn:        {drafts_linkedin}")
     print(f"  Twitter/X:       {drafts_twitter}")
     
-    plan_path = Path("queue/plan.json")
-    if plan_path.exists():
-        import json
-        plan = json.loads(plan_path.read_text())
-        print(f"\nPlan:")
-        print(f"  Items:           {len(plan.get('items', []))}")
+    for plan_path in (Path("queue/plan.json"), Path("queue/plan.jsonl")):
+        if plan_path.exists():
+            from src.planner import plan_size
+            print(f"\nPlan ({plan_path}):")
+            print(f"  Items:           {plan_size(plan_path)}")
     
-    print("\nQueue (Publer):")
-    try:
-        qm = QueueManager()
-        linkedin_posts = qm.list_scheduled(platform="linkedin")
-        twitter_posts = qm.list_scheduled(platform="twitter")
-        print(f"  LinkedIn:        {len(linkedin_posts)}")
-        print(f"  Twitter/X:       {len(twitter_posts)}")
-    except Exception as e:
-        print(f"  (Could not fetch: {e})")
+    def queue_counts(workspace):
+        from src.snapshot import SnapshotStore
+        qm = QueueManager(workspace=workspace)
+        posts = qm.list_scheduled()
+        with SnapshotStore() as snapshot:
+            drift = snapshot.last_drift(workspace.name)
+        return posts, qm.synced_at(), drift
+    
+    counts, errors = fan_out(targets, queue_counts)
+    for workspace in targets:
+        where = f" [{workspace.name}]" if len(targets) > 1 else ""
+        print(f"\nQueue (Publer){where}:")
+        if workspace.name in errors:
+            print(f"  (Could not fetch: {errors[workspace.name]})")
+            continue
+        posts, synced, drift = counts[workspace.name]
+        linkedin_count = sum(1 for post in posts if post.platform == "linkedin")
+        print(f"  LinkedIn:        {linkedin_count}")
+        print(f"  Twitter/X:       {len(posts) - linkedin_count}")
+        print(f"  Synced:          {synced.isoformat(timespec='seconds') if synced else 'never'}")
+        if drift and (drift["added"] or drift["removed"] or drift["changed"]):
+            print(f"  Drift:           {len(drift['added'])} added, {len(drift['removed'])} removed, "
+                  f"{len(drift['changed'])} edited outside the engine (at {drift['at']})")
     
     print("\n---")
     print("Commands: ingest, draft, review, plan, apply, queue, status")
 
 
-def main():
+def cmd_cache(args):
+    """Show hit/miss stats for the Publer GET cache, or clear it."""
+    from src.publer.cache import shared_cache
+    
+    cache = shared_cache()
+    if args.action == "clear":
+        print(f"✓ Cleared {cache.clear()} cached responses")
+        return
+    
+    stats = cache.stats(cumulative=True)
+    print("=== Publer GET cache ===\n")
+    print(f"  Entries:       {stats.entries} ({stats.bytes / 1024:.1f} KiB)")
+    print(f"  Hits:          {stats.hits} ({stats.memory_hits} from memory)")
+    print(f"  Misses:        {stats.misses}")
+    print(f"  Hit rate:      {stats.hit_rate:.0%}")
+    print(f"  Evictions:     {stats.evictions}")
+    print(f"  Invalidations: {stats.invalidations}")
+    endpoints = cache.endpoints()
+    if endpoints:
+        print("\nBy endpoint:")
+        for endpoint, entries, size in endpoints:
+            print(f"  {endpoint:32} {entries:5} entries  {size / 1024:8.1f} KiB")
+
+
+def cmd_serve(args):
+    """Serve commands over a local socket with warm caches."""
+    from src.server import serve
+    
+    if args.reconcile_every:
+        from datetime import timedelta
+        from src.queue_manager import start_reconciler
+        start_reconciler(_workspaces(args), timedelta(minutes=args.reconcile_every))
+        print(f"Reconciling the queue mirror every {args.reconcile_every:g} min")
+    
+    if args.metrics_port:
+        from src import metrics
+        metrics.install()
+        metrics.serve_http(args.metrics_port)
+        print(f"Metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+        try:
+            serve(handler=run)
+        finally:
+            metrics.save()
+        return
+    
+    serve(handler=run)
+
+
+def build_parser():
     parser = argparse.ArgumentParser(
         description="Social Engine - Ideas to Posts workflow",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -320,6 +891,8 @@ Examples:
   python social.py review --approve drafts/x.md
   
   python social.py plan --from-approved --platform linkedin --start tomorrow
+  python social.py plan --from-approved --learned  # Best slots from analytics
+  python social.py check queue/plan.json --fix
   python social.py apply queue/plan.json --dry-run
   python social.py apply queue/plan.json
   
@@ -327,18 +900,49 @@ Examples:
   python social.py queue ls --platform linkedin
   python social.py queue sync                  # Sync from Publer
   python social.py queue cancel <post_id>
+  python social.py queue cancel --platform x --match "webinar" --dry-run
+  python social.py queue move --platform linkedin --after 2026-03-02 --shift +2d
+  
+  python social.py analytics sync --from 180d  # Fetch insights not yet stored
+  python social.py analytics report            # Engagement by platform, slot, source
   
   python social.py status                      # Overall pipeline status
+  
+  python social.py serve                       # Keep caches warm; other calls use it
+  
+  python social.py --profile plan --from-approved --slots
+  python social.py --trace-out trace.json apply queue/plan.json
+  python social.py --metrics-file /var/lib/node_exporter/social.prom apply
+  python social.py serve --metrics-port 9464     # Prometheus scrape endpoint
+  python social.py --http-cache queue ls --live  # Reuse cached Publer GETs
+  python social.py cache stats
 """
     )
     
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-phase timing breakdown after the command")
+    parser.add_argument("--trace-out", metavar="PATH",
+                        help="Write timing spans as Chrome trace JSON (chrome://tracing, Perfetto)")
+    
+    parser.add_argument("--workspace", action="append", metavar="NAME",
+                        help="Publer workspace to act on (repeatable or comma-separated; "
+                             "default: every workspace in config/workspaces.json)")
+    
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="Write Prometheus metrics here after the command "
+                             "(default: $SOCIAL_ENGINE_METRICS_FILE)")
+    
+    parser.add_argument("--http-cache", action="store_true",
+                        help="Cache idempotent Publer GETs in state/http_cache.db "
+                             "(default: $PUBLER_HTTP_CACHE)")
+    
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
     # ingest
     ingest_parser = subparsers.add_parser("ingest", help="Ingest ideas from sources")
-    ingest_parser.add_argument("source", choices=["prompts", "transcripts", "agents", "all"], 
+    ingest_parser.add_argument("source", choices=["prompts", "transcripts", "notes", "agents", "all"], 
                                help="Source to ingest from")
-    ingest_parser.add_argument("--path", help="Path for transcripts")
+    ingest_parser.add_argument("--path", help="Path for transcripts or the notes file")
     ingest_parser.add_argument("--repo", help="Path to agents-campaigns repo")
     ingest_parser.add_argument("--since", default="7d", help="How far back to look (e.g., 7d)")
     
@@ -365,24 +969,94 @@ Examples:
     plan_parser.add_argument("--time", help="Start time (HH:MM)")
     plan_parser.add_argument("--every", help="Interval between posts (e.g., 2d)")
     plan_parser.add_argument("--show", nargs="?", const="default", help="Show existing plan")
+    plan_parser.add_argument("--slots", nargs="?", const="default",
+                             help="Fill per-platform slot templates (config/slots.json) around queued posts")
+    plan_parser.add_argument("--learned", action="store_true",
+                             help="Use each account's best slots learned from synced insights (implies --slots)")
+    plan_parser.add_argument("--out", help="Plan file to write (default: queue/plan.json; "
+                             "a .jsonl path streams items to disk as they are planned)")
     
     # apply
     apply_parser = subparsers.add_parser("apply", help="Apply plan to Publer")
     apply_parser.add_argument("plan", nargs="?", help="Path to plan file")
     apply_parser.add_argument("--dry-run", action="store_true", help="Show what would be scheduled")
+    apply_parser.add_argument("--force", action="store_true", help="Skip the conflict check")
+    apply_parser.add_argument("--job-timeout", type=float, default=60.0,
+                              help="Seconds to wait for Publer jobs before leaving them to 'jobs'")
+    apply_parser.add_argument("--min-gap", default="30m", help="Minimum gap between posts per account")
+    apply_parser.add_argument("--max-per-day", type=int, help="Daily cap per account (default: slot templates)")
+    apply_parser.add_argument("--offset", type=int, default=0,
+                              help="Byte offset to start a .jsonl plan from (printed by earlier applies)")
+    apply_parser.add_argument("--resume", action="store_true",
+                              help="Continue a .jsonl plan from where its last apply stopped")
+    apply_parser.add_argument("--rerender", action="store_true",
+                              help="Send the current text of drafts edited since planning instead of failing them")
+    
+    # check
+    check_parser = subparsers.add_parser("check", help="Check a plan against the queue")
+    check_parser.add_argument("plan", nargs="?", help="Path to plan file")
+    check_parser.add_argument("--min-gap", default="30m", help="Minimum gap between posts per account")
+    check_parser.add_argument("--max-per-day", type=int, help="Daily cap per account (default: slot templates)")
+    check_parser.add_argument("--fix", action="store_true", help="Shift conflicting items and save the plan")
+    
+    # jobs
+    jobs_parser = subparsers.add_parser("jobs", help="Confirm schedule jobs left pending")
+    jobs_parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to keep polling")
     
     # queue
     queue_parser = subparsers.add_parser("queue", help="Manage Publer queue")
     queue_parser.add_argument("action", choices=["ls", "sync", "cancel", "move"], 
                               help="Queue action")
-    queue_parser.add_argument("post_id", nargs="?", help="Post ID for cancel/move")
+    queue_parser.add_argument("post_id", nargs="*", help="Post ID(s) for cancel/move")
     queue_parser.add_argument("--platform", help="Filter by platform")
+    queue_parser.add_argument("--refresh", action="store_true", help="Reconcile with Publer before listing (ls)")
+    queue_parser.add_argument("--live", action="store_true", help="List straight from Publer, bypassing the mirror (ls)")
+    queue_parser.add_argument("--account", help="Only posts for this account ID (cancel/move)")
+    queue_parser.add_argument("--after", help="Only posts scheduled at or after this datetime (cancel/move)")
+    queue_parser.add_argument("--before", help="Only posts scheduled before this datetime (cancel/move)")
+    queue_parser.add_argument("--match", help="Only posts whose text contains this (cancel/move)")
     queue_parser.add_argument("--to", help="New datetime for move")
+    queue_parser.add_argument("--shift", help="Move by an offset, e.g. +2d, -3h, 90m")
+    queue_parser.add_argument("--workers", type=int, default=8, help="Concurrent requests (cancel/move)")
+    queue_parser.add_argument("--dry-run", action="store_true", help="List matching posts without changing them")
+    
+    # analytics
+    analytics_parser = subparsers.add_parser("analytics", help="Sync and report post insights")
+    analytics_parser.add_argument("action", choices=["sync", "report"], help="Analytics action")
+    analytics_parser.add_argument("--from", dest="date_from", help="Start date (YYYY-MM-DD or e.g. 90d ago; default 90d)")
+    analytics_parser.add_argument("--to", dest="date_to", help="End date (YYYY-MM-DD, default today)")
+    analytics_parser.add_argument("--platform", help="Only accounts on this platform")
+    analytics_parser.add_argument("--window", type=int, default=7, help="Days per fetched window")
+    analytics_parser.add_argument("--refresh-days", type=int, default=3,
+                                  help="Always re-fetch windows ending this recently")
+    analytics_parser.add_argument("--workers", type=int, default=8, help="Concurrent requests")
+    analytics_parser.add_argument("--tz", default="America/Chicago", help="Timezone for weekday/hour (report)")
+    analytics_parser.add_argument("--top", type=int, default=5, help="Best slots to show (report)")
+    analytics_parser.add_argument("--min-posts", type=int, default=3,
+                                  help="Minimum posts for a slot to rank (report)")
+    analytics_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
     
     # status
     subparsers.add_parser("status", help="Show pipeline status")
     
-    args = parser.parse_args()
+    # cache
+    cache_parser = subparsers.add_parser("cache", help="Inspect or clear the Publer GET cache")
+    cache_parser.add_argument("action", choices=["stats", "clear"], help="Cache action")
+    
+    # serve
+    serve_parser = subparsers.add_parser("serve", help="Run a local command server with warm caches")
+    serve_parser.add_argument("--metrics-port", type=int,
+                              help="Also expose Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    serve_parser.add_argument("--reconcile-every", type=float, metavar="MINUTES",
+                              help="Reconcile the local queue mirror with Publer on this interval")
+    
+    return parser
+
+
+def run(argv):
+    """Parse and execute a command in this process."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
@@ -394,22 +1068,83 @@ Examples:
         "review": cmd_review,
         "plan": cmd_plan,
         "apply": cmd_apply,
+        "check": cmd_check,
+        "jobs": cmd_jobs,
         "queue": cmd_queue,
+        "analytics": cmd_analytics,
         "status": cmd_status,
+        "cache": cmd_cache,
+        "serve": cmd_serve,
     }
     
     cmd_func = commands.get(args.command)
-    if cmd_func:
-        try:
-            cmd_func(args)
-        except Exception as e:
-            print(f"Error: {e}")
-            if "--debug" in sys.argv:
-                raise
-            return 1
+    if not cmd_func:
+        return 0
+    
+    tracing_on = args.profile or args.trace_out
+    if tracing_on:
+        tracing.enable()
+    metrics_file = args.metrics_file or os.getenv("SOCIAL_ENGINE_METRICS_FILE")
+    if metrics_file:
+        from src import metrics
+        metrics.install()
+    if args.http_cache:
+        from src.publer import cache
+        cached_before = cache.set_enabled(True)
+    start = time.perf_counter()
+    try:
+        cmd_func(args)
+    except Exception as e:
+        print(f"Error: {e}")
+        if "--debug" in argv:
+            raise
+        return 1
+    finally:
+        if tracing_on:
+            tracing.disable()
+            wall = time.perf_counter() - start
+            if args.profile:
+                print(tracing.format_profile(wall))
+            if args.trace_out:
+                tracing.write_chrome_trace(Path(args.trace_out))
+                print(f"Trace written to {args.trace_out}")
+        if metrics_file:
+            metrics.save()
+            metrics.write_textfile(Path(metrics_file))
+        if args.http_cache:
+            cache.set_enabled(cached_before)
     
     return 0
 
 
+def _command(argv):
+    """The subcommand ``argv`` runs, or None when it only asks for help or does not parse."""
+    import contextlib
+    import io
+    
+    quiet = io.StringIO()
+    with contextlib.redirect_stdout(quiet), contextlib.redirect_stderr(quiet):
+        try:
+            return build_parser().parse_known_args(argv)[0].command
+        except SystemExit:
+            return None
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Hand the command to a running `social.py serve` when there is one
+    # (global flags may come before the subcommand, so parse rather than
+    # look at argv[0]).
+    command = _command(argv)
+    if command and command != "serve":
+        from src.server import call_server
+        code = call_server(argv)
+        if code is not None:
+            return code
+    
+    return run(argv)
+
+
 if __name__ == "__main__":
     sys.exit(main())
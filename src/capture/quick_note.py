@@ -5,6 +5,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable
+
+from src.statefile import locked
+
+
+def format_note(text: str, timestamp: str) -> str:
+    """One note as a single ``[timestamp] text`` line."""
+    return f"[{timestamp}] {' '.join(text.strip().splitlines())}\n"
 
 
 @dataclass(frozen=True)
@@ -15,9 +23,20 @@ class QuickNoteCapture:
 
     def append_note(self, text: str) -> None:
         """Append a note to the notes file."""
-        self.notes_path.parent.mkdir(parents=True, exist_ok=True)
+        self.append_notes([text])
+
+    def append_notes(self, texts: Iterable[str]) -> int:
+        """Append several notes in one locked write; blank ones are skipped.
+
+        Returns the number of notes written.
+        """
         timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
-        line = f"[{timestamp}] {text.strip()}\n"
-        self.notes_path.write_text(
-            self.notes_path.read_text() + line if self.notes_path.exists() else line
-        )
+        lines = [format_note(text, timestamp) for text in texts if text.strip()]
+        if not lines:
+            return 0
+        # Each batch is a single O_APPEND write under the file's lock, so
+        # concurrent captures never interleave or drop notes.
+        with locked(self.notes_path):
+            with open(self.notes_path, "a") as f:
+                f.write("".join(lines))
+        return len(lines)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 from typing import Optional
 
@@ -15,7 +16,13 @@ def build_parser() -> argparse.ArgumentParser:
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     note_parser = subparsers.add_parser("note", help="Capture a quick idea")
-    note_parser.add_argument("text", type=str, help="Idea text")
+    note_parser.add_argument(
+        "text",
+        type=str,
+        nargs="?",
+        default="-",
+        help="Idea text; '-' or omitted reads one note per line from stdin",
+    )
     note_parser.add_argument(
         "--output",
         type=str,
@@ -27,9 +34,12 @@ def build_parser() -> argparse.ArgumentParser:
 
 
 def run_note(text: str, output: str) -> int:
-    """Append a quick note to the notes file."""
+    """Append a quick note (or one per stdin line for ``-``) to the notes file."""
     capture = QuickNoteCapture(notes_path=Path(output))
-    capture.append_note(text=text)
+    if text == "-":
+        capture.append_notes(sys.stdin)
+    else:
+        capture.append_note(text=text)
     return 0
 
 
@@ -0,0 +1,251 @@
+"""Conflict and density checks for plans against the queued posts.
+
+Every account gets a sorted index of scheduled minutes built from the Publer
+snapshot. Plan items are checked in time order against that index (which
+also receives each accepted plan item), so a check costs O(log n) bisects
+per item plus a per-day counter lookup and stays fast with tens of
+thousands of queued posts. ``PlanValidator`` keeps that index between
+calls, so streamed plans are checked chunk by chunk.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from zoneinfo import ZoneInfo
+
+from src.records import PlanItem, plan_items
+from src.slots import MAX_HORIZON_DAYS, parse_datetime, post_account_id
+
+
+@dataclass(frozen=True)
+class DensityRules:
+    """Limits a plan must respect per account.
+
+    ``max_per_day`` maps platform names to a daily cap; platforms without an
+    entry are uncapped.
+    """
+
+    min_gap_minutes: int = 30
+    max_per_day: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """One rule violation for a plan item."""
+
+    kind: str  # "collision", "min_gap" or "day_cap"
+    index: int
+    draft: str
+    account_id: str
+    scheduled_at: str
+    detail: str
+
+
+@dataclass
+class ValidationResult:
+    """Conflicts found, plus the plan with shifts applied when fixing."""
+
+    conflicts: list[Conflict]
+    plan: dict[str, Any]
+    shifted: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.conflicts
+
+
+class _AccountIndex:
+    """Sorted scheduled minutes and per-day counts for one account."""
+
+    def __init__(self, tz: ZoneInfo, days: dict[int, date]) -> None:
+        self.tz = tz
+        self.minutes: list[int] = []
+        self.per_day: Counter[date] = Counter()
+        self._days = days
+
+    def day(self, minute: int) -> date:
+        # UTC offsets are multiples of 15 minutes, so local dates can be
+        # memoised per quarter hour instead of converted per post.
+        quarter = minute // 15
+        day = self._days.get(quarter)
+        if day is None:
+            day = datetime.fromtimestamp(quarter * 900, self.tz).date()
+            self._days[quarter] = day
+        return day
+
+    def add(self, minute: int) -> None:
+        bisect.insort(self.minutes, minute)
+        self.per_day[self.day(minute)] += 1
+
+    def neighbour(self, minute: int, gap: int) -> Optional[int]:
+        """Closest scheduled minute strictly within ``gap`` of ``minute``."""
+        lo = bisect.bisect_left(self.minutes, minute - gap + 1)
+        hi = bisect.bisect_left(self.minutes, minute + gap)
+        if lo == hi:
+            return None
+        return min(self.minutes[lo:hi], key=lambda m: abs(m - minute))
+
+
+def _build_index(
+    posts: Iterable[dict[str, Any]], tz: ZoneInfo, days: dict[int, date]
+) -> dict[str, _AccountIndex]:
+    minutes: dict[str, list[int]] = {}
+    for post in posts:
+        scheduled = post.get("scheduled_at") or post.get("send_at")
+        account = post_account_id(post)
+        if not scheduled or not account:
+            continue
+        try:
+            minute = int(parse_datetime(scheduled).timestamp()) // 60
+        except ValueError:
+            continue
+        minutes.setdefault(account, []).append(minute)
+
+    index = {}
+    for account, values in minutes.items():
+        entry = _AccountIndex(tz, days)
+        entry.minutes = sorted(values)
+        entry.per_day = Counter(entry.day(m) for m in values)
+        index[account] = entry
+    return index
+
+
+def _fmt(minute: int, tz: ZoneInfo) -> str:
+    return datetime.fromtimestamp(minute * 60, tz).isoformat()
+
+
+class PlanValidator:
+    """Checks plan items against queued ``posts`` and the items checked before them.
+
+    Only each account's scheduled minutes and per-day counts are kept, so a
+    streamed plan can be checked a chunk at a time with ``check``; items are
+    taken in time order within each chunk. ``conflicts`` and ``shifted``
+    accumulate over every chunk checked. See ``validate_plan`` for ``fix``.
+    """
+
+    def __init__(
+        self,
+        posts: Iterable[dict[str, Any]],
+        rules: Optional[DensityRules] = None,
+        timezone: str = "UTC",
+        fix: bool = False,
+    ) -> None:
+        self.rules = rules or DensityRules()
+        self.tz = ZoneInfo(timezone)
+        self.fix = fix
+        self.conflicts: list[Conflict] = []
+        self.shifted = 0
+        self._days: dict[int, date] = {}
+        self._index = _build_index(posts, self.tz, self._days)
+        self._gap = max(self.rules.min_gap_minutes, 1)
+
+    @property
+    def ok(self) -> bool:
+        return not self.conflicts
+
+    def check(self, items: Iterable[PlanItem], start: int = 0) -> list[PlanItem]:
+        """Check ``items`` (plan indexes ``start`` onwards); returns them, shifted when fixing."""
+        rules, tz, gap = self.rules, self.tz, self._gap
+        conflicts = self.conflicts
+        items = list(items)
+        order = sorted(range(len(items)), key=lambda i: parse_datetime(items[i].scheduled_at))
+
+        for i in order:
+            item = items[i]
+            account = item.account_id
+            entry = self._index.get(account)
+            if entry is None:
+                entry = self._index[account] = _AccountIndex(tz, self._days)
+            cap = rules.max_per_day.get(item.platform)
+            original = int(parse_datetime(item.scheduled_at).timestamp()) // 60
+            horizon = original + MAX_HORIZON_DAYS * 1440
+            minute = original
+
+            if cap is not None and cap < 1:
+                # No day can take the post, so there is nothing to shift it to.
+                conflicts.append(Conflict(
+                    kind="day_cap",
+                    index=start + i,
+                    draft=item.draft,
+                    account_id=account,
+                    scheduled_at=item.scheduled_at,
+                    detail=f"daily cap for {item.platform} is {cap}; cannot be fixed",
+                ))
+                entry.add(minute)
+                continue
+
+            while True:
+                problem = None
+                day = entry.day(minute)
+                other = entry.neighbour(minute, gap)
+                if cap is not None and entry.per_day[day] >= cap:
+                    problem = ("day_cap", f"{entry.per_day[day]} posts already on {day} (max {cap})")
+                elif other == minute:
+                    problem = ("collision", f"another post at {_fmt(other, tz)}")
+                elif other is not None:
+                    problem = (
+                        "min_gap",
+                        f"{abs(other - minute)} min from post at {_fmt(other, tz)}"
+                        f" (min {rules.min_gap_minutes})",
+                    )
+
+                if problem is None:
+                    break
+                if minute == original:
+                    conflicts.append(Conflict(
+                        kind=problem[0],
+                        index=start + i,
+                        draft=item.draft,
+                        account_id=account,
+                        scheduled_at=item.scheduled_at,
+                        detail=problem[1],
+                    ))
+                if not self.fix:
+                    break
+                if problem[0] == "day_cap":
+                    next_day = datetime.fromtimestamp(minute * 60, tz) + timedelta(days=1)
+                    minute = int(next_day.timestamp()) // 60
+                else:
+                    minute = other + gap
+                if minute > horizon:
+                    conflicts[-1] = replace(
+                        conflicts[-1],
+                        detail=f"{conflicts[-1].detail}; no free time within {MAX_HORIZON_DAYS} days",
+                    )
+                    minute = original
+                    break
+
+            if minute != original:
+                items[i] = replace(item, scheduled_at=_fmt(minute, tz), shifted_from=_fmt(original, tz))
+                self.shifted += 1
+            entry.add(minute)
+
+        return items
+
+
+def validate_plan(
+    plan: dict[str, Any],
+    posts: Iterable[dict[str, Any]],
+    rules: Optional[DensityRules] = None,
+    fix: bool = False,
+) -> ValidationResult:
+    """Check plan items against queued ``posts`` and each other.
+
+    With ``fix=True`` conflicting items are moved to the next time that
+    satisfies every rule (past the blocking neighbour, or to the same time
+    on the next day when the day is full) and the returned plan carries the
+    new times; conflicts are still reported with their original times.
+    Items that cannot be placed (a daily cap below 1, or no free time within
+    ``MAX_HORIZON_DAYS``) keep their time and their conflict is marked
+    unfixable.
+    """
+    validator = PlanValidator(posts, rules, plan.get("timezone", "UTC"), fix)
+    items = validator.check(plan_items(plan))
+    return ValidationResult(
+        conflicts=validator.conflicts, plan={**plan, "items": items}, shifted=validator.shifted
+    )
@@ -6,11 +6,18 @@ import re
 from datetime import datetime, timezone
 from pathlib import Path
 
+from src.records import Draft, Idea
+from src.state import log_event
+from src.tracing import span
+
 
 WORKSPACE_ROOT = Path(__file__).parent.parent
 IDEAS_DIR = WORKSPACE_ROOT / "ideas"
 DRAFTS_DIR = WORKSPACE_ROOT / "drafts"
 
+# path -> (mtime_ns, size, frontmatter, body) for files parsed by this process
+_markdown_cache: dict[str, tuple[int, int, dict, str]] = {}
+
 
 def parse_frontmatter(content: str) -> tuple[dict, str]:
     """Parse frontmatter from markdown content.
@@ -45,42 +52,59 @@ def write_frontmatter(frontmatter: dict, body: str) -> str:
     return "\n".join(lines)
 
 
-def list_ideas(status: str = "ready") -> list[dict]:
-    """Read all ideas from ideas/ folder, filter by status.
+def read_markdown(file_path: Path) -> tuple[dict, str]:
+    """Read and parse a markdown file with frontmatter.
     
-    Returns list of idea dicts with id, source, content, status.
+    Parsed results are cached per path and reused while the file's mtime
+    and size are unchanged, so repeated listings only stat the files.
     """
+    stat = file_path.stat()
+    key = str(file_path)
+    cached = _markdown_cache.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return dict(cached[2]), cached[3]
+    
+    with span("parse_frontmatter", "parse", path=key):
+        frontmatter, body = parse_frontmatter(file_path.read_text())
+    _markdown_cache[key] = (stat.st_mtime_ns, stat.st_size, frontmatter, body)
+    return dict(frontmatter), body
+
+
+def list_ideas(status: str = "ready") -> list[Idea]:
+    """Read all ideas from ideas/ folder, filter by status."""
     ideas = []
     
     if not IDEAS_DIR.exists():
         return ideas
     
-    for file_path in IDEAS_DIR.glob("*.md"):
-        content = file_path.read_text()
-        frontmatter, body = parse_frontmatter(content)
+    with span("scan ideas/", "scan"):
+        files = list(IDEAS_DIR.glob("*.md"))
+    
+    for file_path in files:
+        frontmatter, body = read_markdown(file_path)
         
         idea_status = frontmatter.get("status", "ready")
         if status and idea_status != status:
             continue
         
-        ideas.append({
-            "id": file_path.stem,
-            "source": frontmatter.get("source", ""),
-            "content": body.strip(),
-            "status": idea_status,
-            "path": str(file_path),
-        })
+        ideas.append(Idea(
+            id=file_path.stem,
+            source=frontmatter.get("source", ""),
+            content=body.strip(),
+            status=idea_status,
+            path=str(file_path),
+        ))
     
     return ideas
 
 
-def generate_draft_linkedin(idea: dict) -> str:
+def generate_draft_linkedin(idea: Idea) -> str:
     """Generate LinkedIn post content from an idea.
     
     This is a TEMPLATE/PLACEHOLDER - in real use, Amp or LLM would fill this.
     Returns the idea content with LinkedIn formatting hints.
     """
-    content = idea.get("content", "")
+    content = idea.content
     
     linkedin_post = f"""# LinkedIn Post
 
@@ -98,13 +122,13 @@ def generate_draft_linkedin(idea: dict) -> str:
     return linkedin_post
 
 
-def generate_draft_twitter(idea: dict) -> str:
+def generate_draft_twitter(idea: Idea) -> str:
     """Generate Twitter/X post content from an idea.
     
     This is a TEMPLATE/PLACEHOLDER - in real use, Amp or LLM would fill this.
     Returns the idea content with Twitter formatting hints.
     """
-    content = idea.get("content", "")
+    content = idea.content
     
     if len(content) > 200:
         content = content[:200] + "..."
@@ -145,12 +169,13 @@ def create_drafts_from_idea(
     content = idea_path.read_text()
     frontmatter, body = parse_frontmatter(content)
     
-    idea = {
-        "id": idea_id,
-        "source": frontmatter.get("source", ""),
-        "content": body.strip(),
-        "status": frontmatter.get("status", "ready"),
-    }
+    idea = Idea(
+        id=idea_id,
+        source=frontmatter.get("source", ""),
+        content=body.strip(),
+        status=frontmatter.get("status", "ready"),
+        path=str(idea_path),
+    )
     
     DRAFTS_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -183,6 +208,7 @@ def create_drafts_from_idea(
         draft_path.write_text(draft_md)
         
         created_drafts.append(draft_filename)
+        log_event("draft_created", {"idea_id": idea_id, "platform": platform, "draft": draft_filename})
     
     frontmatter["status"] = "drafted"
     updated_idea = write_frontmatter(frontmatter, body)
@@ -191,23 +217,25 @@ def create_drafts_from_idea(
     return created_drafts
 
 
-def list_drafts(status: str | None = None, platform: str | None = None) -> list[dict]:
+def list_drafts(status: str | None = None, platform: str | None = None) -> list[Draft]:
     """Read all drafts from drafts/ folder with optional filters.
     
     Args:
         status: Filter by status (e.g., "draft", "approved")
         platform: Filter by platform (e.g., "linkedin", "twitter")
     
-    Returns list of draft dicts with frontmatter fields and content.
+    Returns the matching drafts.
     """
     drafts = []
     
     if not DRAFTS_DIR.exists():
         return drafts
     
-    for file_path in DRAFTS_DIR.glob("*.md"):
-        content = file_path.read_text()
-        frontmatter, body = parse_frontmatter(content)
+    with span("scan drafts/", "scan"):
+        files = list(DRAFTS_DIR.glob("*.md"))
+    
+    for file_path in files:
+        frontmatter, body = read_markdown(file_path)
         
         draft_status = frontmatter.get("status", "draft")
         draft_platform = frontmatter.get("platform", "")
@@ -217,15 +245,15 @@ def list_drafts(status: str | None = None, platform: str | None = None) -> list[
         if platform and draft_platform != platform:
             continue
         
-        drafts.append({
-            "filename": file_path.name,
-            "path": str(file_path),
-            "idea_id": frontmatter.get("idea_id", ""),
-            "platform": draft_platform,
-            "status": draft_status,
-            "created_at": frontmatter.get("created_at", ""),
-            "content": body.strip(),
-        })
+        drafts.append(Draft(
+            path=str(file_path),
+            idea_id=frontmatter.get("idea_id", ""),
+            platform=draft_platform,
+            status=draft_status,
+            created_at=frontmatter.get("created_at", ""),
+            content=body.strip(),
+            workspace=frontmatter.get("workspace") or None,
+        ))
     
     return drafts
 
@@ -250,3 +278,4 @@ def approve_draft(draft_path: str) -> None:
     
     updated_content = write_frontmatter(frontmatter, body)
     path.write_text(updated_content)
+    log_event("draft_approved", {"draft": path.name, "platform": frontmatter.get("platform", "")})
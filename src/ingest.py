@@ -5,6 +5,11 @@ import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
 
+from src.state import log_event
+from src.statefile import locked, read_json, write_json
+
+NOTE_LINE = re.compile(r'^\[([^\]]*)\]\s*(.*)$')
+
 
 def slugify(text: str) -> str:
     """Convert text to URL-friendly slug."""
@@ -46,6 +51,7 @@ created_at: {created_at}
     ideas_dir.mkdir(parents=True, exist_ok=True)
     filepath = ideas_dir / f"{idea_id}.md"
     filepath.write_text(frontmatter + content.strip() + "\n")
+    log_event("idea_ingested", {"idea_id": idea_id, "source": source})
     return filepath
 
 
@@ -173,19 +179,88 @@ def ingest_agents_campaigns(
     return created_ids
 
 
+def _unique_idea_id(ideas_dir: Path, idea_id: str) -> str:
+    """``idea_id``, suffixed with a counter if an idea file already uses it."""
+    candidate, n = idea_id, 1
+    while (ideas_dir / f"{candidate}.md").exists():
+        n += 1
+        candidate = f"{idea_id}-{n}"
+    return candidate
+
+
+def notes_cursor_path(notes_path: Path) -> Path:
+    """Where ``ingest_notes`` keeps its byte offset for a notes file."""
+    return notes_path.with_name(f"{notes_path.stem}.cursor.json")
+
+
+def ingest_notes(notes_path: Path, ideas_dir: Path, cursor_path: Path | None = None) -> list[str]:
+    """
+    Turn quick notes added since the last run into ideas.
+    A byte-offset cursor records how far the notes file has been read, so
+    each run only reads the new tail. Partial last lines are left for the
+    next run; a file shorter than the cursor (rotated) is read from the start.
+    The cursor's lock is held from reading it to advancing it, so concurrent
+    runs never ingest the same notes twice.
+    Returns list of created idea IDs.
+    """
+    cursor_path = cursor_path or notes_cursor_path(notes_path)
+    
+    if not notes_path.exists():
+        return []
+    
+    with locked(cursor_path):
+        return _ingest_notes_locked(notes_path, ideas_dir, cursor_path)
+
+
+def _ingest_notes_locked(notes_path: Path, ideas_dir: Path, cursor_path: Path) -> list[str]:
+    created_ids = []
+    offset = int(read_json(cursor_path, {}).get("offset", 0))
+    if notes_path.stat().st_size < offset:
+        offset = 0
+    
+    with open(notes_path, "rb") as f:
+        f.seek(offset)
+        chunk = f.read()
+    end = chunk.rfind(b"\n") + 1
+    if not end:
+        return created_ids
+    
+    position = offset
+    for raw in chunk[:end].splitlines(keepends=True):
+        line_offset = position
+        position += len(raw)
+        match = NOTE_LINE.match(raw.decode("utf-8", errors="replace").strip())
+        content = match.group(2) if match else raw.decode("utf-8", errors="replace").strip()
+        if not content:
+            continue
+        
+        slug = slugify(" ".join(content.split()[:8]))
+        # Notes ingested in the same second can share their first words.
+        idea_id = _unique_idea_id(ideas_dir, generate_idea_id(slug))
+        source = f"notes:{notes_path.name}#{line_offset}"
+        
+        write_idea(ideas_dir, idea_id, source, content)
+        created_ids.append(idea_id)
+    
+    write_json(cursor_path, {"offset": offset + end, "updated_at": datetime.now(timezone.utc).isoformat()})
+    return created_ids
+
+
 def ingest_all(
     workspace: Path,
     agents_repo: Path | None = None,
     since_days: int = 7,
+    ideas_dir: Path | None = None,
 ) -> dict[str, list[str]]:
     """
     Run all ingestion sources and return summary.
     """
-    ideas_dir = workspace / "ideas"
+    ideas_dir = ideas_dir or workspace / "ideas"
     
     results = {
         "prompts": ingest_prompts(workspace / "prompts", ideas_dir),
         "transcripts": ingest_transcripts(workspace / "inputs" / "transcripts", ideas_dir),
+        "notes": ingest_notes(workspace / "state" / "quick_notes.txt", ideas_dir),
         "agents": [],
     }
     
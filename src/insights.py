@@ -0,0 +1,403 @@
+"""Local store of Publer post insights, synced incrementally.
+
+Insights live in ``state/analytics.db`` (SQLite):
+
+- ``insights``: one row per post with its latest metrics, plus its publish
+  time as whole UTC hours since the epoch (``published_hour``) so reports
+  can group on an integer through a covering index
+- ``windows``:  which (account, date window) ranges have been fetched
+
+A sync splits the requested range into fixed windows aligned to the epoch
+(so the same dates always map to the same windows), skips windows already
+stored, and fetches the rest for every account concurrently. Windows that
+end within ``refresh_days`` of today are re-fetched on every sync because
+recent posts are still collecting engagement.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from src.publer.analytics import AnalyticsRequest, PublerAnalytics
+from src.publer.client import PublerClient
+from src.slots import parse_datetime
+from src.state import STATE_DIR, log_event
+
+INSIGHTS_DB = STATE_DIR / "analytics.db"
+
+EPOCH = date(1970, 1, 1)
+METRIC_FIELDS = ("impressions", "reach", "engagements", "clicks", "likes", "comments", "shares")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS insights (
+    post_id TEXT PRIMARY KEY,
+    account_id TEXT NOT NULL,
+    network TEXT,
+    published_at TEXT,
+    published_hour INTEGER,
+    text TEXT,
+    {", ".join(f"{name} INTEGER NOT NULL DEFAULT 0" for name in METRIC_FIELDS)},
+    synced_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS insights_account_published ON insights (account_id, published_at);
+CREATE INDEX IF NOT EXISTS insights_slots
+    ON insights (network, published_hour, impressions, engagements, clicks);
+CREATE TABLE IF NOT EXISTS windows (
+    account_id TEXT NOT NULL,
+    date_from TEXT NOT NULL,
+    date_to TEXT NOT NULL,
+    post_count INTEGER NOT NULL,
+    settled INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (account_id, date_from, date_to)
+);
+"""
+
+
+def date_windows(date_from: date, date_to: date, days: int = 7) -> list[tuple[date, date]]:
+    """Epoch-aligned ``days``-long windows covering ``date_from``..``date_to`` (inclusive)."""
+    start = date_from - timedelta(days=(date_from - EPOCH).days % days)
+    windows = []
+    while start <= date_to:
+        windows.append((start, start + timedelta(days=days - 1)))
+        start += timedelta(days=days)
+    return windows
+
+
+def _insight_rows(response: Any) -> list[dict[str, Any]]:
+    if isinstance(response, list):
+        return response
+    return response.get("posts") or response.get("data") or []
+
+
+def _published_hour(value: Any) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        at = parse_datetime(str(value))
+    except ValueError:
+        return None
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return int(at.timestamp()) // 3600
+
+
+def _metric(row: dict[str, Any], name: str) -> int:
+    value = row.get(name)
+    if value is None:
+        value = (row.get("analytics") or {}).get(name)
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class InsightsStore:
+    """SQLite-backed insights and fetched-window bookkeeping."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or INSIGHTS_DB
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.row_factory = sqlite3.Row
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(insights)")}
+        if columns and "published_hour" not in columns:
+            with self._db:
+                self._db.execute("ALTER TABLE insights ADD COLUMN published_hour INTEGER")
+                self._db.execute(
+                    "UPDATE insights SET published_hour = CAST(strftime('%s', published_at) AS INTEGER) / 3600"
+                )
+        self._db.executescript(_SCHEMA)
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        """The underlying connection (shared with derived models such as slot learning)."""
+        return self._db
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "InsightsStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def settled_windows(self, account_id: str) -> set[tuple[str, str]]:
+        rows = self._db.execute(
+            "SELECT date_from, date_to FROM windows WHERE account_id = ? AND settled = 1", (account_id,)
+        )
+        return {(r["date_from"], r["date_to"]) for r in rows}
+
+    def store_window(
+        self, account_id: str, window: tuple[date, date], rows: list[dict[str, Any]], settled: bool
+    ) -> int:
+        """Upsert a window's insights and mark the window fetched, in one transaction."""
+        now = datetime.now(timezone.utc).isoformat()
+        records = []
+        for row in rows:
+            post_id = row.get("post_id") or row.get("id")
+            if not post_id:
+                continue
+            published_at = row.get("published_at") or row.get("scheduled_at")
+            records.append((
+                str(post_id),
+                row.get("account_id") or account_id,
+                row.get("network") or row.get("provider"),
+                published_at,
+                _published_hour(published_at),
+                row.get("text"),
+                *(_metric(row, name) for name in METRIC_FIELDS),
+                now,
+            ))
+        placeholders = ", ".join("?" * (7 + len(METRIC_FIELDS)))
+        with self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO insights (post_id, account_id, network, published_at, published_hour, text, "
+                f"{', '.join(METRIC_FIELDS)}, synced_at) VALUES ({placeholders})",
+                records,
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO windows VALUES (?, ?, ?, ?, ?, ?)",
+                (account_id, str(window[0]), str(window[1]), len(records), int(settled), now),
+            )
+        return len(records)
+
+    def rows(self, account_ids: Optional[Iterable[str]] = None) -> list[sqlite3.Row]:
+        """All stored insights, optionally for some accounts only."""
+        if account_ids is None:
+            return self._db.execute("SELECT * FROM insights").fetchall()
+        ids = list(account_ids)
+        return self._db.execute(
+            f"SELECT * FROM insights WHERE account_id IN ({', '.join('?' * len(ids))})", ids
+        ).fetchall()
+
+
+@dataclass
+class SyncResult:
+    windows_total: int = 0
+    windows_skipped: int = 0
+    windows_fetched: int = 0
+    posts: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def sync_insights(
+    client: PublerClient,
+    accounts: list[dict[str, Any]],
+    date_from: date,
+    date_to: date,
+    window_days: int = 7,
+    refresh_days: int = 3,
+    max_workers: int = 8,
+    store: Optional[InsightsStore] = None,
+    today: Optional[date] = None,
+) -> SyncResult:
+    """Fetch insights for every account and window not already stored."""
+    today = today or datetime.now(timezone.utc).date()
+    settle_before = today - timedelta(days=refresh_days)
+    analytics = PublerAnalytics(client)
+    own_store = store is None
+    store = store or InsightsStore()
+    result = SyncResult()
+
+    tasks = []
+    for account in accounts:
+        account_id = str(account.get("id"))
+        done = store.settled_windows(account_id)
+        for window in date_windows(date_from, date_to, window_days):
+            result.windows_total += 1
+            if (str(window[0]), str(window[1])) in done:
+                result.windows_skipped += 1
+                continue
+            tasks.append((account_id, window))
+
+    def fetch(task: tuple[str, tuple[date, date]]) -> list[dict[str, Any]]:
+        account_id, (start, end) = task
+        return _insight_rows(analytics.post_insights(AnalyticsRequest(account_id, str(start), str(end))))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(fetch, task): task for task in tasks}
+            # SQLite writes stay on this thread; workers only do HTTP.
+            for future in as_completed(futures):
+                account_id, window = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    result.errors.append(f"{account_id} {window[0]}..{window[1]}: {e}")
+                    continue
+                result.posts += store.store_window(account_id, window, rows, settled=window[1] < settle_before)
+                result.windows_fetched += 1
+    finally:
+        if own_store:
+            store.close()
+
+    log_event("analytics_synced", {
+        "accounts": len(accounts),
+        "from": str(date_from),
+        "to": str(date_to),
+        "windows_fetched": result.windows_fetched,
+        "windows_skipped": result.windows_skipped,
+        "posts": result.posts,
+        "errors": len(result.errors),
+    })
+    return result
+
+
+@dataclass
+class Totals:
+    """Summed metrics for one report bucket."""
+
+    posts: int = 0
+    impressions: int = 0
+    engagements: int = 0
+    clicks: int = 0
+
+    def add(self, posts: int, impressions: int, engagements: int, clicks: int) -> None:
+        self.posts += posts
+        self.impressions += impressions
+        self.engagements += engagements
+        self.clicks += clicks
+
+    @property
+    def engagement_rate(self) -> float:
+        return self.engagements / self.impressions if self.impressions else 0.0
+
+    @property
+    def ctr(self) -> float:
+        return self.clicks / self.impressions if self.impressions else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "posts": self.posts,
+            "impressions": self.impressions,
+            "engagements": self.engagements,
+            "clicks": self.clicks,
+            "engagement_rate": self.engagement_rate,
+            "ctr": self.ctr,
+        }
+
+
+@dataclass
+class InsightsReport:
+    platforms: dict[str, Totals] = field(default_factory=dict)
+    weekdays: dict[int, Totals] = field(default_factory=dict)
+    hours: dict[int, Totals] = field(default_factory=dict)
+    slots: dict[tuple[int, int], Totals] = field(default_factory=dict)
+    sources: dict[str, Totals] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "platforms": {k: v.to_dict() for k, v in self.platforms.items()},
+            "weekdays": {str(k): v.to_dict() for k, v in self.weekdays.items()},
+            "hours": {str(k): v.to_dict() for k, v in self.hours.items()},
+            "slots": {f"{d}-{h:02d}": v.to_dict() for (d, h), v in self.slots.items()},
+            "sources": {k: v.to_dict() for k, v in self.sources.items()},
+        }
+
+
+def idea_sources_by_post() -> dict[str, str]:
+    """Map Publer post ids to the source kind of the idea behind them.
+
+    Read from the link store (idea -> draft -> post), keeping only the
+    kind (``prompts``, ``transcripts``, ``agents``...).
+    """
+    from src.linkage import LinkStore
+
+    with LinkStore() as links:
+        return links.sources_by_post()
+
+
+def build_report(
+    store: InsightsStore,
+    tz: str = "UTC",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    platform: Optional[str] = None,
+    sources: Optional[dict[str, str]] = None,
+) -> InsightsReport:
+    """Aggregate stored insights by platform, weekday, hour, slot and idea source.
+
+    SQLite sums metrics per network and UTC hour, streaming through the
+    covering ``insights_slots`` index. Python then maps each distinct hour to
+    ``tz`` once and folds the groups into the report. Idea sources are
+    summed with a join against the linked posts only; everything else counts
+    as ``(unlinked)``.
+    """
+    from zoneinfo import ZoneInfo
+
+    where, params = ["published_hour IS NOT NULL"], []
+    if date_from:
+        where.append("published_hour >= ?")
+        params.append(_published_hour(f"{date_from}T00:00:00+00:00"))
+    if date_to:
+        where.append("published_hour < ?")
+        params.append(_published_hour(f"{date_to + timedelta(days=1)}T00:00:00+00:00"))
+    if platform:
+        where.append("network = ?")
+        params.append(platform)
+    condition = " AND ".join(where)
+
+    db = store._db
+    groups = db.execute(
+        f"SELECT network, published_hour, COUNT(*), SUM(impressions), SUM(engagements), SUM(clicks) "
+        f"FROM insights WHERE {condition} GROUP BY network, published_hour",
+        params,
+    ).fetchall()
+
+    zone = ZoneInfo(tz)
+    # (network, weekday, hour) -> [posts, impressions, engagements, clicks]
+    folded: dict[tuple[str, int, int], list[int]] = {}
+    for network, hour, posts, impressions, engagements, clicks in groups:
+        at = datetime.fromtimestamp(hour * 3600, zone)
+        key = (network or "?", at.weekday(), at.hour)
+        sums = folded.get(key)
+        if sums is None:
+            folded[key] = [posts, impressions, engagements, clicks]
+        else:
+            sums[0] += posts
+            sums[1] += impressions
+            sums[2] += engagements
+            sums[3] += clicks
+
+    report = InsightsReport()
+    overall = Totals()
+    for (network, weekday, hour), sums in folded.items():
+        overall.add(*sums)
+        for bucket, key in (
+            (report.platforms, network),
+            (report.weekdays, weekday),
+            (report.hours, hour),
+            (report.slots, (weekday, hour)),
+        ):
+            totals = bucket.get(key)
+            if totals is None:
+                totals = bucket[key] = Totals()
+            totals.add(*sums)
+
+    # No key on the temp table: the join scans it and probes insights by post_id.
+    db.execute("CREATE TEMP TABLE IF NOT EXISTS post_sources (post_id TEXT, source TEXT)")
+    db.execute("DELETE FROM post_sources")
+    db.executemany("INSERT INTO post_sources VALUES (?, ?)", (sources or {}).items())
+    unlinked = overall
+    for source, posts, impressions, engagements, clicks in db.execute(
+        f"SELECT source, COUNT(*), SUM(impressions), SUM(engagements), SUM(clicks) "
+        f"FROM post_sources JOIN insights USING (post_id) WHERE {condition} GROUP BY source",
+        params,
+    ):
+        report.sources[source] = Totals(posts, impressions, engagements, clicks)
+        unlinked = Totals(
+            unlinked.posts - posts,
+            unlinked.impressions - impressions,
+            unlinked.engagements - engagements,
+            unlinked.clicks - clicks,
+        )
+    if unlinked.posts:
+        report.sources["(unlinked)"] = unlinked
+    return report
@@ -0,0 +1,163 @@
+"""Write-ahead journal for applying plans.
+
+Each plan gets ``state/journals/<plan_hash>.jsonl``. Every plan item has an
+idempotency key derived from the plan hash, draft, account and scheduled
+time, and moves through::
+
+    pending -> submitted -> confirmed
+                         -> failed
+
+A ``submitted`` record is written *before* the post request goes out, so
+after a crash an item is either confirmed (skip it), submitted (reconcile it
+against Publer before retrying) or pending/failed (safe to send). Records
+are appended and fsynced; the latest record per key wins on replay, and a
+torn final line from a crash is ignored.
+
+Applying a streamed (JSONL) plan also keeps ``<plan_hash>.offset``, the byte
+offset in the plan file up to which every item has been handled, so a
+resumed apply can seek past them instead of re-reading them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from src.records import PlanItem, plan_items
+from src.state import STATE_DIR
+from src.statefile import append_line, read_json, write_json
+
+JOURNAL_DIR = STATE_DIR / "journals"
+
+PENDING = "pending"
+SUBMITTED = "submitted"
+CONFIRMED = "confirmed"
+FAILED = "failed"
+
+
+def plan_hash(plan: dict[str, Any]) -> str:
+    """Stable hash of a plan's items."""
+    return items_hash(plan_items(plan))
+
+
+def items_hash(items: Iterable[PlanItem]) -> str:
+    """``plan_hash`` of a plan with ``items``, computed in one pass without holding them.
+
+    Equal to hashing the items' canonical JSON array, so a plan hashes the
+    same whether it is saved as JSON or streamed as JSONL.
+    """
+    digest = hashlib.sha256(b"[")
+    for i, item in enumerate(items):
+        if i:
+            digest.update(b",")
+        digest.update(json.dumps(item.to_dict(), sort_keys=True, separators=(",", ":")).encode())
+    digest.update(b"]")
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class JournalEntry:
+    key: str
+    state: str
+    draft: str
+    account_id: str
+    scheduled_at: str
+    job_id: Optional[str] = None
+    post_id: Optional[str] = None
+    error: Optional[str] = None
+    updated_at: str = ""
+
+
+class PlanJournal:
+    """Append-only per-plan journal of item states."""
+
+    def __init__(self, path: Path, plan_hash: str) -> None:
+        self.path = path
+        self.plan_hash = plan_hash
+        self._entries: dict[str, JournalEntry] = {}
+        self._replay()
+
+    @classmethod
+    def for_plan(cls, plan: dict[str, Any], journal_dir: Optional[Path] = None) -> "PlanJournal":
+        return cls.for_hash(plan_hash(plan), journal_dir)
+
+    @classmethod
+    def for_hash(cls, digest: str, journal_dir: Optional[Path] = None) -> "PlanJournal":
+        """The journal of the plan whose items hash to ``digest`` (see ``items_hash``)."""
+        return cls((journal_dir or JOURNAL_DIR) / f"{digest}.jsonl", digest)
+
+    def _replay(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self._entries[record["key"]] = JournalEntry(**record)
+
+    def key(self, item: PlanItem) -> str:
+        """Idempotency key for a plan item."""
+        parts = [self.plan_hash, item.draft, item.account_id, item.scheduled_at]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:24]
+
+    def get(self, key: str) -> Optional[JournalEntry]:
+        return self._entries.get(key)
+
+    def post_ids(self) -> set[str]:
+        """IDs of the Publer posts recorded for this plan's items."""
+        return {entry.post_id for entry in self._entries.values() if entry.post_id}
+
+    def _entry(self, item: PlanItem, state: str, fields: dict[str, Any]) -> JournalEntry:
+        key = self.key(item)
+        previous = self._entries.get(key)
+        return JournalEntry(
+            key=key,
+            state=state,
+            draft=item.draft,
+            account_id=item.account_id,
+            scheduled_at=item.scheduled_at,
+            job_id=fields.get("job_id", previous.job_id if previous else None),
+            post_id=fields.get("post_id", previous.post_id if previous else None),
+            error=fields.get("error"),
+            updated_at=datetime.utcnow().isoformat() + "Z",
+        )
+
+    def record(self, item: PlanItem, state: str, **fields: Any) -> JournalEntry:
+        """Durably record a new state for ``item``.
+
+        Fields not given (``job_id``, ``post_id``) carry over from the
+        previous record for the same key.
+        """
+        return self.record_many([item], state, **fields)[0]
+
+    def record_many(self, items: Iterable[PlanItem], state: str, **fields: Any) -> list[JournalEntry]:
+        """Durably record the same new state for several items with one write and one fsync."""
+        entries = [self._entry(item, state, fields) for item in items]
+        if entries:
+            append_line(self.path, "\n".join(json.dumps(asdict(entry)) for entry in entries), sync=True)
+        for entry in entries:
+            self._entries[entry.key] = entry
+        return entries
+
+    @property
+    def offset_path(self) -> Path:
+        return self.path.with_suffix(".offset")
+
+    def save_offset(self, offset: int) -> None:
+        """Remember that a streamed (JSONL) plan was applied up to byte ``offset``."""
+        write_json(self.offset_path, {"offset": offset}, indent=None)
+
+    def saved_offset(self) -> int:
+        """Where an interrupted apply of a streamed plan stopped (0 if it never ran)."""
+        return int((read_json(self.offset_path) or {}).get("offset", 0))
+
+    def summary(self) -> Counter[str]:
+        """Count items per state."""
+        return Counter(entry.state for entry in self._entries.values())
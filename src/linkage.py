@@ -0,0 +1,230 @@
+"""Links from ideas through drafts and plan items to Publer posts.
+
+``state/links.db`` (SQLite) has one row per plan item that reached Publer,
+keyed by the item's journal key (see ``src.journal``)::
+
+    idea -> draft -> plan item -> job id -> post id
+
+Each column along the chain is indexed, so following it in either direction
+(which posts came from an idea, which idea a post came from) is an index
+lookup rather than a scan of drafts and ideas. ``apply`` and job settling
+record items as they are submitted and confirmed; ``queue sync`` attaches
+post ids to items whose job never reported one. Insights join on
+``post_id``.
+
+Every update runs in a single transaction. The flat
+``state/local_index.json`` this replaces is imported on first use.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from src import drafts
+from src.journal import FAILED, JournalEntry
+from src.slots import parse_datetime, post_account_id
+from src.state import STATE_DIR
+
+LINKS_DB = STATE_DIR / "links.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    item_key TEXT PRIMARY KEY,
+    plan_hash TEXT,
+    idea_id TEXT,
+    idea_source TEXT,
+    draft_id TEXT NOT NULL,
+    platform TEXT,
+    account_id TEXT,
+    scheduled_at TEXT,
+    scheduled_minute INTEGER,
+    job_id TEXT,
+    post_id TEXT,
+    state TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS links_idea ON links (idea_id);
+CREATE INDEX IF NOT EXISTS links_draft ON links (draft_id);
+CREATE INDEX IF NOT EXISTS links_job ON links (job_id);
+CREATE UNIQUE INDEX IF NOT EXISTS links_post ON links (post_id);
+CREATE INDEX IF NOT EXISTS links_unmatched ON links (account_id, scheduled_minute) WHERE post_id IS NULL;
+"""
+
+
+@dataclass(frozen=True)
+class Link:
+    """One plan item's place in the idea -> post chain."""
+
+    item_key: str
+    plan_hash: Optional[str]
+    idea_id: Optional[str]
+    idea_source: Optional[str]
+    draft_id: str
+    platform: Optional[str]
+    account_id: Optional[str]
+    scheduled_at: Optional[str]
+    job_id: Optional[str]
+    post_id: Optional[str]
+    state: str
+    updated_at: str
+
+
+_COLUMNS = ", ".join(Link.__dataclass_fields__)
+
+
+def _minute(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return int(parse_datetime(value).timestamp()) // 60
+    except ValueError:
+        return None
+
+
+def _idea_of(draft: str) -> tuple[Optional[str], Optional[str]]:
+    """``(idea_id, source kind)`` for a draft path, if the files are still there."""
+    draft_path = Path(draft)
+    if not draft_path.exists():
+        draft_path = drafts.DRAFTS_DIR / draft_path.name
+    if not draft_path.exists():
+        return None, None
+    idea_id = drafts.read_markdown(draft_path)[0].get("idea_id") or None
+    if not idea_id:
+        return None, None
+    idea_path = drafts.IDEAS_DIR / f"{idea_id}.md"
+    source = drafts.read_markdown(idea_path)[0].get("source", "") if idea_path.exists() else ""
+    return idea_id, source.split(":", 1)[0] or None
+
+
+class LinkStore:
+    """SQLite-backed idea/draft/job/post links."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or LINKS_DB
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._import_local_index()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "LinkStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _import_local_index(self) -> None:
+        legacy = self.path.parent / "local_index.json"
+        if not legacy.exists():
+            return
+        try:
+            index = json.loads(legacy.read_text())
+        except (json.JSONDecodeError, OSError):
+            index = {}
+        now = datetime.now(timezone.utc).isoformat()
+        with self._db:
+            for draft_id, post_id in index.items():
+                idea_id, source = _idea_of(str(drafts.DRAFTS_DIR / f"{draft_id}.md"))
+                self._db.execute(
+                    "INSERT OR IGNORE INTO links (item_key, draft_id, idea_id, idea_source, post_id, state, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, 'confirmed', ?)",
+                    (f"legacy:{draft_id}", draft_id, idea_id, source, str(post_id), now),
+                )
+        legacy.rename(legacy.with_name("local_index.json.migrated"))
+
+    def record(self, entry: JournalEntry, plan_hash: str, platform: Optional[str] = None) -> None:
+        """Upsert the link for a journal entry.
+
+        The idea is resolved from the draft the first time an item is seen;
+        ``job_id`` and ``post_id`` are never cleared once known.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        known = self._db.execute("SELECT 1 FROM links WHERE item_key = ?", (entry.key,)).fetchone()
+        idea_id, source = (None, None) if known else _idea_of(entry.draft)
+        with self._db:
+            if entry.post_id:
+                # A post belongs to one item; a re-planned draft moves it.
+                self._db.execute(
+                    "UPDATE links SET post_id = NULL WHERE post_id = ? AND item_key != ?", (entry.post_id, entry.key)
+                )
+            self._db.execute(
+                f"INSERT INTO links ({_COLUMNS}, scheduled_minute) VALUES ({', '.join('?' * 13)}) "
+                "ON CONFLICT (item_key) DO UPDATE SET "
+                "job_id = COALESCE(excluded.job_id, job_id), "
+                "post_id = COALESCE(excluded.post_id, post_id), "
+                "state = excluded.state, updated_at = excluded.updated_at",
+                (
+                    entry.key, plan_hash, idea_id, source, Path(entry.draft).stem, platform,
+                    entry.account_id, entry.scheduled_at, entry.job_id, entry.post_id,
+                    entry.state, now, _minute(entry.scheduled_at),
+                ),
+            )
+
+    def attach_posts(self, posts: Iterable[dict[str, Any]]) -> int:
+        """Fill in post ids for linked items Publer now shows as queued.
+
+        Matches raw Publer posts to unlinked items by account and scheduled
+        minute. Failed items never created a post, so an unrelated post at
+        their minute is not theirs. Returns the number of items linked.
+        """
+        unmatched = self._db.execute(
+            "SELECT account_id, scheduled_minute, item_key FROM links WHERE post_id IS NULL AND state != ?",
+            (FAILED,),
+        ).fetchall()
+        if not unmatched:
+            return 0
+        waiting = {(account, minute): key for account, minute, key in unmatched}
+        linked = self.post_ids()
+        updates = []
+        for post in posts:
+            post_id = str(post.get("id") or "")
+            key = waiting.pop((post_account_id(post), _minute(post.get("scheduled_at") or post.get("send_at"))), None)
+            if key and post_id and post_id not in linked:
+                updates.append((post_id, key))
+        with self._db:
+            self._db.executemany("UPDATE links SET post_id = ? WHERE item_key = ?", updates)
+        return len(updates)
+
+    def _select(self, where: str, params: tuple[Any, ...]) -> list[Link]:
+        rows = self._db.execute(f"SELECT {_COLUMNS} FROM links WHERE {where} ORDER BY updated_at", params)
+        return [Link(*row) for row in rows]
+
+    def for_post(self, post_id: str) -> Optional[Link]:
+        found = self._select("post_id = ?", (str(post_id),))
+        return found[0] if found else None
+
+    def for_job(self, job_id: str) -> Optional[Link]:
+        found = self._select("job_id = ?", (job_id,))
+        return found[-1] if found else None
+
+    def for_draft(self, draft_id: str) -> list[Link]:
+        return self._select("draft_id = ?", (draft_id,))
+
+    def for_idea(self, idea_id: str) -> list[Link]:
+        return self._select("idea_id = ?", (idea_id,))
+
+    def post_ids(self) -> set[str]:
+        return {row[0] for row in self._db.execute("SELECT post_id FROM links WHERE post_id IS NOT NULL")}
+
+    def sources_by_post(self) -> dict[str, str]:
+        """Post id -> idea source kind, for every linked post with a known idea."""
+        rows = self._db.execute(
+            "SELECT post_id, idea_source FROM links WHERE post_id IS NOT NULL AND idea_source IS NOT NULL"
+        )
+        return dict(rows.fetchall())
+
+    def draft_posts(self) -> dict[str, str]:
+        """Draft id -> its latest post id (or job id while unconfirmed)."""
+        rows = self._db.execute(
+            "SELECT draft_id, COALESCE(post_id, job_id) FROM links "
+            "WHERE COALESCE(post_id, job_id) IS NOT NULL ORDER BY updated_at"
+        )
+        return dict(rows.fetchall())
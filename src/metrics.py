@@ -0,0 +1,260 @@
+"""Prometheus metrics derived from pipeline events.
+
+Metrics are updated by a listener on ``src.state`` events (ideas ingested,
+drafts created/approved, posts scheduled/failed, jobs resolved, Publer API
+requests and cache lookups), so nothing outside this module records them
+directly. Values are persisted to ``state/metrics.json`` to stay cumulative
+across CLI runs (each save adds the run's own increments to whatever is on
+disk, so concurrent runs do not overwrite each other), and exposed either as a node_exporter textfile written
+after each command or over HTTP while ``social.py serve`` is running.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+
+from src.state import STATE_DIR, Event, add_listener
+from src.statefile import update_json, write_atomic
+
+METRICS_FILE = STATE_DIR / "metrics.json"
+PREFIX = "social_engine_"
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+JOB_BUCKETS = (1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], le: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if le:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = PREFIX + name
+        self.help = help
+        self.label_names = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        # Values as last loaded or saved; the rest is this process's to add.
+        self._base: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = tuple(str(labels.get(name) or "") for name in self.label_names)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.label_names, key)} {value:g}"
+
+    def dump(self) -> list[Any]:
+        return [[list(key), value] for key, value in self._values.items()]
+
+    def restore(self, data: list[Any]) -> None:
+        self._values = {tuple(key): value for key, value in data}
+        self._base = dict(self._values)
+
+    def merge(self, data: list[Any]) -> list[Any]:
+        """Add unsaved increments to saved ``data`` and continue from the result."""
+        totals = {tuple(key): value for key, value in data}
+        for key, value in self._values.items():
+            totals[key] = totals.get(key, 0.0) + value - self._base.get(key, 0.0)
+        self.restore([[list(key), value] for key, value in totals.items()])
+        return self.dump()
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ) -> None:
+        self.name = PREFIX + name
+        self.help = help
+        self.label_names = labels
+        self.buckets = buckets
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._base: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = tuple(str(labels.get(name) or "") for name in self.label_names)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += value
+
+    def samples(self) -> Iterator[str]:
+        for key, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                yield f"{self.name}_bucket{_labels(self.label_names, key, f'{bound:g}')} {count:g}"
+            yield f"{self.name}_bucket{_labels(self.label_names, key, '+Inf')} {series[-2]:g}"
+            yield f"{self.name}_sum{_labels(self.label_names, key)} {series[-1]:g}"
+            yield f"{self.name}_count{_labels(self.label_names, key)} {series[-2]:g}"
+
+    def dump(self) -> list[Any]:
+        return [[list(key), series] for key, series in self._series.items()]
+
+    def restore(self, data: list[Any]) -> None:
+        width = len(self.buckets) + 2
+        self._series = {tuple(key): list(series) for key, series in data if len(series) == width}
+        self._base = {key: list(series) for key, series in self._series.items()}
+
+    def merge(self, data: list[Any]) -> list[Any]:
+        """Add unsaved observations to saved ``data`` and continue from the result."""
+        width = len(self.buckets) + 2
+        totals = {tuple(key): list(series) for key, series in data if len(series) == width}
+        for key, series in self._series.items():
+            base = self._base.get(key, [0.0] * width)
+            saved = totals.get(key, [0.0] * width)
+            totals[key] = [s + value - b for s, value, b in zip(saved, series, base)]
+        self.restore([[list(key), series] for key, series in totals.items()])
+        return self.dump()
+
+
+IDEAS_INGESTED = Counter("ideas_ingested_total", "Ideas written to ideas/", ("source",))
+DRAFTS_GENERATED = Counter("drafts_generated_total", "Drafts generated from ideas", ("platform",))
+DRAFTS_APPROVED = Counter("drafts_approved_total", "Drafts approved for scheduling", ("platform",))
+POSTS_SCHEDULED = Counter("posts_scheduled_total", "Posts confirmed scheduled in Publer", ("platform", "account"))
+POSTS_FAILED = Counter("posts_failed_total", "Posts that failed to schedule", ("platform", "account"))
+API_REQUESTS = Counter("publer_requests_total", "Publer API requests", ("method", "endpoint", "status"))
+API_RATE_LIMITED = Counter("publer_rate_limited_total", "Publer API 429 responses", ("endpoint",))
+API_LATENCY = Histogram("publer_request_seconds", "Publer API request latency", ("method", "endpoint"))
+API_CACHE = Counter("publer_cache_lookups_total", "Publer GET cache lookups", ("endpoint", "result"))
+JOB_RESOLUTION = Histogram(
+    "job_resolution_seconds", "Time from job submission to resolution", ("state",), JOB_BUCKETS
+)
+
+METRICS: list[Any] = [
+    IDEAS_INGESTED,
+    DRAFTS_GENERATED,
+    DRAFTS_APPROVED,
+    POSTS_SCHEDULED,
+    POSTS_FAILED,
+    API_REQUESTS,
+    API_RATE_LIMITED,
+    API_LATENCY,
+    API_CACHE,
+    JOB_RESOLUTION,
+]
+
+_lock = threading.Lock()
+_installed = False
+
+
+def record(event: Event) -> None:
+    """Update metrics for one event (the ``src.state`` listener)."""
+    data = event.data
+    kind = event.event_type
+    with _lock:
+        if kind == "idea_ingested":
+            IDEAS_INGESTED.inc(source=str(data.get("source", "")).split(":", 1)[0])
+        elif kind == "draft_created":
+            DRAFTS_GENERATED.inc(platform=data.get("platform"))
+        elif kind == "draft_approved":
+            DRAFTS_APPROVED.inc(platform=data.get("platform"))
+        elif kind == "post_scheduled":
+            POSTS_SCHEDULED.inc(platform=data.get("platform"), account=data.get("account_id"))
+        elif kind == "schedule_failed":
+            POSTS_FAILED.inc(platform=data.get("platform"), account=data.get("account_id"))
+        elif kind == "job_resolved" and data.get("duration") is not None:
+            JOB_RESOLUTION.observe(data["duration"], state=data.get("state"))
+        elif kind == "api_request":
+            method, endpoint, status = data.get("method"), data.get("endpoint"), data.get("status")
+            API_REQUESTS.inc(method=method, endpoint=endpoint, status=status)
+            API_LATENCY.observe(data.get("seconds", 0.0), method=method, endpoint=endpoint)
+            if status == 429:
+                API_RATE_LIMITED.inc(endpoint=endpoint)
+        elif kind == "api_cache":
+            API_CACHE.inc(endpoint=data.get("endpoint"), result=data.get("result"))
+
+
+def install() -> None:
+    """Start recording metrics in this process, continuing from saved values."""
+    global _installed
+    if _installed:
+        return
+    if METRICS_FILE.exists():
+        try:
+            saved = json.loads(METRICS_FILE.read_text())
+        except (json.JSONDecodeError, OSError):
+            saved = {}
+        for metric in METRICS:
+            if metric.name in saved:
+                metric.restore(saved[metric.name])
+    add_listener(record)
+    _installed = True
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        for metric in METRICS:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+def save() -> None:
+    """Add this process's unsaved counts to the saved values, under the file lock.
+
+    Other runs may have saved since ``install``; their counts are kept and
+    become this process's starting point, so exported counters never go
+    backwards.
+    """
+    def merge(saved: Any) -> dict[str, Any]:
+        saved = saved if isinstance(saved, dict) else {}
+        with _lock:
+            return {metric.name: metric.merge(saved.get(metric.name, [])) for metric in METRICS}
+
+    update_json(METRICS_FILE, {}, merge, indent=None)
+
+
+def write_textfile(path: Path) -> None:
+    """Write metrics for node_exporter's textfile collector (atomically)."""
+    write_atomic(path, render())
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_http(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Expose ``/metrics`` on a background thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
@@ -2,17 +2,42 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-import os
-import time
 from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
 
 from zoneinfo import ZoneInfo
 
 from dotenv import load_dotenv
-import requests
+
+from src import workspaces
+from src.publer.accounts import AccountRegistry
+from src.publer.client import PublerClient
+from src.slot_learning import learned_templates
+from src.slots import BlockedSlots, SlotTemplate, fill_slots
+from src.journal import (
+    CONFIRMED,
+    FAILED,
+    PENDING,
+    SUBMITTED,
+    JournalEntry,
+    PlanJournal,
+    items_hash,
+)
+from src.publer.jobs import COMPLETE as JOB_COMPLETE
+from src.publer.jobs import FAILED as JOB_FAILED
+from src.publer.jobs import PENDING as JOB_PENDING
+from src.publer.jobs import JobTracker, TrackedJob, classify_status
+from src.publer.scheduler import PublerScheduler, ScheduleRequest
+from src.linkage import LinkStore
+from src.records import Draft, PlanItem, plan_items, plan_to_dict
+from src.snapshot import SnapshotStore
+from src.state import log_event
+from src.statefile import write_chunks_atomic, write_json
+from src.tracing import span
 
 PROJECT_ROOT = Path(__file__).parent.parent
 QUEUE_DIR = PROJECT_ROOT / "queue"
@@ -22,43 +47,31 @@ STATE_DIR = PROJECT_ROOT / "state"
 env_path = PROJECT_ROOT / "config" / ".env"
 load_dotenv(env_path)
 
-BASE_URL = "https://app.publer.com/api/v1"
-WORKSPACE_ID = "69717f7a2820f00c7aec83f3"
+# Items applied per step when streaming a JSONL plan (see apply_plan_file).
+PLAN_CHUNK_SIZE = 500
 
-_accounts_cache: Optional[list[dict]] = None
+# path -> (mtime_ns, size, metadata) for drafts parsed by this process
+_draft_cache: dict[str, tuple[int, int, dict[str, Any]]] = {}
 
 
-def _get_headers() -> dict[str, str]:
-    """Get API headers."""
-    api_key = os.getenv("PUBLER_API_KEY", "")
-    return {
-        "Authorization": f"Bearer-API {api_key}",
-        "Publer-Workspace-Id": WORKSPACE_ID,
-        "Content-Type": "application/json",
-    }
+def _get_client() -> PublerClient:
+    """Get the shared Publer client for the current workspace."""
+    return workspaces.current().client()
+
+
+def _get_registry() -> AccountRegistry:
+    """Get the shared account registry for the current workspace."""
+    return workspaces.current().registry()
 
 
 def _get_accounts() -> list[dict[str, Any]]:
     """Fetch all connected accounts (cached)."""
-    global _accounts_cache
-    if _accounts_cache is None:
-        response = requests.get(f"{BASE_URL}/accounts", headers=_get_headers())
-        response.raise_for_status()
-        _accounts_cache = response.json()
-    return _accounts_cache
+    return _get_registry().accounts()
 
 
 def _get_account_id(platform: str) -> str:
     """Get account ID for platform by fetching from API."""
-    accounts = _get_accounts()
-    platform_map = {"x": "twitter", "twitter": "twitter", "linkedin": "linkedin"}
-    target = platform_map.get(platform.lower(), platform.lower())
-    
-    for account in accounts:
-        if account.get("provider", "").lower() == target:
-            return account.get("id")
-    
-    raise ValueError(f"No account found for {platform}")
+    return _get_registry().account_id(platform)
 
 
 def _get_network(platform: str) -> str:
@@ -70,25 +83,41 @@ def _get_network(platform: str) -> str:
 
 
 def _parse_draft_metadata(draft_path: Path) -> dict[str, Any]:
-    """Extract metadata from draft file (YAML frontmatter)."""
-    content = draft_path.read_text()
-    metadata: dict[str, Any] = {"path": str(draft_path), "content": content}
-    
-    if content.startswith("---"):
-        parts = content.split("---", 2)
-        if len(parts) >= 3:
-            frontmatter = parts[1].strip()
-            for line in frontmatter.split("\n"):
-                if ":" in line:
-                    key, value = line.split(":", 1)
-                    metadata[key.strip()] = value.strip().strip('"').strip("'")
-            metadata["body"] = parts[2].strip()
+    """Extract metadata from draft file (YAML frontmatter).
+
+    Results are cached per path and reused while the file's mtime and size
+    are unchanged.
+    """
+    stat = draft_path.stat()
+    cached = _draft_cache.get(str(draft_path))
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return dict(cached[2])
+
+    with span("parse_draft", "parse", path=str(draft_path)):
+        content = draft_path.read_text()
+        metadata: dict[str, Any] = {"path": str(draft_path), "content": content}
+        
+        if content.startswith("---"):
+            parts = content.split("---", 2)
+            if len(parts) >= 3:
+                frontmatter = parts[1].strip()
+                for line in frontmatter.split("\n"):
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        metadata[key.strip()] = value.strip().strip('"').strip("'")
+                metadata["body"] = parts[2].strip()
+            else:
+                metadata["body"] = content
         else:
             metadata["body"] = content
-    else:
-        metadata["body"] = content
     
-    return metadata
+    _draft_cache[str(draft_path)] = (stat.st_mtime_ns, stat.st_size, metadata)
+    return dict(metadata)
+
+
+def _content_hash(content: str) -> str:
+    """Short hash of a draft file's text, to tell whether it changed since planning."""
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
 
 
 def _extract_post_text(metadata: dict[str, Any]) -> str:
@@ -109,14 +138,17 @@ def _extract_post_text(metadata: dict[str, Any]) -> str:
     return "\n".join(text_lines).strip()
 
 
-def get_approved_drafts(platform: Optional[str] = None) -> list[dict[str, Any]]:
+def get_approved_drafts(platform: Optional[str] = None) -> list[Draft]:
     """Get list of approved drafts, optionally filtered by platform."""
     approved = []
     
     if not DRAFTS_DIR.exists():
         return approved
     
-    for draft_file in DRAFTS_DIR.glob("*.md"):
+    with span("scan drafts/", "scan"):
+        draft_files = list(DRAFTS_DIR.glob("*.md"))
+    
+    for draft_file in draft_files:
         metadata = _parse_draft_metadata(draft_file)
         status = metadata.get("status", "").lower()
         
@@ -132,7 +164,16 @@ def get_approved_drafts(platform: Optional[str] = None) -> list[dict[str, Any]]:
             elif draft_platform != platform_filter:
                 continue
         
-        approved.append(metadata)
+        approved.append(Draft(
+            path=metadata["path"],
+            idea_id=metadata.get("idea_id", ""),
+            platform=metadata.get("platform", ""),
+            status=status,
+            created_at=metadata.get("created_at", ""),
+            content=metadata["body"],
+            workspace=metadata.get("workspace") or None,
+            content_hash=_content_hash(metadata["content"]),
+        ))
     
     return approved
 
@@ -158,12 +199,12 @@ def create_plan(
         scheduled_dt = base_dt + timedelta(days=i * interval_days)
         scheduled_at = scheduled_dt.isoformat()
         
-        items.append({
-            "draft": draft_path,
-            "platform": network,
-            "scheduled_at": scheduled_at,
-            "account_id": account_id,
-        })
+        items.append(PlanItem(
+            draft=draft_path,
+            platform=network,
+            scheduled_at=scheduled_at,
+            account_id=account_id,
+        ))
     
     return {
         "created_at": datetime.now(tz=ZoneInfo("UTC")).isoformat(),
@@ -179,19 +220,70 @@ def create_plan_from_approved(
     start_time: str = "09:00",
     interval_days: int = 1,
     timezone: str = "America/Chicago",
+    templates: Optional[dict[str, SlotTemplate]] = None,
+    blocked_posts: Optional[list[dict[str, Any]]] = None,
+    learn_slots: bool = False,
+    targets: Optional[list[workspaces.Workspace]] = None,
+    stream: bool = False,
 ) -> dict[str, Any]:
-    """Create plan from approved drafts."""
-    approved = get_approved_drafts(platform)
+    """Create plan from approved drafts.
+    
+    By default posts are spaced ``interval_days`` apart from ``start_date``
+    at ``start_time``. When ``templates`` are given, each account instead
+    gets the earliest free slots of its platform's template, oldest drafts
+    first, skipping slots taken by ``blocked_posts`` (the Publer snapshot
+    when omitted). With ``learn_slots``, accounts with insights history use
+    their best-performing slots instead (see ``src.slot_learning``).
+    
+    ``targets`` are the workspaces to plan for (the current one by default).
+    A draft whose frontmatter names a ``workspace`` goes to that workspace
+    and is skipped if it is not a target; other drafts go to the first
+    target. Each item records its ``workspace``, its rendered post ``text``
+    and the draft's ``draft_hash``, so applying it needs no parsing.
+    
+    With ``stream``, ``items`` is a generator that plans items as it is
+    consumed, for ``save_plan`` to write straight to a JSONL plan.
+    Slot-filled plans are still assigned in one pass before the first item
+    comes out, since every account's slots are interleaved by time.
+    """
+    items = _plan_approved(
+        platform, count, start_date, start_time, interval_days, timezone,
+        templates, blocked_posts, learn_slots, targets or [workspaces.current()],
+    )
+    return {
+        "created_at": datetime.now(tz=ZoneInfo("UTC")).isoformat(),
+        "timezone": timezone,
+        "items": items if stream else list(items),
+    }
+
+
+def _plan_approved(
+    platform: Optional[str],
+    count: Optional[int],
+    start_date: Optional[str],
+    start_time: str,
+    interval_days: int,
+    timezone: str,
+    templates: Optional[dict[str, SlotTemplate]],
+    blocked_posts: Optional[list[dict[str, Any]]],
+    learn_slots: bool,
+    targets: list[workspaces.Workspace],
+) -> Iterator[PlanItem]:
+    """Plan items for ``create_plan_from_approved``, in order."""
+    by_name = {w.name: w for w in targets}
+    approved = [
+        d for d in get_approved_drafts(platform)
+        if not d.workspace or d.workspace in by_name
+    ]
+    
+    if templates is not None:
+        approved.sort(key=lambda d: (d.created_at, d.path))
     
     if count:
         approved = approved[:count]
     
     if not approved:
-        return {
-            "created_at": datetime.now(tz=ZoneInfo("UTC")).isoformat(),
-            "timezone": timezone,
-            "items": [],
-        }
+        return
     
     if not start_date:
         tz = ZoneInfo(timezone)
@@ -201,88 +293,484 @@ def create_plan_from_approved(
     base_dt = datetime.strptime(f"{start_date} {start_time}", "%Y-%m-%d %H:%M")
     base_dt = base_dt.replace(tzinfo=tz)
     
-    items = []
-    for i, draft_meta in enumerate(approved):
-        draft_path = draft_meta["path"]
-        draft_platform = draft_meta.get("platform", platform or "twitter")
-        
-        account_id = _get_account_id(draft_platform)
-        network = _get_network(draft_platform)
-        
-        scheduled_dt = base_dt + timedelta(days=i * interval_days)
-        scheduled_at = scheduled_dt.isoformat()
-        
-        items.append({
-            "draft": draft_path,
-            "platform": network,
-            "scheduled_at": scheduled_at,
-            "account_id": account_id,
-        })
+    # Fetch every workspace's accounts at once rather than one after another.
+    workspaces.fan_out(targets, lambda w: w.registry().accounts())
     
-    return {
-        "created_at": datetime.now(tz=ZoneInfo("UTC")).isoformat(),
-        "timezone": timezone,
-        "items": items,
-    }
+    def planned() -> Iterator[PlanItem]:
+        for i, draft in enumerate(approved):
+            draft_platform = draft.platform or platform or "twitter"
+            workspace = by_name.get(draft.workspace or "", targets[0])
+            
+            account_id = workspace.registry().account_id(draft_platform)
+            network = _get_network(draft_platform)
+            
+            scheduled_dt = base_dt + timedelta(days=i * interval_days)
+            scheduled_at = scheduled_dt.isoformat()
+            
+            yield PlanItem(
+                draft=draft.path,
+                platform=network,
+                scheduled_at=scheduled_at,
+                account_id=account_id,
+                workspace=workspace.name,
+                text=_extract_post_text({"body": draft.content}),
+                draft_hash=draft.content_hash,
+            )
+    
+    if templates is None:
+        yield from planned()
+        return
+    
+    items = list(planned())
+    if learn_slots:
+        accounts = {item.account_id: item.platform for item in items}
+        templates = {**templates, **learned_templates(accounts, templates, timezone)}
+    start = max(
+        datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=tz),
+        datetime.now(tz),
+    )
+    if blocked_posts is None:
+        # Earlier posts on the start day still count towards daily caps.
+        with SnapshotStore() as snapshot:
+            blocked_posts = snapshot.posts(
+                account_ids={item.account_id for item in items},
+                start=start - timedelta(days=1),
+            )
+    yield from fill_slots(items, templates, start, BlockedSlots.from_posts(blocked_posts, tz))
+
+
+def is_streamed(path: Path) -> bool:
+    """Whether ``path`` is a JSONL plan (a header line, then one item per line)."""
+    return path.suffix == ".jsonl"
 
 
 def save_plan(plan: dict[str, Any], path: Optional[Path] = None) -> Path:
-    """Save plan to JSON file."""
+    """Save plan to JSON file (items as plain objects, see ``PlanItem.to_dict``).
+    
+    A ``.jsonl`` path gets the streaming format instead: the plan's other
+    fields on the first line, then one item per line, written as the items
+    are produced (``items`` may be a generator).
+    """
     if path is None:
         QUEUE_DIR.mkdir(parents=True, exist_ok=True)
         path = QUEUE_DIR / "plan.json"
     
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(plan, indent=2))
+    if is_streamed(path):
+        header = {key: value for key, value in plan.items() if key != "items"}
+        
+        def lines() -> Iterator[str]:
+            yield json.dumps(header) + "\n"
+            for item in plan.get("items", []):
+                if not isinstance(item, PlanItem):
+                    item = PlanItem.from_dict(item)
+                yield json.dumps(item.to_dict()) + "\n"
+        
+        write_chunks_atomic(path, lines())
+    else:
+        write_json(path, plan_to_dict(plan))
     return path
 
 
 def load_plan(path: Path) -> dict[str, Any]:
-    """Load plan from JSON file."""
-    return json.loads(path.read_text())
+    """Load plan from JSON file, with its items as ``PlanItem``s.
+    
+    JSONL plans are read in full too; use ``iter_plan`` to stream them.
+    """
+    if is_streamed(path):
+        return {**read_plan_header(path), "items": [item for _, item in iter_plan(path)]}
+    plan = json.loads(path.read_text())
+    return {**plan, "items": plan_items(plan)}
+
+
+def read_plan_header(path: Path) -> dict[str, Any]:
+    """A JSONL plan's fields other than its items."""
+    with open(path, "rb") as f:
+        return json.loads(f.readline() or b"{}")
+
+
+def iter_plan(path: Path, offset: int = 0) -> Iterator[tuple[int, PlanItem]]:
+    """Stream a plan's items as ``(end_offset, item)``.
+    
+    ``end_offset`` is the byte offset just past the item's line; passing it
+    back as ``offset`` resumes with the next item. JSON plans are loaded
+    whole and yield item indexes instead.
+    """
+    if not is_streamed(path):
+        items = load_plan(path)["items"]
+        for index in range(offset, len(items)):
+            yield index + 1, items[index]
+        return
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(max(offset, len(header)))
+        for line in iter(f.readline, b""):
+            if line.strip():
+                yield f.tell(), PlanItem.from_dict(json.loads(line))
+
+
+def plan_size(path: Path) -> int:
+    """Number of items in a saved plan, counted without parsing a JSONL plan's items."""
+    if not is_streamed(path):
+        return len(json.loads(path.read_text()).get("items", []))
+    with open(path, "rb") as f:
+        f.readline()
+        return sum(1 for line in f if line.strip())
 
 
 def _log_event(event_type: str, data: dict[str, Any]) -> None:
-    """Log an event to state/events.json."""
-    STATE_DIR.mkdir(parents=True, exist_ok=True)
-    events_file = STATE_DIR / "events.json"
+    """Append an event to state/events.jsonl (one line, not a rewrite of the log)."""
+    log_event(event_type, data)
+
+
+def _job_post_id(status: dict[str, Any]) -> Optional[str]:
+    """Pull the created post ID out of a job status payload, if Publer sent one."""
+    payload = status.get("payload") or {}
+    posts = payload.get("posts") or payload.get("post_ids") or []
+    if posts:
+        first = posts[0]
+        return str(first.get("id") if isinstance(first, dict) else first)
+    post_id = payload.get("post_id") or payload.get("id")
+    return str(post_id) if post_id else None
+
+
+def _find_queued_post(account_id: str, scheduled_at: str, text: str) -> Optional[dict[str, Any]]:
+    """Find a scheduled post matching an item's account, minute and text."""
+    from src.slots import parse_datetime
     
-    events = []
-    if events_file.exists():
-        try:
-            events = json.loads(events_file.read_text())
-        except json.JSONDecodeError:
-            events = []
-    
-    events.append({
-        "timestamp": datetime.now(tz=ZoneInfo("UTC")).isoformat(),
-        "type": event_type,
-        "data": data,
+    target = int(parse_datetime(scheduled_at).timestamp()) // 60
+    data = _get_client().get("/posts", params={"state": "scheduled", "account_ids[]": account_id})
+    posts = data if isinstance(data, list) else data.get("posts", [])
+    for post in posts:
+        when = post.get("scheduled_at") or post.get("send_at")
+        if not when or int(parse_datetime(when).timestamp()) // 60 != target:
+            continue
+        post_text = post.get("text", post.get("content", "")) or ""
+        if post_text.strip()[:100] == text.strip()[:100]:
+            return post
+    return None
+
+
+def _record_linked(
+    journal: PlanJournal, links: LinkStore, item: PlanItem, state: str, **fields: Any
+) -> JournalEntry:
+    """Record a new state for ``item`` in its journal and the link store."""
+    entry = journal.record(item, state, **fields)
+    links.record(entry, journal.plan_hash, item.platform)
+    return entry
+
+
+def _reconcile_submitted(
+    journal: PlanJournal, links: LinkStore, item: PlanItem, entry: JournalEntry, text: str
+) -> bool:
+    """Resolve an item left ``submitted`` by an interrupted run.
+    
+    Returns True when Publer already has the post (now recorded as
+    confirmed) and False when it is safe to send again.
+    """
+    if entry.job_id:
+        status = _get_client().get(f"/job_status/{entry.job_id}")
+        outcome = classify_status(status)
+        if outcome == JOB_FAILED:
+            journal.record(item, FAILED, error=str(status.get("payload", {}).get("failures")))
+            return False
+        if outcome == JOB_COMPLETE:
+            _record_linked(journal, links, item, CONFIRMED, post_id=_job_post_id(status))
+            return True
+    
+    post = _find_queued_post(item.account_id, item.scheduled_at, text)
+    if post:
+        _record_linked(journal, links, item, CONFIRMED, post_id=str(post.get("id")))
+        return True
+    if entry.job_id:
+        # Job still running and no post yet: leave it submitted, don't resend.
+        return True
+    journal.record(item, PENDING)
+    return False
+
+
+def settle_jobs(
+    jobs: list[TrackedJob],
+    results: Optional[dict[str, Any]] = None,
+    links: Optional[LinkStore] = None,
+) -> dict[str, Any]:
+    """Record the outcome of tracked schedule jobs.
+    
+    Resolved jobs update their plan journal, the link store and the event
+    log and land in ``successes`` or ``failures``; unresolved ones are
+    listed under ``pending``. Confirmed posts are added to the local queue
+    mirror (``src.snapshot``) so it is current without a refetch.
+    
+    Jobs submitted outside a plan (``scripts/publish.py``,
+    ``scripts/04_schedule_posts.py``) have no plan item; they are reported
+    under their job id and the posts they carry, without journal or links.
+    """
+    if links is None:
+        with LinkStore() as links:
+            return settle_jobs(jobs, results, links)
+    
+    if results is None:
+        results = {"successes": [], "failures": [], "pending": []}
+    results.setdefault("pending", [])
+    
+    journals: dict[str, PlanJournal] = {}
+    queued: list[dict[str, Any]] = []
+    for job in jobs:
+        if not job.context.get("item"):
+            _settle_unplanned_job(job, results)
+            continue
+        # Job contexts are saved as JSON, so the item comes back as a dict.
+        item = PlanItem.from_dict(job.context["item"])
+        digest = job.context["plan_hash"]
+        if digest not in journals:
+            journals[digest] = PlanJournal.for_hash(digest)
+        journal = journals[digest]
+        draft = item.draft
+        
+        if job.state == JOB_PENDING:
+            results["pending"].append({"draft": draft, "job_id": job.job_id})
+            continue
+        
+        _log_event("job_resolved", {
+            "job_id": job.job_id,
+            "state": job.state,
+            "duration": job.duration,
+            "polls": job.polls,
+        })
+        
+        if job.state == JOB_FAILED:
+            error = str(job.failures or job.response)
+            journal.record(item, FAILED, error=error)
+            results["failures"].append({"draft": draft, "error": error})
+            _log_event("schedule_failed", {
+                "draft": draft,
+                "platform": item.platform,
+                "account_id": item.account_id,
+                "error": error,
+            })
+            continue
+        
+        post_id = _job_post_id(job.response or {})
+        _record_linked(journal, links, item, CONFIRMED, post_id=post_id)
+        if post_id:
+            queued.append({
+                "id": post_id,
+                "account_id": item.account_id,
+                "network": item.platform,
+                "state": "scheduled",
+                "scheduled_at": item.scheduled_at,
+                "text": job.context.get("text"),
+            })
+        results["successes"].append({
+            "draft": draft,
+            "platform": item.platform,
+            "scheduled_at": item.scheduled_at,
+            "job_id": job.job_id,
+            "job_seconds": job.duration,
+        })
+        _log_event("post_scheduled", {
+            "draft": draft,
+            "platform": item.platform,
+            "account_id": item.account_id,
+            "scheduled_at": item.scheduled_at,
+            "job_id": job.job_id,
+            "job_seconds": job.duration,
+        })
+    
+    if queued:
+        with SnapshotStore() as snapshot:
+            snapshot.upsert(queued, workspace=workspaces.current().name)
+    
+    return results
+
+
+def _settle_unplanned_job(job: TrackedJob, results: dict[str, Any]) -> None:
+    """Report a tracked job that has no plan item to record it against."""
+    posts = job.context.get("posts") or []
+    label = f"job {job.job_id}" + "".join(
+        f" · {post.get('network')} {post.get('scheduled_at') or 'now'}" for post in posts
+    )
+    if job.state == JOB_PENDING:
+        results["pending"].append({"draft": label, "job_id": job.job_id})
+        return
+    _log_event("job_resolved", {
+        "job_id": job.job_id,
+        "state": job.state,
+        "duration": job.duration,
+        "polls": job.polls,
     })
+    if job.state == JOB_FAILED:
+        results["failures"].append({"draft": label, "error": str(job.failures or job.response)})
+        return
+    results["successes"].append({"draft": label, "job_id": job.job_id, "job_seconds": job.duration})
+
+
+def _item_workspace(item: PlanItem, default: str) -> str:
+    """Workspace a plan item belongs to; items from older plans have none."""
+    return item.workspace or default
+
+
+def _workspace_groups(items: list[PlanItem]) -> dict[str, list[PlanItem]]:
+    """Plan items by workspace, in plan order."""
+    default = workspaces.load_workspaces()[0].name
+    groups: dict[str, list[PlanItem]] = {}
+    for item in items:
+        groups.setdefault(_item_workspace(item, default), []).append(item)
+    return groups
+
+
+def _per_workspace(groups: dict[str, list[PlanItem]]) -> bool:
+    """Whether ``apply_plan`` applies (and journals) each workspace's items as its own plan."""
+    return set(groups) != {workspaces.current().name}
+
+
+def plan_journals(plan: dict[str, Any]) -> list[PlanJournal]:
+    """The journals ``apply_plan`` records its progress in.
+    
+    Each workspace's items are journaled under their own sub-plan when the
+    plan is not just for the current workspace. A streamed plan
+    (``apply_plan_file``) keeps one journal for all its items instead, see
+    ``PlanJournal.for_hash``.
+    """
+    groups = _workspace_groups(plan_items(plan))
+    if not _per_workspace(groups):
+        return [PlanJournal.for_plan(plan)]
+    return [PlanJournal.for_plan({**plan, "items": group}) for group in groups.values()]
+
+
+def plan_post_ids(plan: dict[str, Any]) -> set[str]:
+    """IDs of the Publer posts earlier applies of ``plan`` created."""
+    return {
+        entry.post_id
+        for journal in plan_journals(plan)
+        for entry in map(journal.get, map(journal.key, plan_items(plan)))
+        if entry and entry.post_id
+    }
+
+
+def resume_pending_jobs(
+    timeout: float = 60.0, targets: Optional[list[workspaces.Workspace]] = None
+) -> dict[str, Any]:
+    """Poll and settle schedule jobs saved as pending by earlier runs.
+    
+    Each workspace's jobs are polled concurrently with its own client.
+    """
+    configured = workspaces.load_workspaces()
+    default = configured[0].name
     
-    events_file.write_text(json.dumps(events, indent=2))
+    def resume(workspace: workspaces.Workspace) -> dict[str, Any]:
+        tracker = JobTracker(workspace.client())
+        if not tracker.load_pending(
+            lambda job: ((job.context.get("item") or {}).get("workspace") or default) == workspace.name
+        ):
+            return {"successes": [], "failures": [], "pending": []}
+        tracker.wait(timeout=timeout)
+        return settle_jobs(tracker.jobs)
+    
+    results, errors = workspaces.fan_out(targets or configured, resume)
+    merged = workspaces.merge_results(results.values())
+    for key in ("successes", "failures", "pending"):
+        merged.setdefault(key, [])
+    for name, error in errors.items():
+        merged["failures"].append({"draft": f"[{name}]", "error": str(error)})
+    return merged
 
 
-def apply_plan(plan: dict[str, Any], dry_run: bool = False) -> dict[str, Any]:
-    """Apply a schedule plan, posting each item via Publer API."""
+def _apply_per_workspace(
+    plan: dict[str, Any], groups: dict[str, list[PlanItem]], dry_run: bool, job_timeout: float, rerender: bool
+) -> dict[str, Any]:
+    """Apply each workspace's items as its own plan, concurrently."""
+    try:
+        targets = workspaces.select(groups)
+    except ValueError as e:
+        return {"successes": [], "failures": [{"draft": "", "error": str(e)}],
+                "skipped": [], "pending": [], "dry_run": dry_run}
+    
+    def apply(workspace: workspaces.Workspace) -> dict[str, Any]:
+        return apply_plan({**plan, "items": groups[workspace.name]}, dry_run, job_timeout, rerender)
+    
+    # Dry runs print previews, so keep them in order.
+    results, errors = workspaces.fan_out(targets, apply, max_workers=1 if dry_run else None)
+    merged = workspaces.merge_results(results[w.name] for w in targets if w.name in results)
+    for key in ("successes", "failures", "skipped", "pending"):
+        merged.setdefault(key, [])
+    merged["dry_run"] = dry_run
+    for name, error in errors.items():
+        merged["failures"].extend({"draft": item.draft, "error": f"[{name}] {error}"} for item in groups[name])
+    return merged
+
+
+def apply_plan(
+    plan: dict[str, Any], dry_run: bool = False, job_timeout: float = 60.0, rerender: bool = False
+) -> dict[str, Any]:
+    """Apply a schedule plan, posting each item via Publer API.
+    
+    Progress is written to a per-plan journal (see ``src.journal``), so
+    re-running the same plan skips items already confirmed and reconciles
+    interrupted ones against Publer instead of posting them twice.
+    
+    All items are submitted first, concurrently, through
+    ``PublerScheduler.schedule_many``; their jobs are then polled together
+    for up to ``job_timeout`` seconds. Jobs still running after that are saved
+    for ``social.py jobs`` and reported under ``pending``.
+    
+    Items carrying the text rendered at planning time send it as long as
+    their draft still has the ``draft_hash`` recorded then. A draft edited
+    since fails its item, unless ``rerender`` sends its current text instead.
+    """
     results: dict[str, Any] = {
         "successes": [],
         "failures": [],
+        "skipped": [],
+        "pending": [],
         "dry_run": dry_run,
     }
     
-    if not plan.get("items"):
+    items = plan_items(plan)
+    if not items:
         return results
     
-    api_key = os.getenv("PUBLER_API_KEY")
+    groups = _workspace_groups(items)
+    if _per_workspace(groups):
+        return _apply_per_workspace(plan, groups, dry_run, job_timeout, rerender)
+    
+    _apply_items(items, PlanJournal.for_plan(plan), results, dry_run, job_timeout, rerender)
+    return results
+
+
+def _apply_items(
+    items: list[PlanItem],
+    journal: PlanJournal,
+    results: dict[str, Any],
+    dry_run: bool,
+    job_timeout: float,
+    rerender: bool,
+) -> None:
+    """Apply ``items`` of the current workspace under ``journal``, adding outcomes to ``results``."""
+    workspace = workspaces.current()
+    api_key = workspace.client_config().api_key
     if not api_key and not dry_run:
-        raise ValueError("PUBLER_API_KEY not set in environment")
+        raise ValueError(f"{workspace.api_key_env} not set in environment")
     
-    for item in plan["items"]:
-        draft_path = Path(item["draft"])
-        platform = item["platform"]
-        scheduled_at = item["scheduled_at"]
-        account_id = item["account_id"]
+    tracker = JobTracker(_get_client())
+    links = None if dry_run else LinkStore()
+    to_send: list[tuple[PlanItem, str]] = []
+    if not dry_run:
+        journal.record_many((item for item in items if journal.get(journal.key(item)) is None), PENDING)
+    
+    for item in items:
+        draft_path = Path(item.draft)
+        platform = item.platform
+        scheduled_at = item.scheduled_at
+        account_id = item.account_id
+        
+        entry = journal.get(journal.key(item))
+        if entry and entry.state == CONFIRMED:
+            results["skipped"].append({
+                "draft": str(draft_path),
+                "scheduled_at": scheduled_at,
+                "post_id": entry.post_id,
+            })
+            continue
         
         if not draft_path.exists():
             results["failures"].append({
@@ -291,8 +779,19 @@ def apply_plan(plan: dict[str, Any], dry_run: bool = False) -> dict[str, Any]:
             })
             continue
         
-        metadata = _parse_draft_metadata(draft_path)
-        text = _extract_post_text(metadata)
+        if item.draft_hash is None:
+            text = _extract_post_text(_parse_draft_metadata(draft_path))
+        elif item.draft_hash == _content_hash(draft_path.read_text()):
+            # Unchanged since planning: send the text rendered then.
+            text = item.text or ""
+        elif rerender:
+            text = _extract_post_text(_parse_draft_metadata(draft_path))
+        else:
+            results["failures"].append({
+                "draft": str(draft_path),
+                "error": "Draft edited after planning (re-plan, or apply with --rerender to send its current text)",
+            })
+            continue
         
         if not text:
             results["failures"].append({
@@ -313,76 +812,147 @@ def apply_plan(plan: dict[str, Any], dry_run: bool = False) -> dict[str, Any]:
                 "platform": platform,
                 "scheduled_at": scheduled_at,
             })
-        else:
-            try:
-                payload = {
-                    "bulk": {
-                        "state": "scheduled",
-                        "posts": [{
-                            "networks": {
-                                platform: {
-                                    "type": "status",
-                                    "text": text
-                                }
-                            },
-                            "accounts": [{
-                                "id": account_id,
-                                "scheduled_at": scheduled_at
-                            }]
-                        }]
-                    }
-                }
-                
-                response = requests.post(
-                    f"{BASE_URL}/posts/schedule",
-                    headers=_get_headers(),
-                    json=payload
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                job_id = result.get("job_id")
-                if job_id:
-                    time.sleep(2)
-                    status_resp = requests.get(
-                        f"{BASE_URL}/job_status/{job_id}",
-                        headers=_get_headers()
-                    )
-                    status = status_resp.json()
-                    failures = status.get("payload", {}).get("failures", {})
-                    if failures:
-                        results["failures"].append({
-                            "draft": str(draft_path),
-                            "error": str(failures),
-                        })
-                        _log_event("schedule_failed", {
-                            "draft": str(draft_path),
-                            "platform": platform,
-                            "error": str(failures),
-                        })
-                        continue
-                
-                results["successes"].append({
-                    "draft": str(draft_path),
-                    "platform": platform,
-                    "scheduled_at": scheduled_at,
-                    "job_id": job_id,
-                })
-                _log_event("post_scheduled", {
+            continue
+        
+        try:
+            if entry and entry.state == SUBMITTED and _reconcile_submitted(journal, links, item, entry, text):
+                results["skipped"].append({
                     "draft": str(draft_path),
-                    "platform": platform,
                     "scheduled_at": scheduled_at,
-                    "job_id": job_id,
+                    "job_id": entry.job_id,
                 })
-            except Exception as e:
+                continue
+        except Exception as e:
+            results["failures"].append({
+                "draft": str(draft_path),
+                "error": str(e),
+            })
+            _log_event("schedule_failed", {
+                "draft": str(draft_path),
+                "platform": platform,
+                "account_id": account_id,
+                "error": str(e),
+            })
+            continue
+        to_send.append((item, text))
+    
+    if to_send:
+        journal.record_many((item for item, _ in to_send), SUBMITTED, job_id=None)
+        # One post per request keeps one job per plan item, which the
+        # journal and settle_jobs rely on.
+        sent = PublerScheduler(_get_client()).schedule_many(
+            [
+                ScheduleRequest(network=item.platform, account_id=item.account_id, text=text,
+                                scheduled_at=item.scheduled_at)
+                for item, text in to_send
+            ],
+            wait=False,
+            tracker=tracker,
+            contexts=[
+                {"plan_hash": journal.plan_hash, "item": item.to_dict(), "text": text} for item, text in to_send
+            ],
+        )
+        for (item, _), outcome in zip(to_send, sent):
+            if outcome.state == JOB_FAILED:
+                # The item stays submitted: whether Publer received it is
+                # unknown, so the next run reconciles before resending.
                 results["failures"].append({
-                    "draft": str(draft_path),
-                    "error": str(e),
+                    "draft": item.draft,
+                    "error": outcome.error,
                 })
                 _log_event("schedule_failed", {
-                    "draft": str(draft_path),
-                    "platform": platform,
-                    "error": str(e),
+                    "draft": item.draft,
+                    "platform": item.platform,
+                    "account_id": item.account_id,
+                    "error": outcome.error,
+                })
+            elif outcome.job_id:
+                _record_linked(journal, links, item, SUBMITTED, job_id=outcome.job_id)
+            else:
+                _record_linked(journal, links, item, CONFIRMED)
+                results["successes"].append({
+                    "draft": item.draft,
+                    "platform": item.platform,
+                    "scheduled_at": item.scheduled_at,
+                    "job_id": None,
                 })
+                _log_event("post_scheduled", {
+                    "draft": item.draft,
+                    "platform": item.platform,
+                    "account_id": item.account_id,
+                    "scheduled_at": item.scheduled_at,
+                    "job_id": None,
+                })
+    
+    if tracker.jobs:
+        tracker.wait(timeout=job_timeout)
+        settle_jobs(tracker.jobs, results, links)
+    if links:
+        links.close()
+
+
+def apply_plan_file(
+    path: Path,
+    dry_run: bool = False,
+    job_timeout: float = 60.0,
+    offset: int = 0,
+    resume: bool = False,
+    chunk_size: int = PLAN_CHUNK_SIZE,
+    only: Optional[Callable[[PlanItem], bool]] = None,
+    rerender: bool = False,
+) -> dict[str, Any]:
+    """Apply a saved plan, streaming JSONL plans ``chunk_size`` items at a time.
+    
+    JSON plans are loaded and passed to ``apply_plan``. A JSONL plan is
+    hashed in one pass over the file, then read from byte ``offset`` and
+    applied chunk by chunk, each chunk's items per workspace. After each
+    chunk the offset reached is saved with the plan's journal
+    (``PlanJournal.saved_offset``) and reported as ``results["offset"]``,
+    so an interrupted apply can resume there (``resume`` starts from the
+    saved offset). Only items passing ``only`` are applied (and hashed).
+    """
+    if not is_streamed(path):
+        plan = load_plan(path)
+        if only is not None:
+            plan = {**plan, "items": [item for item in plan["items"] if only(item)]}
+        return apply_plan(plan, dry_run, job_timeout, rerender)
     
+    def selected(start: int = 0) -> Iterator[tuple[int, PlanItem]]:
+        return ((end, item) for end, item in iter_plan(path, start) if only is None or only(item))
+    
+    with span("hash plan", "plan", path=str(path)):
+        digest = items_hash(item for _, item in selected())
+    journal = PlanJournal.for_hash(digest)
+    if resume:
+        offset = journal.saved_offset()
+    results: dict[str, Any] = {
+        "successes": [],
+        "failures": [],
+        "skipped": [],
+        "pending": [],
+        "dry_run": dry_run,
+        "offset": offset,
+    }
+    configured = {w.name: w for w in workspaces.load_workspaces()}
+    default = next(iter(configured))
+    
+    stream = selected(offset)
+    while True:
+        chunk = list(islice(stream, chunk_size))
+        if not chunk:
+            break
+        groups: dict[str, list[PlanItem]] = {}
+        for _, item in chunk:
+            groups.setdefault(_item_workspace(item, default), []).append(item)
+        for name, group in groups.items():
+            if name not in configured:
+                results["failures"].extend(
+                    {"draft": item.draft, "error": f"Unknown workspace: {name}"} for item in group
+                )
+                continue
+            with workspaces.use(configured[name]):
+                _apply_items(group, journal, results, dry_run, job_timeout, rerender)
+        results["offset"] = chunk[-1][0]
+        if not dry_run:
+            journal.save_offset(results["offset"])
     return results
@@ -0,0 +1,74 @@
+"""Connected account lookup for Publer."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+from src.publer.client import PublerClient, PublerClientConfig
+
+PLATFORM_PROVIDERS = {"x": "twitter", "twitter": "twitter", "linkedin": "linkedin"}
+
+
+def normalize_platform(platform: str) -> str:
+    """Map a platform alias (``x``, ``twitter``...) to its Publer provider name."""
+    lowered = platform.lower()
+    return PLATFORM_PROVIDERS.get(lowered, lowered)
+
+
+class AccountRegistry:
+    """Cache of the workspace's connected accounts.
+
+    ``/accounts`` is fetched once and reused until ``ttl`` seconds have
+    passed, so a long-running process does not refetch it per command.
+    """
+
+    def __init__(self, client: PublerClient, ttl: float = 300.0) -> None:
+        self._client = client
+        self._ttl = ttl
+        self._accounts: Optional[list[dict[str, Any]]] = None
+        self._fetched_at = 0.0
+
+    def accounts(self) -> list[dict[str, Any]]:
+        """Return all connected accounts, fetching them if the cache is stale."""
+        if self._accounts is None or time.monotonic() - self._fetched_at > self._ttl:
+            data = self._client.list_accounts()
+            self._accounts = data if isinstance(data, list) else data.get("accounts", [])
+            self._fetched_at = time.monotonic()
+        return self._accounts
+
+    def refresh(self) -> None:
+        """Drop the cached accounts so the next lookup refetches them."""
+        self._accounts = None
+
+    def account_id(self, platform: str) -> str:
+        """Get the account ID for a platform (x, linkedin, etc.)."""
+        target = normalize_platform(platform)
+        for account in self.accounts():
+            if account.get("provider", "").lower() == target:
+                return account.get("id")
+        raise ValueError(f"No account found for {platform}")
+
+    def ids_by_platform(self) -> dict[str, str]:
+        """Get account IDs keyed by platform, with ``x`` aliasing ``twitter``."""
+        result = {}
+        for account in self.accounts():
+            provider = account.get("provider", "").lower()
+            if provider == "twitter":
+                result["x"] = account.get("id")
+                result["twitter"] = account.get("id")
+            elif provider == "linkedin":
+                result["linkedin"] = account.get("id")
+        return result
+
+
+_shared_registries: dict[PublerClientConfig, AccountRegistry] = {}
+
+
+def shared_registry(client: PublerClient) -> AccountRegistry:
+    """Return the process-wide registry bound to ``client``."""
+    registry = _shared_registries.get(client.config)
+    if registry is None:
+        registry = AccountRegistry(client)
+        _shared_registries[client.config] = registry
+    return registry
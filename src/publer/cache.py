@@ -0,0 +1,333 @@
+"""Opt-in cache for idempotent Publer GETs.
+
+Enable it with ``PUBLER_HTTP_CACHE=1`` (scripts) or ``social.py
+--http-cache``. ``PublerClient.get`` then answers repeated requests from a
+small in-memory LRU backed by ``state/http_cache.db`` (SQLite), so separate
+runs share it. Entries are keyed on method, path, params and client scope
+(base URL, API key and workspace) and live for a per-endpoint TTL:
+
+- ``/me``, ``/workspaces``: an hour; ``/accounts``: ten minutes
+- ``/posts``: one minute
+- ``/analytics/{id}/post_insights``: an hour, or a week for ranges that
+  ended more than ``SETTLED_DAYS`` ago
+- anything else (notably ``/job_status``) is never cached
+
+Any POST, PUT or DELETE drops cached entries under the same top-level path
+for that scope (``/posts/schedule`` clears ``/posts`` listings). The disk
+store is bounded by entry count and bytes, evicting least recently used
+entries first. Hits and misses are counted per process and in the store.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from src.state import emit
+
+CACHE_DB = Path(__file__).parent.parent.parent / "state" / "http_cache.db"
+ENV_FLAG = "PUBLER_HTTP_CACHE"
+
+DEFAULT_TTLS: dict[str, float] = {
+    "/me": 3600.0,
+    "/workspaces": 3600.0,
+    "/accounts": 600.0,
+    "/posts": 60.0,
+    "/analytics/{id}/post_insights": 3600.0,
+}
+SETTLED_DAYS = 3
+SETTLED_TTL = 7 * 86400.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    scope TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    path TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_scope_path ON responses (scope, path);
+CREATE INDEX IF NOT EXISTS responses_used ON responses (used_at);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_enabled = False
+
+
+def set_enabled(value: bool) -> bool:
+    """Turn caching on or off for every client in this process; returns the previous setting."""
+    global _enabled
+    previous, _enabled = _enabled, value
+    return previous
+
+
+def enabled() -> bool:
+    return _enabled or os.getenv(ENV_FLAG, "").strip().lower() in ("1", "true", "yes")
+
+
+def ttl_for(endpoint: str, params: Optional[dict[str, Any]] = None) -> Optional[float]:
+    """Seconds to keep a GET of ``endpoint`` (see ``endpoint_name``); None to skip caching."""
+    ttl = DEFAULT_TTLS.get(endpoint)
+    if ttl is not None and endpoint.endswith("/post_insights"):
+        try:
+            ended = date.fromisoformat(str((params or {}).get("to", ""))[:10])
+        except ValueError:
+            return ttl
+        if ended < datetime.now(timezone.utc).date() - timedelta(days=SETTLED_DAYS):
+            return SETTLED_TTL
+    return ttl
+
+
+def scope_of(base_url: str, api_key: str, workspace_id: Optional[str]) -> str:
+    """Short id for who is asking; responses are never shared across scopes."""
+    return hashlib.sha256(f"{base_url}|{api_key}|{workspace_id or ''}".encode()).hexdigest()[:16]
+
+
+def _key(method: str, scope: str, path: str, params: Optional[dict[str, Any]]) -> str:
+    canonical = json.dumps([method, scope, path, sorted((params or {}).items())], default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _prefix(path: str) -> str:
+    return "/" + path.lstrip("/").split("/", 1)[0]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Cache counters and current size."""
+
+    hits: int
+    memory_hits: int
+    misses: int
+    stores: int
+    evictions: int
+    invalidations: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_COUNTERS = ("hits", "memory_hits", "misses", "stores", "evictions", "invalidations")
+
+
+class ResponseCache:
+    """Memory LRU over a size-bounded SQLite store of GET responses.
+
+    Safe to share between threads; each lookup returns a fresh copy, so
+    callers may mutate what they get back.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttls: Optional[dict[str, float]] = None,
+        max_entries: int = 2000,
+        max_bytes: int = 64 * 1024 * 1024,
+        memory_entries: int = 256,
+    ) -> None:
+        self.path = path or CACHE_DB
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._ttls = ttls
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._memory_entries = memory_entries
+        # key -> (expires_at, scope, path, body)
+        self._memory: OrderedDict[str, tuple[float, str, str, str]] = OrderedDict()
+        self._counts = dict.fromkeys(_COUNTERS, 0)
+        self._flushed = dict.fromkeys(_COUNTERS, 0)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_counts()
+            self._db.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def ttl(self, endpoint: str, params: Optional[dict[str, Any]]) -> Optional[float]:
+        if self._ttls is not None:
+            return self._ttls.get(endpoint)
+        return ttl_for(endpoint, params)
+
+    def get(self, scope: str, endpoint: str, path: str, params: Optional[dict[str, Any]]) -> Optional[Any]:
+        """The cached response, or None on a miss (or for uncacheable endpoints)."""
+        if self.ttl(endpoint, params) is None:
+            return None
+        key = _key("GET", scope, path, params)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self._counts["hits"] += 1
+                self._counts["memory_hits"] += 1
+                body = entry[3]
+            else:
+                self._memory.pop(key, None)
+                row = self._db.execute(
+                    "SELECT expires_at, body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row[0] <= now:
+                    if row is not None:
+                        with self._db:
+                            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._counts["misses"] += 1
+                    body = None
+                else:
+                    with self._db:
+                        self._db.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+                    self._remember(key, (row[0], scope, path, row[1]))
+                    self._counts["hits"] += 1
+                    body = row[1]
+        emit("api_cache", {"endpoint": endpoint, "result": "miss" if body is None else "hit"})
+        return None if body is None else json.loads(body)
+
+    def put(self, scope: str, endpoint: str, path: str, params: Optional[dict[str, Any]], value: Any) -> None:
+        """Store a GET response under its endpoint's TTL."""
+        ttl = self.ttl(endpoint, params)
+        if ttl is None:
+            return
+        key = _key("GET", scope, path, params)
+        body = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._remember(key, (now + ttl, scope, path, body))
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, scope, endpoint, path, now + ttl, now, len(body), body),
+                )
+                self._counts["stores"] += 1
+                self._evict(now)
+
+    def _remember(self, key: str, entry: tuple[float, str, str, str]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        count, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self._max_entries and size <= self._max_bytes:
+            return
+        evicted = []
+        for key, entry_size in self._db.execute("SELECT key, size FROM responses ORDER BY used_at"):
+            if count <= self._max_entries and size <= self._max_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            size -= entry_size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        for (key,) in evicted:
+            self._memory.pop(key, None)
+        self._counts["evictions"] += len(evicted)
+
+    def invalidate(self, scope: str, path: str) -> int:
+        """Drop ``scope``'s entries under ``path``'s top-level segment (after a mutation)."""
+        prefix = _prefix(path)
+        like = prefix.replace("%", r"\%").replace("_", r"\_")
+        with self._lock:
+            stale = [
+                key for key, (_, entry_scope, entry_path, _) in self._memory.items()
+                if entry_scope == scope and _prefix(entry_path) == prefix
+            ]
+            for key in stale:
+                del self._memory[key]
+            with self._db:
+                dropped = self._db.execute(
+                    "DELETE FROM responses WHERE scope = ? AND (path = ? OR path LIKE ? ESCAPE '\\')",
+                    (scope, prefix, like + "/%"),
+                ).rowcount
+            self._counts["invalidations"] += dropped
+        return dropped
+
+    def clear(self) -> int:
+        """Drop every cached response."""
+        with self._lock:
+            self._memory.clear()
+            with self._db:
+                return self._db.execute("DELETE FROM responses").rowcount
+
+    def _flush_counts(self) -> None:
+        deltas = [(name, self._counts[name] - self._flushed[name]) for name in _COUNTERS]
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO stats VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                [(name, delta) for name, delta in deltas if delta],
+            )
+        self._flushed = dict(self._counts)
+
+    def stats(self, cumulative: bool = False) -> CacheStats:
+        """Counters for this process, or for every run sharing the store if ``cumulative``."""
+        with self._lock:
+            counts = dict(self._counts)
+            if cumulative:
+                self._flush_counts()
+                counts = dict.fromkeys(_COUNTERS, 0)
+                counts.update(self._db.execute("SELECT name, value FROM stats").fetchall())
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+        return CacheStats(entries=entries, bytes=size, **counts)
+
+    def endpoints(self) -> list[tuple[str, int, int]]:
+        """``(endpoint, entries, bytes)`` for live entries, largest first."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT endpoint, COUNT(*), SUM(size) FROM responses WHERE expires_at > ? "
+                "GROUP BY endpoint ORDER BY SUM(size) DESC",
+                (time.time(),),
+            ).fetchall()
+
+
+_shared: dict[Path, ResponseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_cache(path: Optional[Path] = None) -> ResponseCache:
+    """The process-wide cache for ``path`` (``CACHE_DB`` by default), closed at exit."""
+    path = path or CACHE_DB
+    with _shared_lock:
+        cache = _shared.get(path)
+        if cache is None:
+            cache = ResponseCache(path)
+            _shared[path] = cache
+            atexit.register(cache.close)
+        return cache
+
+
+def active_cache() -> Optional[ResponseCache]:
+    """The shared cache if caching is enabled, else None."""
+    return shared_cache() if enabled() else None
@@ -2,11 +2,34 @@
 
 from __future__ import annotations
 
+import os
+import re
+import threading
+import time
 from dataclasses import dataclass
 from typing import Any, Optional
 
 import requests
 
+from src.publer.cache import ResponseCache, active_cache, scope_of
+from src.state import emit
+from src.tracing import span
+
+DEFAULT_BASE_URL = "https://app.publer.com/api/v1"
+
+# Path segments that look like ids, collapsed so timings group by endpoint
+_ID_SEGMENT = re.compile(r"/(?=[^/]*\d)[\w-]{8,}")
+
+
+def endpoint_name(path: str) -> str:
+    """``/job_status/abc123...`` -> ``/job_status/{id}``."""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def base_url_from_env() -> str:
+    """API base URL, overridable with ``PUBLER_BASE_URL`` (e.g. a local fake)."""
+    return os.getenv("PUBLER_BASE_URL", "").strip() or DEFAULT_BASE_URL
+
 
 @dataclass(frozen=True)
 class PublerClientConfig:
@@ -14,14 +37,72 @@ class PublerClientConfig:
 
     api_key: str
     workspace_id: Optional[str] = None
-    base_url: str = "https://app.publer.com/api/v1"
+    base_url: str = DEFAULT_BASE_URL
+    # Client-side cap on request rate; None leaves requests unthrottled.
+    requests_per_second: Optional[float] = None
+
+
+class RateLimiter:
+    """Token bucket shared by every thread using one client.
+
+    Each request takes a token; when the bucket is empty the caller sleeps
+    until its token is due, so bursts of up to ``burst`` requests go out
+    immediately and sustained traffic settles at ``rate`` per second.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token without sleeping; returns how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> float:
+        """Take a token, sleeping if needed; returns the seconds waited."""
+        wait = self.reserve()
+        if wait:
+            with span("rate limit", "http"):
+                time.sleep(wait)
+        return wait
 
 
 class PublerClient:
-    """Minimal Publer API client using bearer token auth."""
+    """Minimal Publer API client using bearer token auth.
+
+    Requests go through a ``requests.Session`` so repeated calls reuse
+    pooled connections instead of reconnecting each time, and through the
+    config's shared ``RateLimiter`` when it sets ``requests_per_second``.
+
+    GETs go through ``cache`` when given, or the shared response cache when
+    caching is enabled (see ``src.publer.cache``); POST, PUT and DELETE
+    invalidate what they may have changed.
+    """
 
-    def __init__(self, config: PublerClientConfig) -> None:
+    def __init__(
+        self,
+        config: PublerClientConfig,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
         self._config = config
+        self._session = session or requests.Session()
+        self._limiter = shared_limiter(config)
+        self._cache = cache
+        self._scope = scope_of(config.base_url, config.api_key, config.workspace_id)
+
+    @property
+    def config(self) -> PublerClientConfig:
+        """Configuration this client was built with."""
+        return self._config
 
     def get_me(self) -> dict[str, Any]:
         """Validate credentials by fetching current user."""
@@ -37,11 +118,37 @@ class PublerClient:
 
     def get(self, path: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
         """Perform a GET request."""
-        return self._request("GET", path, params=params)
+        cache = self._cache or active_cache()
+        if cache is None:
+            return self._request("GET", path, params=params)
+        endpoint = endpoint_name(path)
+        cached = cache.get(self._scope, endpoint, path, params)
+        if cached is not None:
+            return cached
+        data = self._request("GET", path, params=params)
+        cache.put(self._scope, endpoint, path, params, data)
+        return data
 
     def post(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
         """Perform a POST request."""
-        return self._request("POST", path, json=payload)
+        return self._mutate("POST", path, payload)
+
+    def put(self, path: str, payload: dict[str, Any]) -> dict[str, Any]:
+        """Perform a PUT request."""
+        return self._mutate("PUT", path, payload)
+
+    def delete(self, path: str) -> dict[str, Any]:
+        """Perform a DELETE request."""
+        return self._mutate("DELETE", path)
+
+    def _mutate(self, method: str, path: str, payload: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        try:
+            return self._request(method, path, json=payload)
+        finally:
+            # Even a failed call may have changed something server-side.
+            cache = self._cache or active_cache()
+            if cache is not None:
+                cache.invalidate(self._scope, path)
 
     def _request(
         self,
@@ -58,8 +165,58 @@ class PublerClient:
         if self._config.workspace_id:
             headers["Publer-Workspace-Id"] = self._config.workspace_id
 
-        response = requests.request(
-            method=method, url=url, headers=headers, params=params, json=json, timeout=30
-        )
+        endpoint = endpoint_name(path)
+        if self._limiter:
+            self._limiter.acquire()
+        start = time.perf_counter()
+        with span(f"{method} {endpoint}", "http", method=method, path=path) as s:
+            response = self._session.request(
+                method=method, url=url, headers=headers, params=params, json=json, timeout=30
+            )
+            s.set(status=response.status_code, bytes=len(response.content))
+        emit("api_request", {
+            "method": method,
+            "endpoint": endpoint,
+            "status": response.status_code,
+            "seconds": time.perf_counter() - start,
+        })
         response.raise_for_status()
+        if not response.content:
+            return {}
         return response.json()
+
+
+_shared_limiters: dict[PublerClientConfig, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def shared_limiter(config: PublerClientConfig) -> Optional[RateLimiter]:
+    """The process-wide rate limiter for ``config`` (None if unthrottled).
+
+    Every client built from the same config draws from this one bucket,
+    so together they stay within the configured rate.
+    """
+    if not config.requests_per_second:
+        return None
+    with _limiters_lock:
+        limiter = _shared_limiters.get(config)
+        if limiter is None:
+            limiter = RateLimiter(config.requests_per_second)
+            _shared_limiters[config] = limiter
+        return limiter
+
+
+_shared_clients: dict[PublerClientConfig, PublerClient] = {}
+
+
+def shared_client(config: PublerClientConfig) -> PublerClient:
+    """Return a process-wide client for ``config``.
+
+    Reusing one client per configuration keeps its connection pool warm for
+    the lifetime of the process (notably under ``social.py serve``).
+    """
+    client = _shared_clients.get(config)
+    if client is None:
+        client = PublerClient(config)
+        _shared_clients[config] = client
+    return client
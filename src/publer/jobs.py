@@ -0,0 +1,170 @@
+"""Concurrent tracking of Publer async jobs.
+
+Publer answers ``/posts/schedule`` with a ``job_id`` whose outcome appears
+later at ``/job_status/{id}``. ``JobTracker`` polls many jobs at once on a
+thread pool, backing off exponentially per job until every job resolves or
+a deadline passes. Jobs still unresolved are saved to
+``state/pending_jobs.json`` so a later ``social.py jobs`` can finish them.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.publer.client import PublerClient
+from src.statefile import read_json, update_json
+from src.tracing import span
+
+PENDING_JOBS_FILE = Path(__file__).parent.parent.parent / "state" / "pending_jobs.json"
+
+PENDING = "pending"
+COMPLETE = "complete"
+FAILED = "failed"
+
+_DONE_STATUSES = {"complete", "completed", "done", "success", "finished"}
+_FAILED_STATUSES = {"failed", "error"}
+
+
+def classify_status(status: dict[str, Any]) -> str:
+    """Map a ``/job_status`` response to pending, complete or failed."""
+    if (status.get("payload") or {}).get("failures"):
+        return FAILED
+    state = str(status.get("status", "")).lower()
+    if state in _FAILED_STATUSES:
+        return FAILED
+    if state in _DONE_STATUSES:
+        return COMPLETE
+    return PENDING
+
+
+@dataclass
+class TrackedJob:
+    """A job being polled, plus whatever the caller needs to settle it."""
+
+    job_id: str
+    submitted_at: float
+    context: dict[str, Any] = field(default_factory=dict)
+    state: str = PENDING
+    polls: int = 0
+    duration: Optional[float] = None
+    response: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def failures(self) -> Any:
+        return ((self.response or {}).get("payload") or {}).get("failures")
+
+
+class JobTracker:
+    """Poll job statuses concurrently with per-job exponential backoff."""
+
+    def __init__(
+        self,
+        client: PublerClient,
+        initial_delay: float = 0.5,
+        max_delay: float = 8.0,
+        max_workers: int = 8,
+        state_file: Optional[Path] = None,
+    ) -> None:
+        self._client = client
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._max_workers = max_workers
+        self._state_file = state_file or PENDING_JOBS_FILE
+        self._jobs: dict[str, TrackedJob] = {}
+
+    def add(self, job_id: str, context: Optional[dict[str, Any]] = None,
+            submitted_at: Optional[float] = None) -> TrackedJob:
+        """Start tracking ``job_id``."""
+        job = TrackedJob(job_id=job_id, submitted_at=submitted_at or time.time(),
+                         context=context or {})
+        self._jobs[job_id] = job
+        return job
+
+    def load_pending(self, accept: Optional[Callable[[TrackedJob], bool]] = None) -> list[TrackedJob]:
+        """Track every job saved as pending by earlier runs (that ``accept`` allows)."""
+        loaded = []
+        for data in self._read_state().values():
+            job = TrackedJob(**data)
+            if accept and not accept(job):
+                continue
+            self._jobs[job.job_id] = job
+            loaded.append(job)
+        return loaded
+
+    @property
+    def jobs(self) -> list[TrackedJob]:
+        return list(self._jobs.values())
+
+    def _poll(self, job: TrackedJob) -> None:
+        job.polls += 1
+        try:
+            response = self._client.get(f"/job_status/{job.job_id}")
+        except Exception as e:
+            job.error = str(e)
+            return
+        job.response = response
+        job.error = None
+        job.state = classify_status(response)
+        if job.state != PENDING:
+            job.duration = time.time() - job.submitted_at
+
+    def wait(self, timeout: float = 60.0) -> list[TrackedJob]:
+        """Poll until every job resolves or ``timeout`` seconds pass.
+
+        Returns all tracked jobs; unresolved ones keep state ``pending`` and
+        are persisted for a later run.
+        """
+        self.save()
+        deadline = time.monotonic() + timeout
+        next_poll = {job_id: time.monotonic() + self._initial_delay
+                     for job_id, job in self._jobs.items() if job.state == PENDING}
+        delays = {job_id: self._initial_delay for job_id in next_poll}
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            while next_poll:
+                wake = min(next_poll.values())
+                now = time.monotonic()
+                if wake > deadline:
+                    break
+                if wake > now:
+                    with span("backoff", "jobs"):
+                        time.sleep(wake - now)
+
+                now = time.monotonic()
+                due = [self._jobs[job_id] for job_id, at in next_poll.items() if at <= now]
+                with span("poll round", "jobs", jobs=len(due)):
+                    list(pool.map(self._poll, due))
+
+                for job in due:
+                    if job.state != PENDING:
+                        del next_poll[job.job_id]
+                        continue
+                    delays[job.job_id] = min(delays[job.job_id] * 2, self._max_delay)
+                    next_poll[job.job_id] = time.monotonic() + delays[job.job_id]
+
+        self.save()
+        return self.jobs
+
+    def _read_state(self) -> dict[str, dict[str, Any]]:
+        return read_json(self._state_file, {})
+
+    def save(self) -> None:
+        """Merge this tracker's jobs into the pending-jobs file.
+
+        Pending jobs are added or updated; resolved ones are removed.
+        """
+        def merge(saved: Any) -> dict[str, Any]:
+            saved = saved if isinstance(saved, dict) else {}
+            for job in self._jobs.values():
+                if job.state == PENDING:
+                    saved[job.job_id] = asdict(job)
+                else:
+                    saved.pop(job.job_id, None)
+            return saved
+
+        update_json(self._state_file, {}, merge)
@@ -1,11 +1,23 @@
-"""Scheduling utilities for Publer."""
+"""Scheduling utilities for Publer.
+
+``PublerScheduler.schedule_many`` is the one path every entry point uses to
+create posts: it builds the ``/posts/schedule`` bulk payload, submits
+batches concurrently over the client's pooled connections (paced by its
+rate limiter), tracks the resulting jobs with ``JobTracker`` and returns
+one ``ScheduleResult`` per request, in request order.
+"""
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Iterable, Optional, Sequence
 
 from src.publer.client import PublerClient
+from src.publer.jobs import COMPLETE, FAILED, PENDING, JobTracker, TrackedJob
+from src.tracing import span
+
+SUBMITTED = "submitted"
 
 
 @dataclass(frozen=True)
@@ -19,6 +31,132 @@ class ScheduleRequest:
     comments: Optional[list[dict[str, Any]]] = None
 
 
+@dataclass(frozen=True)
+class ScheduleResult:
+    """Outcome of one ``ScheduleRequest``.
+
+    ``state`` is ``complete`` or ``failed`` once known, ``pending`` if its
+    job was still running when the wait ended, and ``submitted`` when the
+    caller asked not to wait.
+    """
+
+    request: ScheduleRequest
+    state: str
+    job_id: Optional[str] = None
+    post_id: Optional[str] = None
+    error: Optional[str] = None
+    job_seconds: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.state != FAILED
+
+
+def _payload(requests: Sequence[ScheduleRequest]) -> dict[str, Any]:
+    return {
+        "bulk": {
+            "state": "scheduled",
+            "posts": [
+                {
+                    "networks": {request.network: {"type": "status", "text": request.text}},
+                    "accounts": [
+                        {
+                            "id": request.account_id,
+                            "scheduled_at": request.scheduled_at,
+                            "comments": request.comments or [],
+                        }
+                    ],
+                }
+                for request in requests
+            ],
+        }
+    }
+
+
+def _post_ids(payload: dict[str, Any]) -> list[str]:
+    posts = payload.get("posts") or payload.get("post_ids") or []
+    return [str(post.get("id") if isinstance(post, dict) else post) for post in posts]
+
+
+def _batch_results(
+    batch: Sequence[ScheduleRequest],
+    response: Optional[dict[str, Any]],
+    error: Optional[str],
+    job: Optional[TrackedJob],
+    waited: bool,
+) -> list[ScheduleResult]:
+    if error is not None:
+        return [ScheduleResult(request, FAILED, error=error) for request in batch]
+    if job is None:
+        return [ScheduleResult(request, COMPLETE) for request in batch]
+    if not waited:
+        return [ScheduleResult(request, SUBMITTED, job_id=job.job_id) for request in batch]
+    if job.state == PENDING:
+        return [ScheduleResult(request, PENDING, job_id=job.job_id, error=job.error) for request in batch]
+
+    payload = (job.response or {}).get("payload") or {}
+    failures = payload.get("failures")
+    if isinstance(failures, dict) and failures and len(batch) > 1:
+        matched = _match_created(batch, payload, job, failures)
+        if matched is not None:
+            return matched
+    post_ids = iter(_post_ids(payload))
+    results = []
+    for request in batch:
+        if isinstance(failures, dict) and failures:
+            # Publer keys failures by account, so without per-post details
+            # every post of a failed account in the batch counts as failed.
+            failure = failures.get(request.account_id)
+        elif job.state == FAILED:
+            failure = failures or job.response
+        else:
+            failure = None
+        if failure is not None:
+            results.append(ScheduleResult(request, FAILED, job_id=job.job_id, error=str(failure),
+                                          job_seconds=job.duration))
+        else:
+            results.append(ScheduleResult(request, COMPLETE, job_id=job.job_id, post_id=next(post_ids, None),
+                                          job_seconds=job.duration))
+    return results
+
+
+def _batch_context(batch: Sequence[ScheduleRequest]) -> dict[str, Any]:
+    """Job context describing the posts of a batch sent without caller contexts."""
+    return {
+        "posts": [
+            {"network": request.network, "account_id": request.account_id, "scheduled_at": request.scheduled_at}
+            for request in batch
+        ]
+    }
+
+
+def _match_created(
+    batch: Sequence[ScheduleRequest], payload: dict[str, Any], job: TrackedJob, failures: dict[str, Any]
+) -> Optional[list[ScheduleResult]]:
+    """Per-post results from the created posts a job reports, when they say which request they are.
+
+    Only possible when every created post carries its ``account_id`` and
+    ``scheduled_at``; returns None otherwise.
+    """
+    posts = payload.get("posts") or []
+    if not all(isinstance(post, dict) and post.get("account_id") for post in posts):
+        return None
+    created: dict[tuple[str, Optional[str]], list[str]] = {}
+    for post in posts:
+        created.setdefault((str(post["account_id"]), post.get("scheduled_at")), []).append(str(post.get("id")))
+    results = []
+    for request in batch:
+        ids = created.get((request.account_id, request.scheduled_at))
+        if ids:
+            results.append(ScheduleResult(request, COMPLETE, job_id=job.job_id, post_id=ids.pop(0),
+                                          job_seconds=job.duration))
+        else:
+            failure = failures.get(request.account_id, "not among the job's created posts")
+            results.append(ScheduleResult(request, FAILED, job_id=job.job_id, error=str(failure),
+                                          job_seconds=job.duration))
+    return results
+
+
 class PublerScheduler:
     """Create scheduled or immediate posts."""
 
@@ -26,22 +164,66 @@ class PublerScheduler:
         self._client = client
 
     def schedule(self, request: ScheduleRequest) -> dict[str, Any]:
-        """Schedule a post (or publish immediately if scheduled_at is None)."""
-        payload = {
-            "bulk": {
-                "state": "scheduled",
-                "posts": [
-                    {
-                        "networks": {request.network: {"type": "status", "text": request.text}},
-                        "accounts": [
-                            {
-                                "id": request.account_id,
-                                "scheduled_at": request.scheduled_at,
-                                "comments": request.comments or [],
-                            }
-                        ],
-                    }
-                ],
-            }
-        }
-        return self._client.post("/posts/schedule", payload)
+        """Schedule a post (or publish immediately if scheduled_at is None).
+
+        Returns Publer's raw response; see ``schedule_many`` for tracked,
+        structured results.
+        """
+        return self._client.post("/posts/schedule", _payload([request]))
+
+    def schedule_many(
+        self,
+        requests: Iterable[ScheduleRequest],
+        batch_size: int = 1,
+        max_workers: int = 8,
+        wait: bool = True,
+        job_timeout: float = 60.0,
+        tracker: Optional[JobTracker] = None,
+        contexts: Optional[Sequence[dict[str, Any]]] = None,
+    ) -> list[ScheduleResult]:
+        """Schedule many posts and report each one's outcome, in order.
+
+        Requests are sent ``batch_size`` posts per ``/posts/schedule`` call,
+        with up to ``max_workers`` calls in flight. Their jobs are added to
+        ``tracker`` (a new one by default) and, if ``wait``, polled for up to
+        ``job_timeout`` seconds; jobs still running are saved as pending like
+        any other tracked job.
+
+        ``contexts`` (one per request, ``batch_size`` 1 only) are attached
+        to the tracked jobs, for callers that settle jobs themselves. Without
+        them each job records the posts it carries (``_batch_context``), so
+        ``social.py jobs`` can still report and clear it later.
+        """
+        requests = list(requests)
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if contexts is not None and (batch_size != 1 or len(contexts) != len(requests)):
+            raise ValueError("contexts need batch_size 1 and one context per request")
+        tracker = tracker or JobTracker(self._client)
+        batches = [requests[i:i + batch_size] for i in range(0, len(requests), batch_size)]
+
+        def submit(batch: list[ScheduleRequest]) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+            try:
+                return self._client.post("/posts/schedule", _payload(batch)), None
+            except Exception as e:
+                return None, str(e)
+
+        with span("schedule", "publer", posts=len(requests), batches=len(batches)):
+            if len(batches) == 1:
+                responses = [submit(batches[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    responses = list(pool.map(submit, batches))
+
+        jobs: list[Optional[TrackedJob]] = []
+        for index, (response, _) in enumerate(responses):
+            job_id = (response or {}).get("job_id")
+            context = dict(contexts[index]) if contexts else _batch_context(batches[index])
+            jobs.append(tracker.add(job_id, context) if job_id else None)
+        if wait and any(jobs):
+            tracker.wait(timeout=job_timeout)
+
+        results: list[ScheduleResult] = []
+        for batch, (response, error), job in zip(batches, responses, jobs):
+            results.extend(_batch_results(batch, response, error, job, wait))
+        return results
@@ -1,22 +1,36 @@
-"""Queue manager for viewing and managing Publer scheduled posts."""
+"""Queue manager for viewing and managing Publer scheduled posts.
+
+Reads come from the local mirror in ``state/snapshot.db`` (see
+``src.snapshot``), which our own cancels and reschedules update in place.
+The mirror is reconciled against Publer by ``queue sync``, by reads that
+ask for it (``list_scheduled(max_age=...)``, ``queue ls --refresh``) and,
+under ``social.py serve``, on a timer. Plain reads never touch the network.
+"""
 
 from __future__ import annotations
 
-import json
-import os
-from datetime import datetime
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Optional
 
 from dotenv import load_dotenv
-import requests
+
+from src import workspaces
+from src.linkage import LinkStore
+from src.publer.accounts import AccountRegistry, shared_registry
+from src.publer.client import PublerClient
+from src.records import QueuedPost
+from src.state import emit
+from src.slots import parse_datetime
+from src.snapshot import Drift, SnapshotStore
+from src.statefile import update_json
 
 STATE_DIR = Path("state")
-SNAPSHOT_FILE = STATE_DIR / "publer_snapshot.json"
 EVENT_LOG_FILE = STATE_DIR / "queue_events.json"
-
-BASE_URL = "https://app.publer.com/api/v1"
-WORKSPACE_ID = "69717f7a2820f00c7aec83f3"
+MIRROR_MAX_AGE = timedelta(minutes=15)
 
 
 def _load_env() -> None:
@@ -24,85 +38,96 @@ def _load_env() -> None:
     load_dotenv(dotenv_path="config/.env")
 
 
-def _get_headers() -> dict[str, str]:
-    """Get API headers."""
+def _get_client() -> PublerClient:
+    """Get the shared Publer client for the current workspace."""
     _load_env()
-    api_key = os.getenv("PUBLER_API_KEY", "")
-    return {
-        "Authorization": f"Bearer-API {api_key}",
-        "Publer-Workspace-Id": WORKSPACE_ID,
-        "Content-Type": "application/json",
-    }
+    return workspaces.current().client()
 
 
 def _get_accounts() -> list[dict[str, Any]]:
     """Fetch all connected accounts."""
-    response = requests.get(f"{BASE_URL}/accounts", headers=_get_headers())
-    response.raise_for_status()
-    return response.json()
+    return shared_registry(_get_client()).accounts()
 
 
 def _get_account_id(platform: str) -> str:
     """Get account ID for a platform (x, linkedin, etc.)."""
-    accounts = _get_accounts()
-    platform_map = {"x": "twitter", "twitter": "twitter", "linkedin": "linkedin"}
-    target = platform_map.get(platform.lower(), platform.lower())
-    
-    for account in accounts:
-        if account.get("provider", "").lower() == target:
-            return account.get("id")
-    
-    raise ValueError(f"No account found for {platform}")
+    return shared_registry(_get_client()).account_id(platform)
+
+
+def _log_events(events: list[tuple[str, dict[str, Any]]]) -> None:
+    """Append events to the event log in one write."""
+    timestamp = datetime.utcnow().isoformat() + "Z"
+    records = [{"timestamp": timestamp, "event": event_type, "data": data} for event_type, data in events]
+    update_json(EVENT_LOG_FILE, [], lambda logged: (logged if isinstance(logged, list) else []) + records)
+    for event_type, data in events:
+        emit(event_type, data)
 
 
 def _log_event(event_type: str, data: dict[str, Any]) -> None:
     """Append an event to the event log."""
-    STATE_DIR.mkdir(parents=True, exist_ok=True)
-    events = []
-    if EVENT_LOG_FILE.exists():
-        try:
-            events = json.loads(EVENT_LOG_FILE.read_text())
-        except (json.JSONDecodeError, OSError):
-            events = []
-    events.append({
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "event": event_type,
-        "data": data,
-    })
-    EVENT_LOG_FILE.write_text(json.dumps(events, indent=2))
+    _log_events([(event_type, data)])
+
+
+def _event_data(result: dict[str, Any]) -> dict[str, Any]:
+    return {key: result[key] for key in ("post_id", "new_time", "success", "error") if key in result}
+
+
+def log_bulk(event_type: str, results: list[dict[str, Any]]) -> None:
+    """Log the results of ``cancel_many``/``reschedule_many`` with one event log write."""
+    if results:
+        _log_events([(event_type, _event_data(result)) for result in results])
+
+
+def parse_shift(value: str) -> timedelta:
+    """Parse a relative move like ``+2d``, ``-3h``, ``90m`` or ``1w``."""
+    units = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+    match = re.fullmatch(r"([+-]?)(\d+(?:\.\d+)?)([mhdw])", value.strip())
+    if not match:
+        raise ValueError(f"Invalid shift '{value}' (expected e.g. +2d, -3h, 90m, 1w)")
+    sign, amount, unit = match.groups()
+    delta = timedelta(**{units[unit]: float(amount)})
+    return -delta if sign == "-" else delta
 
 
 class QueueManager:
-    """Manage Publer scheduled posts queue."""
+    """Manage one workspace's Publer scheduled posts queue."""
 
-    def __init__(self) -> None:
-        self._accounts_cache: Optional[list[dict]] = None
+    def __init__(
+        self, client: Optional[PublerClient] = None, workspace: Optional[workspaces.Workspace] = None
+    ) -> None:
+        _load_env()
+        self.workspace = workspace or workspaces.current()
+        self._client = client or self.workspace.client()
+        self._registry: AccountRegistry = shared_registry(self._client)
 
     def _get_account_ids(self) -> dict[str, str]:
         """Get account IDs by platform (fetched dynamically)."""
-        if self._accounts_cache is None:
-            self._accounts_cache = _get_accounts()
-        
-        result = {}
-        for account in self._accounts_cache:
-            provider = account.get("provider", "").lower()
-            if provider == "twitter":
-                result["x"] = account.get("id")
-                result["twitter"] = account.get("id")
-            elif provider == "linkedin":
-                result["linkedin"] = account.get("id")
-        return result
+        return self._registry.ids_by_platform()
 
-    def list_scheduled(self, platform: Optional[str] = None) -> list[dict[str, Any]]:
+    def list_scheduled(
+        self, platform: Optional[str] = None, live: bool = False, max_age: Optional[timedelta] = None
+    ) -> list[QueuedPost]:
         """
         List scheduled posts, optionally filtered by platform.
 
         Args:
             platform: Optional platform filter ('linkedin', 'x', 'twitter')
+            live: Ask Publer directly instead of reading the local mirror
+            max_age: Reconcile the mirror first if it is older than this
+                (None, the default, only reads the mirror)
 
         Returns:
-            List of posts with id, text, scheduled_at, platform/network
+            List of posts
         """
+        if live:
+            return self._list_live(platform)
+        if max_age is not None:
+            self.ensure_fresh(max_age)
+        with SnapshotStore() as store:
+            posts = store.posts(platform=platform, workspace=self.workspace.name)
+        return [QueuedPost.from_row(post) for post in posts]
+
+    def _list_live(self, platform: Optional[str] = None) -> list[QueuedPost]:
         params: dict[str, Any] = {"state": "scheduled"}
 
         if platform:
@@ -111,33 +136,59 @@ class QueueManager:
             if account_id:
                 params["account_ids[]"] = account_id
 
-        response = requests.get(f"{BASE_URL}/posts", headers=_get_headers(), params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = self._client.get("/posts", params=params)
 
         posts = data if isinstance(data, list) else data.get("posts", [])
 
-        result = []
-        for post in posts:
-            result.append({
-                "id": post.get("id"),
-                "text": post.get("text", post.get("content", "")),
-                "scheduled_at": post.get("scheduled_at", post.get("send_at")),
-                "network": post.get("network", post.get("provider", "unknown")),
-                "platform": post.get("network", post.get("provider", "unknown")),
-            })
-        return result
+        return [QueuedPost.from_row({**post, "workspace": self.workspace.name}) for post in posts]
+
+    def synced_at(self) -> Optional[datetime]:
+        """When this workspace's mirror was last reconciled with Publer."""
+        with SnapshotStore() as store:
+            synced = store.synced_at(self.workspace.name)
+        return parse_datetime(synced) if synced else None
+
+    def ensure_fresh(self, max_age: timedelta = MIRROR_MAX_AGE) -> Optional[Drift]:
+        """Reconcile the mirror if it is older than ``max_age``; the drift if it ran."""
+        synced = self.synced_at()
+        if synced is not None:
+            if synced.tzinfo is None:
+                synced = synced.replace(tzinfo=timezone.utc)
+            if datetime.now(timezone.utc) - synced < max_age:
+                return None
+        return self.reconcile()[1]
 
     def sync(self) -> dict[str, Any]:
         """
-        Fetch all scheduled posts from Publer and save to state/publer_snapshot.json.
+        Reconcile this workspace's mirror with Publer (see ``reconcile``).
 
         Returns:
             Summary of synced posts per platform
         """
+        return self.reconcile()[0]
+
+    def reconcile(self) -> tuple[dict[str, Any], Drift]:
+        """
+        Fetch all scheduled posts from Publer and diff them into this
+        workspace's mirror (state/snapshot.db).
+
+        Scheduled items whose job never reported a post id are linked to
+        their post here (see ``src.linkage``); posts linked to a plan item
+        are ours and never count as drift. A platform whose fetch fails
+        keeps its mirrored posts and last count, the error is logged and
+        returned under ``"errors"``, and the workspace's sync time is left
+        as it was, so the mirror still reads as stale.
+
+        Returns:
+            Posts per platform (plus ``errors`` by platform, if any fetch
+            failed), and the drift found
+        """
         account_ids = self._get_account_ids()
         all_posts: list[dict[str, Any]] = []
-        counts = {"linkedin": 0, "twitter": 0}
+        with SnapshotStore() as store:
+            counts = {"linkedin": 0, "twitter": 0, **store.counts(self.workspace.name)}
+        fetched = []
+        errors: dict[str, str] = {}
 
         for platform in ["linkedin", "x"]:
             account_id = account_ids.get(platform)
@@ -145,29 +196,89 @@ class QueueManager:
                 continue
             try:
                 params = {"state": "scheduled", "account_ids[]": account_id}
-                response = requests.get(f"{BASE_URL}/posts", headers=_get_headers(), params=params)
-                response.raise_for_status()
-                data = response.json()
+                data = self._client.get("/posts", params=params)
                 posts = data if isinstance(data, list) else data.get("posts", [])
                 for post in posts:
                     post["_platform"] = platform
                 all_posts.extend(posts)
                 key = "twitter" if platform == "x" else platform
                 counts[key] = len(posts)
-            except Exception:
-                pass
+                fetched.append(platform)
+            except Exception as e:
+                errors[platform] = str(e)
+
+        with LinkStore() as links:
+            links.attach_posts(all_posts)
+            ours = links.post_ids()
+        with SnapshotStore() as store:
+            drift = store.reconcile(
+                all_posts, counts, datetime.utcnow().isoformat() + "Z",
+                workspace=self.workspace.name, platforms=fetched, expected=ours, partial=bool(errors),
+            )
 
-        STATE_DIR.mkdir(parents=True, exist_ok=True)
-        snapshot = {
-            "synced_at": datetime.utcnow().isoformat() + "Z",
-            "posts": all_posts,
-            "counts": counts,
-        }
-        SNAPSHOT_FILE.write_text(json.dumps(snapshot, indent=2))
+        events = [("sync", {"workspace": self.workspace.name, "post_count": len(all_posts), "counts": counts})]
+        events.extend(
+            ("sync_failed", {"workspace": self.workspace.name, "platform": platform, "error": error})
+            for platform, error in errors.items()
+        )
+        if drift:
+            events.append(("drift", {"workspace": self.workspace.name, **drift.summary()}))
+        _log_events(events)
+
+        if errors:
+            return {**counts, "errors": errors}, drift
+        return counts, drift
+
+    def select(
+        self,
+        post_ids: Optional[list[str]] = None,
+        platform: Optional[str] = None,
+        account_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        text: Optional[str] = None,
+    ) -> list[QueuedPost]:
+        """
+        Select posts from this workspace's snapshot (see ``queue sync``).
 
-        _log_event("sync", {"post_count": len(all_posts), "counts": counts})
+        Every given filter must match: ``post_ids``, platform, account,
+        scheduled time in ``[start, end)`` and a case-insensitive ``text``
+        substring.
+        """
+        with SnapshotStore() as store:
+            posts = store.posts(
+                platform=platform,
+                account_ids=[account_id] if account_id else None,
+                start=start,
+                end=end,
+                workspace=self.workspace.name,
+            )
+        if post_ids is not None:
+            wanted = set(post_ids)
+            posts = [p for p in posts if p["id"] in wanted]
+        if text:
+            needle = text.lower()
+            posts = [p for p in posts if needle in (p.get("text") or "").lower()]
+        return [QueuedPost.from_row(post) for post in posts]
+
+    def _cancel(self, post_id: str) -> dict[str, Any]:
+        try:
+            self._client.delete(f"/posts/{post_id}")
+            return {"success": True, "post_id": post_id, "message": "Post cancelled"}
+        except Exception as e:
+            return {"success": False, "post_id": post_id, "error": str(e)}
 
-        return counts
+    def _reschedule(self, post_id: str, new_time: str) -> dict[str, Any]:
+        try:
+            self._client.put(f"/posts/{post_id}", {"scheduled_at": new_time})
+            return {
+                "success": True,
+                "post_id": post_id,
+                "new_time": new_time,
+                "message": "Post rescheduled",
+            }
+        except Exception as e:
+            return {"success": False, "post_id": post_id, "new_time": new_time, "error": str(e)}
 
     def cancel(self, post_id: str) -> dict[str, Any]:
         """
@@ -179,14 +290,10 @@ class QueueManager:
         Returns:
             Result of the cancellation attempt
         """
-        try:
-            response = requests.delete(f"{BASE_URL}/posts/{post_id}", headers=_get_headers())
-            response.raise_for_status()
-            _log_event("cancel", {"post_id": post_id, "success": True})
-            return {"success": True, "post_id": post_id, "message": "Post cancelled"}
-        except Exception as e:
-            _log_event("cancel", {"post_id": post_id, "success": False, "error": str(e)})
-            return {"success": False, "post_id": post_id, "error": str(e)}
+        result = self._cancel(post_id)
+        self._mirror([result], [])
+        _log_event("cancel", _event_data(result))
+        return result
 
     def reschedule(self, post_id: str, new_time: str) -> dict[str, Any]:
         """
@@ -199,30 +306,56 @@ class QueueManager:
         Returns:
             Result of the reschedule attempt
         """
-        try:
-            payload = {"scheduled_at": new_time}
-            response = requests.put(
-                f"{BASE_URL}/posts/{post_id}",
-                headers=_get_headers(),
-                json=payload
-            )
-            response.raise_for_status()
-            _log_event("reschedule", {
-                "post_id": post_id,
-                "new_time": new_time,
-                "success": True,
-            })
-            return {
-                "success": True,
-                "post_id": post_id,
-                "new_time": new_time,
-                "message": "Post rescheduled",
-            }
-        except Exception as e:
-            _log_event("reschedule", {
-                "post_id": post_id,
-                "new_time": new_time,
-                "success": False,
-                "error": str(e),
-            })
-            return {"success": False, "post_id": post_id, "error": str(e)}
+        result = self._reschedule(post_id, new_time)
+        self._mirror([], [result])
+        _log_event("reschedule", _event_data(result))
+        return result
+
+    def _mirror(self, cancelled: list[dict[str, Any]], moved: list[dict[str, Any]]) -> None:
+        """Apply our successful cancels and moves to the local mirror."""
+        cancelled = [r["post_id"] for r in cancelled if r.get("success")]
+        moved = [(r["post_id"], r["new_time"]) for r in moved if r.get("success")]
+        if not cancelled and not moved:
+            return
+        with SnapshotStore() as store:
+            store.remove(cancelled)
+            store.move(moved)
+
+    def cancel_many(self, post_ids: list[str], max_workers: int = 8) -> list[dict[str, Any]]:
+        """
+        Cancel several posts concurrently (paced by the client's rate limiter).
+
+        Nothing is logged; pass the results to ``log_bulk``.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(self._cancel, post_ids))
+        self._mirror(results, [])
+        return results
+
+    def reschedule_many(self, moves: list[tuple[str, str]], max_workers: int = 8) -> list[dict[str, Any]]:
+        """
+        Reschedule ``(post_id, new_time)`` pairs concurrently.
+
+        Nothing is logged; pass the results to ``log_bulk``.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(lambda move: self._reschedule(*move), moves))
+        self._mirror([], results)
+        return results
+
+
+def start_reconciler(
+    targets: list[workspaces.Workspace], interval: timedelta, stop: Optional[threading.Event] = None
+) -> threading.Event:
+    """Reconcile each workspace's mirror every ``interval`` on a daemon thread.
+
+    Set the returned event to stop it.
+    """
+    stop = stop or threading.Event()
+
+    def loop() -> None:
+        while not stop.wait(interval.total_seconds()):
+            workspaces.fan_out(targets, lambda w: QueueManager(workspace=w).reconcile())
+
+    threading.Thread(target=loop, name="queue-reconciler", daemon=True).start()
+    return stop
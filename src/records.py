@@ -0,0 +1,156 @@
+"""Record types passed through the pipeline.
+
+Ideas, drafts, plan items and queued posts are frozen, slotted dataclasses
+rather than dicts: each instance stores its fields in fixed slots (no
+per-instance ``__dict__``), so large listings take a fraction of the
+memory, typos in field names fail loudly, and records can be shared
+between threads without copying. ``to_dict`` produces the JSON shape the
+files and CLI output have always used.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class Idea:
+    """An idea file in ``ideas/``."""
+
+    id: str
+    source: str
+    content: str
+    status: str
+    path: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"id": self.id, "source": self.source, "content": self.content, "status": self.status,
+                "path": self.path}
+
+
+@dataclass(frozen=True, slots=True)
+class Draft:
+    """A draft file in ``drafts/``; ``content`` is the body below the frontmatter.
+
+    ``content_hash`` identifies the whole file as read, when the reader
+    computed it (see ``src.planner.get_approved_drafts``).
+    """
+
+    path: str
+    idea_id: str
+    platform: str
+    status: str
+    created_at: str
+    content: str
+    workspace: Optional[str] = None
+    content_hash: Optional[str] = None
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {"filename": self.filename, "path": self.path, "idea_id": self.idea_id,
+                "platform": self.platform, "status": self.status, "created_at": self.created_at,
+                "content": self.content}
+        if self.workspace is not None:
+            data["workspace"] = self.workspace
+        if self.content_hash is not None:
+            data["content_hash"] = self.content_hash
+        return data
+
+
+_PLAN_ITEM_KEYS = ("draft", "platform", "scheduled_at", "account_id", "workspace", "shifted_from", "text",
+                   "draft_hash")
+
+
+@dataclass(frozen=True, slots=True)
+class PlanItem:
+    """One post in a schedule plan.
+
+    ``text`` is the post text rendered from the draft when the plan was
+    made and ``draft_hash`` the draft's ``content_hash`` at that time;
+    plans from before they were recorded have neither. ``extra`` carries
+    any other keys found in a plan file, so a loaded plan saves (and
+    hashes, see ``src.journal``) exactly as it was read.
+    """
+
+    draft: str
+    platform: str
+    scheduled_at: str
+    account_id: str
+    workspace: Optional[str] = None
+    shifted_from: Optional[str] = None
+    text: Optional[str] = None
+    draft_hash: Optional[str] = None
+    extra: Optional[Mapping[str, Any]] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PlanItem":
+        extra = {key: value for key, value in data.items() if key not in _PLAN_ITEM_KEYS}
+        return cls(
+            draft=data["draft"],
+            platform=data["platform"],
+            scheduled_at=data["scheduled_at"],
+            account_id=data["account_id"],
+            workspace=data.get("workspace"),
+            shifted_from=data.get("shifted_from"),
+            text=data.get("text"),
+            draft_hash=data.get("draft_hash"),
+            extra=extra or None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {"draft": self.draft, "platform": self.platform, "scheduled_at": self.scheduled_at,
+                "account_id": self.account_id}
+        if self.workspace is not None:
+            data["workspace"] = self.workspace
+        if self.shifted_from is not None:
+            data["shifted_from"] = self.shifted_from
+        if self.text is not None:
+            data["text"] = self.text
+        if self.draft_hash is not None:
+            data["draft_hash"] = self.draft_hash
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+def plan_items(plan: Mapping[str, Any]) -> list[PlanItem]:
+    """A plan's items as ``PlanItem``s, whether it was loaded from JSON or built in memory."""
+    return [item if isinstance(item, PlanItem) else PlanItem.from_dict(item) for item in plan.get("items", [])]
+
+
+def plan_to_dict(plan: Mapping[str, Any]) -> dict[str, Any]:
+    """A plan in its JSON shape."""
+    return {**plan, "items": [item.to_dict() for item in plan_items(plan)]}
+
+
+@dataclass(frozen=True, slots=True)
+class QueuedPost:
+    """A post scheduled in Publer, as read from the local queue mirror."""
+
+    id: str
+    platform: str
+    scheduled_at: Optional[str]
+    text: str
+    account_id: Optional[str] = None
+    workspace: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> "QueuedPost":
+        """From a raw Publer post or a ``SnapshotStore`` row."""
+        return cls(
+            id=str(row.get("id")),
+            platform=row.get("network") or row.get("provider") or row.get("platform") or "unknown",
+            scheduled_at=row.get("scheduled_at") or row.get("send_at"),
+            text=row.get("text") or row.get("content") or "",
+            account_id=row.get("account_id"),
+            workspace=row.get("workspace"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"id": self.id, "platform": self.platform, "scheduled_at": self.scheduled_at, "text": self.text,
+                "account_id": self.account_id, "workspace": self.workspace}
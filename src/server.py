@@ -0,0 +1,241 @@
+"""Long-running command server for social.py.
+
+``social.py serve`` keeps one process alive with warm caches (parsed
+draft/idea metadata, the Publer account registry and pooled HTTP
+connections) and accepts commands over a Unix socket. Regular CLI
+invocations try the socket first and fall back to running in-process
+when no server is listening.
+
+Protocol: the client sends one JSON line
+``{"argv": [...], "cwd": "...", "env": {...}}``. The server streams the
+command's output back as ``{"output": str}`` lines while it runs and ends
+with ``{"code": int}``. ``env`` holds the caller's Publer and engine
+settings (see ``_forwarded_env``); the server only runs commands whose
+working directory and settings match its own, and answers
+``{"code": null}`` otherwise so the caller runs the command in-process.
+
+Output is routed per command, not by swapping ``sys.stdout``: the server
+installs ``_RoutedStream`` proxies once, and only writes made in a
+command's context (including threads started through
+``src.workspaces.fan_out``, which copy it) reach that command's client.
+Background threads such as the reconciler or the metrics endpoint keep
+writing to the server's own terminal.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Optional, TextIO
+
+SOCKET_PATH = Path("state") / "social.sock"
+CONNECT_TIMEOUT = 0.2
+DISABLE_ENV = "SOCIAL_ENGINE_NO_SERVER"
+
+Handler = Callable[[list[str]], int]
+
+
+def _forwarded_env() -> dict[str, str]:
+    """Environment settings that change what a command does.
+
+    Publer credentials and workspaces (``PUBLER_*`` and per-workspace keys
+    such as ``BETA_PUBLER_API_KEY``) and ``SOCIAL_ENGINE_*`` options.
+    """
+    return {
+        name: value
+        for name, value in os.environ.items()
+        if ("PUBLER" in name or name.startswith("SOCIAL_ENGINE_")) and name != DISABLE_ENV
+    }
+
+
+def _send(sock: socket.socket, message: dict) -> None:
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+class _ReplyStream:
+    """Text stream sending output to a client as ``{"output": ...}`` lines, a line at a time."""
+
+    def __init__(self, wfile: Any) -> None:
+        self._wfile = wfile
+        self._lock = threading.Lock()
+        self._buffer = ""
+        self.closed = False
+
+    def _send(self, text: str) -> None:
+        if text and not self.closed:
+            try:
+                self._wfile.write(json.dumps({"output": text}).encode() + b"\n")
+                self._wfile.flush()
+            except OSError:
+                # The client went away; let the command finish regardless.
+                self.closed = True
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._buffer += text
+            end = self._buffer.rfind("\n") + 1
+            if end:
+                chunk, self._buffer = self._buffer[:end], self._buffer[end:]
+                self._send(chunk)
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            chunk, self._buffer = self._buffer, ""
+            self._send(chunk)
+
+
+_target: ContextVar[Optional[_ReplyStream]] = ContextVar("server_output", default=None)
+
+
+class _RoutedStream:
+    """``sys.stdout``/``sys.stderr`` stand-in writing to the current command's client, if any."""
+
+    def __init__(self, default: TextIO) -> None:
+        self._default = default
+
+    def write(self, text: str) -> int:
+        target = _target.get()
+        return (target or self._default).write(text)
+
+    def flush(self) -> None:
+        if _target.get() is None:
+            self._default.flush()
+
+    def isatty(self) -> bool:
+        return _target.get() is None and self._default.isatty()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._default, name)
+
+
+def _install_routing() -> None:
+    if not isinstance(sys.stdout, _RoutedStream):
+        sys.stdout = _RoutedStream(sys.stdout)  # type: ignore[assignment]
+    if not isinstance(sys.stderr, _RoutedStream):
+        sys.stderr = _RoutedStream(sys.stderr)  # type: ignore[assignment]
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """Run one command per connection, streaming its output to the client."""
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        request = json.loads(line)
+
+        # Relative paths (queue/plan.json, state/...) must resolve the same way
+        # they would for the calling CLI, and the command must use the caller's
+        # account, workspace and options (the warm clients and registries were
+        # built from the server's), so refuse work from other directories or
+        # with different settings.
+        if (os.path.realpath(request.get("cwd", "")) != os.path.realpath(os.getcwd())
+                or request.get("env") != _forwarded_env()):
+            self.wfile.write(json.dumps({"code": None}).encode() + b"\n")
+            return
+
+        stream = _ReplyStream(self.wfile)
+        token = _target.set(stream)
+        try:
+            code = self.server.handler(request.get("argv", []))  # type: ignore[attr-defined]
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            print(f"Error: {e}")
+            code = 1
+        finally:
+            _target.reset(token)
+            stream.flush()
+        if not stream.closed:
+            with contextlib.suppress(OSError):
+                self.wfile.write(json.dumps({"code": code or 0}).encode() + b"\n")
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    """Single-threaded Unix socket server dispatching CLI argv lists.
+
+    Commands run one at a time so captured stdout never interleaves.
+    """
+
+    def __init__(self, socket_path: Path, handler: Handler) -> None:
+        self.handler = handler
+        self.socket_path = socket_path
+        super().__init__(str(socket_path), _CommandHandler)
+
+
+def _raise_interrupt(signum: int, frame: object) -> None:
+    raise KeyboardInterrupt
+
+
+def serve(handler: Handler, socket_path: Path = SOCKET_PATH) -> None:
+    """Serve commands on ``socket_path`` until interrupted."""
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        if _is_listening(socket_path):
+            raise RuntimeError(f"A server is already listening on {socket_path}")
+        socket_path.unlink()
+
+    server = CommandServer(socket_path, handler)
+    _install_routing()
+    # Treat SIGTERM like Ctrl+C so the socket file is always removed.
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    print(f"✓ Serving on {socket_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+
+
+def _is_listening(socket_path: Path) -> bool:
+    with contextlib.suppress(OSError), socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(socket_path))
+        return True
+    return False
+
+
+def call_server(argv: list[str], socket_path: Path = SOCKET_PATH, out: Optional[TextIO] = None) -> Optional[int]:
+    """Run ``argv`` on a running server, writing its output to ``out`` (stdout) as it arrives.
+
+    Returns the exit code, or ``None`` when no usable server is available
+    and the caller should execute the command in-process.
+    """
+    if os.getenv(DISABLE_ENV) == "1" or not hasattr(socket, "AF_UNIX"):
+        return None
+    if not socket_path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+
+    out = out or sys.stdout
+    with sock:
+        # Commands such as apply can take a while; only the connect is bounded.
+        sock.settimeout(None)
+        _send(sock, {"argv": argv, "cwd": os.getcwd(), "env": _forwarded_env()})
+        for line in sock.makefile("rb"):
+            message = json.loads(line)
+            if "output" in message:
+                out.write(message["output"])
+                out.flush()
+            elif "code" in message:
+                return message["code"]
+    raise ConnectionError("Server closed the connection without a reply")
@@ -0,0 +1,219 @@
+"""Per-account best posting slots learned from stored insights.
+
+Every post with impressions contributes its engagement rate to its
+account's (weekday, hour) slot in the plan timezone, weighted by
+``exp(-age / tau)`` so recent posts count more (``half_life_days`` sets
+tau). The model keeps, per slot, the decayed sums ``value = Σ w·rate`` and
+``weight = Σ w`` as of ``as_of_hour``. Because every weight decays by the
+same factor as time passes, advancing the model just scales both sums, and
+only insights synced since the last update are folded in: a re-synced post
+has its previous contribution subtracted before the new one is added.
+
+Everything lives next to the insights in ``state/analytics.db``, keyed by
+timezone, so an update costs O(changed posts).
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from src.insights import InsightsStore
+from src.slots import SlotTemplate
+
+HALF_LIFE_DAYS = 30.0
+# Pseudo-posts pulling sparse slots towards the account's mean rate.
+PRIOR_WEIGHT = 2.0
+# Decayed posts a slot needs before it can replace a template slot.
+MIN_WEIGHT = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slot_model (
+    tz TEXT PRIMARY KEY,
+    half_life_days REAL NOT NULL,
+    as_of_hour INTEGER NOT NULL,
+    synced_through TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slot_scores (
+    tz TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    weekday INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    value REAL NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (tz, account_id, weekday, hour)
+);
+CREATE TABLE IF NOT EXISTS slot_contributions (
+    tz TEXT NOT NULL,
+    post_id TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    weekday INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    published_hour INTEGER NOT NULL,
+    rate REAL NOT NULL,
+    PRIMARY KEY (tz, post_id)
+);
+"""
+
+
+class SlotModel:
+    """Exponentially decayed engagement per account, weekday and hour."""
+
+    def __init__(self, store: InsightsStore, tz: str, half_life_days: float = HALF_LIFE_DAYS) -> None:
+        self._db = store.db
+        self._db.executescript(_SCHEMA)
+        self.tz = tz
+        self.half_life_days = half_life_days
+        self._zone = ZoneInfo(tz)
+        # decay constant per hour
+        self._lambda = math.log(2) / (half_life_days * 24)
+
+    def _decay(self, hours: float) -> float:
+        return math.exp(-self._lambda * hours)
+
+    def update(self, now: Optional[datetime] = None) -> int:
+        """Fold insights synced since the last update into the model.
+
+        Returns the number of posts (re)incorporated.
+        """
+        now = now or datetime.now(timezone.utc)
+        now_hour = int(now.timestamp()) // 3600
+        db = self._db
+
+        meta = db.execute(
+            "SELECT half_life_days, as_of_hour, synced_through FROM slot_model WHERE tz = ?", (self.tz,)
+        ).fetchone()
+        if meta and meta[0] != self.half_life_days:
+            with db:
+                for table in ("slot_model", "slot_scores", "slot_contributions"):
+                    db.execute(f"DELETE FROM {table} WHERE tz = ?", (self.tz,))
+            meta = None
+        synced_through = meta[2] if meta else ""
+
+        changed = db.execute(
+            "SELECT post_id, account_id, published_hour, impressions, engagements, synced_at "
+            "FROM insights WHERE synced_at > ? AND published_hour IS NOT NULL "
+            "AND published_hour <= ? AND impressions > 0",
+            (synced_through, now_hour),
+        ).fetchall()
+
+        with db:
+            if meta and meta[1] != now_hour:
+                factor = self._decay(now_hour - meta[1])
+                db.execute(
+                    "UPDATE slot_scores SET value = value * ?, weight = weight * ? WHERE tz = ?",
+                    (factor, factor, self.tz),
+                )
+
+            deltas: dict[tuple[str, int, int], list[float]] = {}
+            latest = synced_through
+            for post_id, account_id, published_hour, impressions, engagements, synced_at in changed:
+                latest = max(latest, synced_at)
+                previous = db.execute(
+                    "SELECT account_id, weekday, hour, published_hour, rate FROM slot_contributions "
+                    "WHERE tz = ? AND post_id = ?",
+                    (self.tz, post_id),
+                ).fetchone()
+                if previous:
+                    w = self._decay(now_hour - previous[3])
+                    sums = deltas.setdefault((previous[0], previous[1], previous[2]), [0.0, 0.0])
+                    sums[0] -= w * previous[4]
+                    sums[1] -= w
+
+                at = datetime.fromtimestamp(published_hour * 3600, self._zone)
+                rate = engagements / impressions
+                w = self._decay(now_hour - published_hour)
+                sums = deltas.setdefault((account_id, at.weekday(), at.hour), [0.0, 0.0])
+                sums[0] += w * rate
+                sums[1] += w
+                db.execute(
+                    "INSERT OR REPLACE INTO slot_contributions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self.tz, post_id, account_id, at.weekday(), at.hour, published_hour, rate),
+                )
+
+            db.executemany(
+                "INSERT INTO slot_scores VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (tz, account_id, weekday, hour) "
+                "DO UPDATE SET value = value + excluded.value, weight = weight + excluded.weight",
+                [(self.tz, account, day, hour, value, weight)
+                 for (account, day, hour), (value, weight) in deltas.items()],
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO slot_model VALUES (?, ?, ?, ?)",
+                (self.tz, self.half_life_days, now_hour, latest),
+            )
+        return len(changed)
+
+    def scores(self, account_id: str) -> dict[tuple[int, int], tuple[float, float]]:
+        """``(weekday, hour) -> (score, weight)``; score is the shrunk decayed mean rate."""
+        rows = self._db.execute(
+            "SELECT weekday, hour, value, weight FROM slot_scores WHERE tz = ? AND account_id = ?",
+            (self.tz, account_id),
+        ).fetchall()
+        total_value = sum(r[2] for r in rows)
+        total_weight = sum(r[3] for r in rows)
+        if total_weight <= 0:
+            return {}
+        mean = total_value / total_weight
+        return {
+            (day, hour): ((value + PRIOR_WEIGHT * mean) / (weight + PRIOR_WEIGHT), weight)
+            for day, hour, value, weight in rows
+            if weight > 0
+        }
+
+    def template_for(self, account_id: str, base: SlotTemplate) -> Optional[SlotTemplate]:
+        """``base`` with its weekly slots swapped for the account's best-scoring ones.
+
+        Keeps the same number of slots per week and ``max_per_day``; slots
+        with too little history are filled from ``base``. Returns None when
+        the account has no usable history.
+        """
+        ranked = sorted(
+            ((score, slot) for slot, (score, weight) in self.scores(account_id).items() if weight >= MIN_WEIGHT),
+            reverse=True,
+        )
+        if not ranked:
+            return None
+        wanted = len(base.weekly_slots())
+        pairs = [(day, f"{hour:02d}:00") for _, (day, hour) in ranked[:wanted]]
+        for slot in base.weekly_slots():
+            if len(pairs) >= wanted:
+                break
+            if slot not in pairs:
+                pairs.append(slot)
+        return SlotTemplate(
+            days=tuple(sorted({d for d, _ in pairs})),
+            times=tuple(sorted({t for _, t in pairs})),
+            max_per_day=base.max_per_day,
+            pairs=tuple(sorted(pairs)),
+        )
+
+
+def learned_templates(
+    accounts: dict[str, str],
+    templates: dict[str, SlotTemplate],
+    tz: str,
+    store: Optional[InsightsStore] = None,
+) -> dict[str, SlotTemplate]:
+    """Learned templates keyed by account ID, for accounts with enough history.
+
+    ``accounts`` maps account IDs to platforms; ``templates`` are the
+    per-platform templates the learned ones start from.
+    """
+    own_store = store is None
+    store = store or InsightsStore()
+    try:
+        model = SlotModel(store, tz)
+        model.update()
+        learned = {}
+        for account_id, platform in accounts.items():
+            base = templates.get(platform)
+            template = model.template_for(account_id, base) if base else None
+            if template:
+                learned[account_id] = template
+        return learned
+    finally:
+        if own_store:
+            store.close()
@@ -0,0 +1,212 @@
+"""Slot-based scheduling for plans.
+
+Each platform has a ``SlotTemplate`` describing when it may post (days of
+the week, times of day, a per-day cap). Drafts are assigned to the earliest
+free slot of their own account, skipping slots that are already taken by
+posts in the Publer snapshot. A heap keyed on each account's next free slot
+interleaves the accounts in time order, so planning costs
+O(slots scanned + n log accounts).
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta, tzinfo
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from src.publer.accounts import normalize_platform
+from src.records import PlanItem
+
+SLOTS_CONFIG = Path(__file__).parent.parent / "config" / "slots.json"
+
+# Upper bound on how far ahead a lane may search for a free slot.
+MAX_HORIZON_DAYS = 3660
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+@dataclass(frozen=True)
+class SlotTemplate:
+    """When a platform may post.
+
+    ``days`` are weekday numbers (0 = Monday), ``times`` are "HH:MM" in the
+    plan's timezone, and ``max_per_day`` caps posts per account per day,
+    counting posts already queued in Publer. ``pairs`` lists explicit
+    ``(weekday, "HH:MM")`` slots instead of every day × time combination
+    (used by learned templates).
+    """
+
+    days: tuple[int, ...]
+    times: tuple[str, ...]
+    max_per_day: int = 1
+    pairs: tuple[tuple[int, str], ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SlotTemplate":
+        days = tuple(
+            WEEKDAYS.index(d[:3].lower()) if isinstance(d, str) else int(d)
+            for d in data.get("days", range(7))
+        )
+        times = tuple(sorted(data.get("times", ["09:00"])))
+        return cls(days=tuple(sorted(set(days))), times=times,
+                   max_per_day=int(data.get("max_per_day", len(times))))
+
+    def parsed_times(self) -> list[time]:
+        return [datetime.strptime(t, "%H:%M").time() for t in self.times]
+
+    def weekly_slots(self) -> list[tuple[int, str]]:
+        """Every ``(weekday, "HH:MM")`` slot in the week."""
+        if self.pairs:
+            return sorted(self.pairs)
+        return [(d, t) for d in self.days for t in self.times]
+
+    def times_on(self, weekday: int) -> list[time]:
+        """Posting times on ``weekday``, earliest first."""
+        if self.pairs:
+            return sorted(datetime.strptime(t, "%H:%M").time() for d, t in self.pairs if d == weekday)
+        return self.parsed_times() if weekday in self.days else []
+
+
+DEFAULT_TEMPLATES: dict[str, SlotTemplate] = {
+    "linkedin": SlotTemplate(days=(0, 1, 2, 3, 4), times=("09:00",), max_per_day=1),
+    "twitter": SlotTemplate(days=(0, 1, 2, 3, 4, 5, 6), times=("09:00", "13:00", "17:00"), max_per_day=2),
+}
+
+
+def load_templates(path: Optional[Path] = None) -> dict[str, SlotTemplate]:
+    """Load per-platform slot templates, falling back to the defaults.
+
+    The file maps platform names to ``{"days": [...], "times": [...],
+    "max_per_day": n}``; platforms it does not mention keep their default.
+    """
+    path = path or SLOTS_CONFIG
+    templates = dict(DEFAULT_TEMPLATES)
+    if path.exists():
+        for platform, data in json.loads(path.read_text()).items():
+            templates[normalize_platform(platform)] = SlotTemplate.from_dict(data)
+    return templates
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO timestamp, accepting a trailing ``Z``."""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _minute(dt: datetime) -> int:
+    return int(dt.timestamp()) // 60
+
+
+def post_account_id(post: dict[str, Any]) -> Optional[str]:
+    """Account ID of a raw Publer post, whichever shape it comes in."""
+    account = post.get("account_id") or post.get("account")
+    if isinstance(account, dict):
+        account = account.get("id")
+    return account
+
+
+class BlockedSlots:
+    """Minutes and per-day counts already used by queued posts, per account."""
+
+    def __init__(self, tz: tzinfo) -> None:
+        self._tz = tz
+        self._minutes: dict[str, set[int]] = {}
+        self._per_day: Counter[tuple[str, date]] = Counter()
+
+    @classmethod
+    def from_posts(cls, posts: Iterable[dict[str, Any]], tz: tzinfo) -> "BlockedSlots":
+        """Build from raw Publer posts (e.g. the snapshot's ``posts``)."""
+        blocked = cls(tz)
+        for post in posts:
+            scheduled = post.get("scheduled_at") or post.get("send_at")
+            account = post_account_id(post)
+            if not scheduled or not account:
+                continue
+            try:
+                blocked.add(account, parse_datetime(scheduled))
+            except ValueError:
+                continue
+        return blocked
+
+    def add(self, account_id: str, dt: datetime) -> None:
+        self._minutes.setdefault(account_id, set()).add(_minute(dt))
+        self._per_day[(account_id, dt.astimezone(self._tz).date())] += 1
+
+    def is_taken(self, account_id: str, dt: datetime) -> bool:
+        return _minute(dt) in self._minutes.get(account_id, ())
+
+    def used_on(self, account_id: str, day: date) -> int:
+        return self._per_day[(account_id, day)]
+
+
+def _lane_slots(
+    template: SlotTemplate,
+    account_id: str,
+    start: datetime,
+    blocked: BlockedSlots,
+) -> Iterator[datetime]:
+    """Yield free slots for one account in time order, updating ``blocked``."""
+    times_by_day = [template.times_on(weekday) for weekday in range(7)]
+    if not any(times_by_day) or template.max_per_day < 1:
+        raise ValueError(f"Slot template has no usable slots: {template}")
+
+    tz = start.tzinfo
+    day = start.date()
+    for _ in range(MAX_HORIZON_DAYS):
+        for t in times_by_day[day.weekday()]:
+            if blocked.used_on(account_id, day) >= template.max_per_day:
+                break
+            slot = datetime.combine(day, t, tzinfo=tz)
+            if slot < start or blocked.is_taken(account_id, slot):
+                continue
+            blocked.add(account_id, slot)
+            yield slot
+        day += timedelta(days=1)
+    raise ValueError(f"No free slot within {MAX_HORIZON_DAYS} days for account {account_id}")
+
+
+def fill_slots(
+    items: list[PlanItem],
+    templates: dict[str, SlotTemplate],
+    start: datetime,
+    blocked: BlockedSlots,
+) -> list[PlanItem]:
+    """Assign each item the earliest free slot of its account.
+
+    ``items`` are plan items with ``platform`` and ``account_id``; they keep
+    their relative order within an account. ``templates`` is keyed by
+    platform; an entry keyed by account ID takes precedence for that
+    account. Returns new items with ``scheduled_at`` set, ordered by
+    scheduled time.
+    """
+    lanes: dict[str, list[PlanItem]] = {}
+    for item in items:
+        lanes.setdefault(item.account_id, []).append(item)
+
+    heap: list[tuple[datetime, int, str]] = []
+    generators: dict[str, Iterator[datetime]] = {}
+    positions: dict[str, int] = {}
+    for seq, (account_id, lane_items) in enumerate(lanes.items()):
+        platform = lane_items[0].platform
+        template = templates.get(account_id) or templates.get(platform)
+        if template is None:
+            raise ValueError(f"No slot template for platform '{platform}'")
+        generators[account_id] = _lane_slots(template, account_id, start, blocked)
+        positions[account_id] = 0
+        heapq.heappush(heap, (next(generators[account_id]), seq, account_id))
+
+    planned = []
+    while heap:
+        slot, seq, account_id = heapq.heappop(heap)
+        lane_items = lanes[account_id]
+        planned.append(replace(lane_items[positions[account_id]], scheduled_at=slot.isoformat()))
+        positions[account_id] += 1
+        if positions[account_id] < len(lane_items):
+            heapq.heappush(heap, (next(generators[account_id]), seq, account_id))
+
+    return planned
@@ -0,0 +1,377 @@
+"""Indexed local mirror of the Publer queue.
+
+``queue sync`` stores the scheduled posts in ``state/snapshot.db`` (SQLite)
+instead of one pretty-printed JSON file. Only the fields the pipeline uses
+are kept (id, account, network, state, scheduled time, text), and posts are
+indexed by account, platform and scheduled minute, so planning and checks
+read just the accounts and time range they care about rather than parsing
+the whole queue.
+
+Posts come back as plain dicts in the raw Publer shape (``id``,
+``account_id``, ``network``, ``scheduled_at``...), so code written against
+the old JSON snapshot keeps working. Each workspace's sync replaces that
+workspace's posts in one transaction; readers see either the old queue or
+the new one.
+
+The mirror is kept current without refetching: our own schedule, cancel
+and reschedule calls update it in place (``upsert``, ``remove``, ``move``).
+``queue sync`` then reconciles it against Publer, writing only the rows
+that differ, and reports drift: posts created, deleted or edited outside
+the engine (in the Publer UI, say). Posts whose time has passed simply
+leave the queue and are not reported, and posts we scheduled since the last
+sync are kept even if Publer does not list them yet: only a later sync that
+still misses them removes them.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from src.publer.accounts import normalize_platform
+from src.slots import parse_datetime, post_account_id
+from src.state import STATE_DIR
+from src.workspaces import DEFAULT_WORKSPACE
+
+SNAPSHOT_DB = STATE_DIR / "snapshot.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    workspace TEXT NOT NULL,
+    account_id TEXT,
+    platform TEXT,
+    network TEXT,
+    state TEXT,
+    scheduled_at TEXT,
+    scheduled_minute INTEGER,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS posts_account_time ON posts (account_id, scheduled_minute);
+CREATE INDEX IF NOT EXISTS posts_platform_time ON posts (platform, scheduled_minute);
+CREATE INDEX IF NOT EXISTS posts_time ON posts (scheduled_minute);
+CREATE INDEX IF NOT EXISTS posts_workspace ON posts (workspace);
+CREATE TABLE IF NOT EXISTS unconfirmed (
+    id TEXT PRIMARY KEY,
+    workspace TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_FIELDS = ("id", "workspace", "account_id", "platform", "network", "state", "scheduled_at", "text")
+_INSERT = (
+    f"INSERT OR REPLACE INTO posts (id, workspace, account_id, platform, network, state, scheduled_at, "
+    f"scheduled_minute, text) VALUES ({', '.join('?' * 9)})"
+)
+# Fields compared when reconciling; a difference there is drift.
+_TRACKED = {"account_id": 2, "scheduled_minute": 7, "text": 8}
+
+
+@dataclass(frozen=True)
+class Drift:
+    """How Publer's queue differed from the mirror at a reconcile."""
+
+    added: list[dict[str, Any]] = field(default_factory=list)
+    removed: list[dict[str, Any]] = field(default_factory=list)
+    changed: list[dict[str, Any]] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "added": [post["id"] for post in self.added],
+            "removed": [post["id"] for post in self.removed],
+            "changed": {change["id"]: change["fields"] for change in self.changed},
+        }
+
+
+def _minute(value: Any) -> Optional[int]:
+    if isinstance(value, datetime):
+        return int(value.timestamp()) // 60
+    if not value:
+        return None
+    try:
+        return int(parse_datetime(str(value)).timestamp()) // 60
+    except ValueError:
+        return None
+
+
+def _row(post: dict[str, Any], workspace: str) -> Optional[tuple[Any, ...]]:
+    post_id = post.get("id")
+    if not post_id:
+        return None
+    network = post.get("network") or post.get("provider")
+    platform = post.get("_platform") or post.get("platform") or network
+    scheduled_at = post.get("scheduled_at") or post.get("send_at")
+    return (
+        str(post_id),
+        workspace,
+        post_account_id(post),
+        normalize_platform(platform) if platform else None,
+        network,
+        post.get("state"),
+        scheduled_at,
+        _minute(scheduled_at),
+        post.get("text", post.get("content", "")),
+    )
+
+
+class SnapshotStore:
+    """SQLite-backed copy of the scheduled Publer queue."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or SNAPSHOT_DB
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(posts)")}
+        if columns and "workspace" not in columns:
+            # Pre-workspace cache: drop it, the next sync refills it.
+            self._db.executescript("DROP TABLE posts; DROP TABLE IF EXISTS meta;")
+        self._db.executescript(_SCHEMA)
+        self._import_json()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _import_json(self) -> None:
+        legacy = self.path.parent / "publer_snapshot.json"
+        if not legacy.exists():
+            return
+        try:
+            data = json.loads(legacy.read_text())
+        except (json.JSONDecodeError, OSError):
+            data = {}
+        if data.get("posts") and self.synced_at() is None:
+            self.replace(data["posts"], data.get("counts"), data.get("synced_at") or data.get("fetched_at"),
+                         workspace=DEFAULT_WORKSPACE)
+        legacy.rename(legacy.with_name("publer_snapshot.json.migrated"))
+
+    def replace(
+        self,
+        posts: Iterable[dict[str, Any]],
+        counts: Optional[dict[str, int]] = None,
+        synced_at: Optional[str] = None,
+        workspace: str = DEFAULT_WORKSPACE,
+    ) -> int:
+        """Replace ``workspace``'s snapshot with ``posts`` (raw Publer posts)."""
+        rows = [row for row in (_row(post, workspace) for post in posts) if row]
+        synced_at = synced_at or datetime.now(timezone.utc).isoformat()
+        with self._db:
+            self._db.execute("DELETE FROM posts WHERE workspace = ?", (workspace,))
+            self._db.execute("DELETE FROM unconfirmed WHERE workspace = ?", (workspace,))
+            self._db.executemany(_INSERT, rows)
+            self._set_synced(workspace, counts, synced_at)
+        return len(rows)
+
+    def _set_synced(self, workspace: str, counts: Optional[dict[str, int]], synced_at: str) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            [(f"synced_at:{workspace}", synced_at), (f"counts:{workspace}", json.dumps(counts or {}))],
+        )
+
+    def upsert(self, posts: Iterable[dict[str, Any]], workspace: str = DEFAULT_WORKSPACE) -> int:
+        """Add or update posts (raw Publer shape) we just scheduled.
+
+        They stay unconfirmed until the next ``reconcile``, which keeps them
+        even if Publer's listing does not show them yet.
+        """
+        rows = [row for row in (_row(post, workspace) for post in posts) if row]
+        with self._db:
+            self._db.executemany(_INSERT, rows)
+            self._db.executemany("INSERT OR IGNORE INTO unconfirmed VALUES (?, ?)", [row[:2] for row in rows])
+        return len(rows)
+
+    def remove(self, post_ids: Iterable[str]) -> None:
+        """Drop posts we just cancelled."""
+        ids = [(str(post_id),) for post_id in post_ids]
+        with self._db:
+            self._db.executemany("DELETE FROM posts WHERE id = ?", ids)
+            self._db.executemany("DELETE FROM unconfirmed WHERE id = ?", ids)
+
+    def move(self, moves: Iterable[tuple[str, str]]) -> None:
+        """Apply ``(post_id, new_time)`` reschedules we just made."""
+        with self._db:
+            self._db.executemany(
+                "UPDATE posts SET scheduled_at = ?, scheduled_minute = ? WHERE id = ?",
+                [(when, _minute(when), str(post_id)) for post_id, when in moves],
+            )
+
+    def reconcile(
+        self,
+        posts: Iterable[dict[str, Any]],
+        counts: Optional[dict[str, int]] = None,
+        synced_at: Optional[str] = None,
+        workspace: str = DEFAULT_WORKSPACE,
+        platforms: Optional[Iterable[str]] = None,
+        expected: Iterable[str] = (),
+        partial: bool = False,
+    ) -> Drift:
+        """Bring ``workspace``'s mirror in line with Publer's scheduled ``posts``.
+
+        Only rows that differ are written. ``platforms`` limits the diff to
+        the platforms that were actually fetched; ``expected`` holds ids of
+        posts the engine created itself, which are added without counting
+        as drift. Posts ``upsert`` added since the previous reconcile are not
+        removed (nor reported) when missing from ``posts``, since Publer may
+        not list them yet; the next reconcile removes them if they are still
+        missing; only marks of posts on the reconciled ``platforms`` are
+        cleared. ``partial`` says some fetch failed: ``counts`` are stored but
+        the workspace's sync time is left as it was. A workspace's first
+        reconcile is the baseline and reports none. The drift is also stored
+        for ``last_drift``.
+        """
+        baseline = self.synced_at(workspace) is None
+        synced_at = synced_at or datetime.now(timezone.utc).isoformat()
+        remote = {row[0]: row for row in (_row(post, workspace) for post in posts) if row}
+        expected = set(expected)
+        scope = [normalize_platform(p) for p in platforms] if platforms is not None else None
+        clauses, params = ["workspace = ?"], [workspace]
+        if scope is not None:
+            clauses.append(f"platform IN ({', '.join('?' * len(scope))})")
+            params.extend(scope)
+        local = {
+            row[0]: row
+            for row in self._db.execute(
+                f"SELECT id, workspace, account_id, platform, network, state, scheduled_at, scheduled_minute, text "
+                f"FROM posts WHERE {' AND '.join(clauses)}",
+                params,
+            )
+        }
+
+        # Only posts on the reconciled platforms (those in ``local``) can be confirmed.
+        unconfirmed = {
+            row[0] for row in self._db.execute("SELECT id FROM unconfirmed WHERE workspace = ?", (workspace,))
+            if row[0] in local
+        }
+
+        now = _minute(datetime.now(timezone.utc))
+        added, removed, changed, writes = [], [], [], []
+        for post_id, row in remote.items():
+            mirrored = local.get(post_id)
+            if mirrored is None:
+                writes.append(row)
+                if post_id not in expected:
+                    added.append(self._post(row))
+                continue
+            fields = [
+                name for name, index in _TRACKED.items()
+                if mirrored[index] is not None and mirrored[index] != row[index]
+            ]
+            if fields:
+                changed.append({"id": post_id, "fields": fields, "before": self._post(mirrored),
+                                "after": self._post(row)})
+            if mirrored != row:
+                writes.append(row)
+        gone = [row for post_id, row in local.items() if post_id not in remote and post_id not in unconfirmed]
+        # Posts due by now were published, not deleted.
+        removed = [self._post(row) for row in gone if row[7] is None or row[7] > now]
+
+        drift = Drift() if baseline else Drift(added, removed, changed)
+        with self._db:
+            self._db.executemany("DELETE FROM posts WHERE id = ?", [(row[0],) for row in gone])
+            self._db.executemany(_INSERT, writes)
+            # Upserts made while this sync ran stay unconfirmed for the next one.
+            self._db.executemany("DELETE FROM unconfirmed WHERE id = ?", [(post_id,) for post_id in unconfirmed])
+            if partial:
+                self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                 (f"counts:{workspace}", json.dumps(counts or {})))
+            else:
+                self._set_synced(workspace, counts, synced_at)
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                (f"drift:{workspace}", json.dumps({"at": synced_at, **drift.summary()})),
+            )
+        return drift
+
+    @staticmethod
+    def _post(row: tuple[Any, ...]) -> dict[str, Any]:
+        return dict(zip(_FIELDS, row[:7] + row[8:]))
+
+    def last_drift(self, workspace: str = DEFAULT_WORKSPACE) -> Optional[dict[str, Any]]:
+        """Drift found by ``workspace``'s last reconcile (ids only), if any ran."""
+        value = self._meta("drift").get(workspace)
+        return json.loads(value) if value else None
+
+    def _meta(self, prefix: str) -> dict[str, str]:
+        rows = self._db.execute("SELECT key, value FROM meta WHERE key LIKE ?", (f"{prefix}:%",))
+        return {key.split(":", 1)[1]: value for key, value in rows}
+
+    def workspaces(self) -> list[str]:
+        """Workspaces with a stored snapshot."""
+        return sorted(self._meta("synced_at"))
+
+    def synced_at(self, workspace: Optional[str] = None) -> Optional[str]:
+        """When ``workspace`` was last synced (the oldest workspace's sync if omitted)."""
+        synced = self._meta("synced_at")
+        if workspace is not None:
+            return synced.get(workspace)
+        return min(synced.values()) if synced else None
+
+    def counts(self, workspace: Optional[str] = None) -> dict[str, int]:
+        """Posts per platform at the last sync, for one workspace or summed over all."""
+        totals: dict[str, int] = {}
+        for name, value in self._meta("counts").items():
+            if workspace is None or name == workspace:
+                for platform, count in json.loads(value).items():
+                    totals[platform] = totals.get(platform, 0) + count
+        return totals
+
+    def posts(
+        self,
+        platform: Optional[str] = None,
+        account_ids: Optional[Iterable[str]] = None,
+        start: Any = None,
+        end: Any = None,
+        workspace: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """Snapshot posts, filtered by platform, accounts, scheduled time and workspace.
+
+        ``start``/``end`` are datetimes or ISO strings (``end`` exclusive).
+        Posts come back in scheduled order.
+        """
+        clauses, params = [], []
+        if workspace is not None:
+            clauses.append("workspace = ?")
+            params.append(workspace)
+        if platform:
+            clauses.append("platform = ?")
+            params.append(normalize_platform(platform))
+        if account_ids is not None:
+            ids = list(account_ids)
+            clauses.append(f"account_id IN ({', '.join('?' * len(ids))})")
+            params.extend(ids)
+        if start is not None:
+            clauses.append("scheduled_minute >= ?")
+            params.append(_minute(start))
+        if end is not None:
+            clauses.append("scheduled_minute < ?")
+            params.append(_minute(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._db.execute(
+            f"SELECT {', '.join(_FIELDS)} FROM posts {where} ORDER BY scheduled_minute", params
+        )
+        return [dict(zip(_FIELDS, row)) for row in rows]
+
+    def get(self, post_id: str) -> Optional[dict[str, Any]]:
+        row = self._db.execute(
+            f"SELECT {', '.join(_FIELDS)} FROM posts WHERE id = ?", (str(post_id),)
+        ).fetchone()
+        return dict(zip(_FIELDS, row)) if row else None
+
+    def count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
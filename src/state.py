@@ -2,18 +2,23 @@
 
 Manages:
 - state/events.jsonl: Append-only event log
-- state/local_index.json: draft → publer_post_id mapping
-- state/publer_snapshot.json: Cached queue from Publer
+- state/links.db: idea → draft → job → publer_post_id links (see src.linkage)
+- state/snapshot.db: Cached queue from Publer (see src.snapshot)
 """
 
 import json
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+from src.statefile import append_line
 
 STATE_DIR = Path(__file__).parent.parent / "state"
 
+# Callbacks notified of every event (see add_listener)
+_listeners: list[Callable[["Event"], None]] = []
+
 
 @dataclass
 class Event:
@@ -43,55 +48,63 @@ def _ensure_state_dir() -> None:
     STATE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def add_listener(listener: Callable[[Event], None]) -> None:
+    """Call ``listener`` with every event logged or emitted in this process."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[Event], None]) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def emit(event_type: str, data: dict) -> Event:
+    """Notify listeners of an event without writing it to the log.
+
+    Used for high-volume events (e.g. individual API requests) that feed
+    metrics but don't belong in events.jsonl.
+    """
+    event = Event.create(event_type, data)
+    for listener in list(_listeners):
+        listener(event)
+    return event
+
+
 def log_event(event_type: str, data: dict) -> Event:
     """Append an event to events.jsonl."""
     _ensure_state_dir()
     event = Event.create(event_type, data)
-    events_file = STATE_DIR / "events.jsonl"
-    with open(events_file, "a") as f:
-        f.write(json.dumps(asdict(event)) + "\n")
+    append_line(STATE_DIR / "events.jsonl", json.dumps(asdict(event)))
+    for listener in list(_listeners):
+        listener(event)
     return event
 
 
 def get_local_index() -> dict[str, str]:
-    """Get the draft → publer_post_id mapping."""
-    _ensure_state_dir()
-    index_file = STATE_DIR / "local_index.json"
-    if not index_file.exists():
-        return {}
-    with open(index_file) as f:
-        return json.load(f)
+    """Get the draft → publer_post_id mapping (from the link store)."""
+    from src.linkage import LinkStore
 
-
-def update_local_index(draft_id: str, publer_post_id: str) -> None:
-    """Update the local index with a new mapping."""
-    _ensure_state_dir()
-    index = get_local_index()
-    index[draft_id] = publer_post_id
-    index_file = STATE_DIR / "local_index.json"
-    with open(index_file, "w") as f:
-        json.dump(index, f, indent=2)
-    log_event("index_updated", {"draft_id": draft_id, "publer_post_id": publer_post_id})
+    with LinkStore() as links:
+        return links.draft_posts()
 
 
 def get_snapshot() -> dict:
-    """Get the cached Publer queue snapshot."""
-    _ensure_state_dir()
-    snapshot_file = STATE_DIR / "publer_snapshot.json"
-    if not snapshot_file.exists():
-        return {"posts": [], "fetched_at": None}
-    with open(snapshot_file) as f:
-        return json.load(f)
+    """Get the whole cached Publer queue snapshot.
+
+    Prefer ``src.snapshot.SnapshotStore.posts`` with filters, which reads
+    only the matching rows.
+    """
+    from src.snapshot import SnapshotStore
+
+    with SnapshotStore() as store:
+        return {"posts": store.posts(), "synced_at": store.synced_at(), "counts": store.counts()}
 
 
 def save_snapshot(posts: list[dict]) -> None:
     """Save a new Publer queue snapshot."""
-    _ensure_state_dir()
-    snapshot = {
-        "posts": posts,
-        "fetched_at": datetime.utcnow().isoformat() + "Z",
-    }
-    snapshot_file = STATE_DIR / "publer_snapshot.json"
-    with open(snapshot_file, "w") as f:
-        json.dump(snapshot, f, indent=2)
+    from src.snapshot import SnapshotStore
+
+    with SnapshotStore() as store:
+        store.replace(posts)
     log_event("snapshot_saved", {"post_count": len(posts)})
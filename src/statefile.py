@@ -0,0 +1,115 @@
+"""Crash-safe writes and advisory locking for state files.
+
+Whole-file writes go to a temp file in the same directory, are fsynced and
+then renamed over the target, so a reader (or the next run after a crash)
+sees either the old contents or the new ones, never a truncated file.
+Readers therefore take no locks and never wait on writers.
+
+Read-modify-write updates (event arrays, pending jobs) and appends hold an
+exclusive ``flock`` on a ``.<name>.lock`` file next to the target, so two
+processes updating the same file (a cron ``queue sync`` and a manual
+``apply``) serialize instead of losing each other's changes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path: Path, data: Union[str, bytes]) -> None:
+    """Replace ``path`` with ``data`` via temp file + fsync + rename."""
+    write_chunks_atomic(path, [data])
+
+
+def write_chunks_atomic(path: Path, chunks: Iterable[Union[str, bytes]]) -> None:
+    """Like ``write_atomic``, but streams ``chunks`` to the temp file as they are produced."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk.encode() if isinstance(chunk, str) else chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def write_json(path: Path, data: Any, indent: Union[int, None] = 2) -> None:
+    """Atomically write ``data`` as JSON."""
+    write_atomic(path, json.dumps(data, indent=indent))
+
+
+def read_json(path: Path, default: Any = None) -> Any:
+    """Read JSON without locking; ``default`` if missing or unreadable."""
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+@contextmanager
+def locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock for updating ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = path.with_name(f".{path.name}.lock")
+    with open(lock_path, "a") as lock:
+        if fcntl:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def update_json(path: Path, default: Any, update: Callable[[Any], Any], indent: Union[int, None] = 2) -> Any:
+    """Read, transform and atomically rewrite a JSON file under its lock.
+
+    ``update`` receives the current contents (``default`` if the file is
+    missing or corrupt) and returns the new contents, which are also
+    returned.
+    """
+    with locked(path):
+        data = update(read_json(path, default))
+        write_json(path, data, indent=indent)
+    return data
+
+
+def append_line(path: Path, line: str, sync: bool = False) -> None:
+    """Append one line (or several joined by newlines) under the file's lock, as a single write."""
+    with locked(path):
+        with open(path, "a") as f:
+            f.write(line.rstrip("\n") + "\n")
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
@@ -0,0 +1,192 @@
+"""Lightweight timing spans for profiling CLI commands.
+
+Tracing is off by default; ``span()`` then returns a shared no-op object, so
+instrumented code pays one global check per call. When enabled, spans record
+wall time and attributes, and track their children's time per thread so a
+profile can report self time per phase (parse, scan, http, jobs...) that
+adds up to the command's wall time.
+
+    with span("GET /posts", "http", method="GET") as s:
+        ...
+        s.set(status=200, bytes=1234)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+_enabled = False
+_spans: list["Span"] = []
+_lock = threading.Lock()
+# Open spans, per thread and per asyncio task (each task gets its own copy).
+_stack: ContextVar[tuple["Span", ...]] = ContextVar("spans", default=())
+_origin = time.perf_counter()
+
+
+@dataclass
+class Span:
+    """One timed operation."""
+
+    name: str
+    category: str
+    attrs: dict[str, Any] = field(default_factory=dict)
+    start: float = 0.0
+    end: float = 0.0
+    child_time: float = 0.0
+    thread_id: int = 0
+    _parent: tuple["Span", ...] = field(default=(), repr=False, compare=False)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def self_time(self) -> float:
+        return self.duration - self.child_time
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self._parent = _stack.get()
+        _stack.set(self._parent + (self,))
+        self.thread_id = threading.get_ident()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _stack.set(self._parent)
+        # A copied context can carry another thread's span; only same-thread
+        # nesting counts towards self time.
+        if self._parent and self._parent[-1].thread_id == self.thread_id:
+            self._parent[-1].child_time += self.duration
+        with _lock:
+            _spans.append(self)
+
+
+class _NullSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, category: str = "app", **attrs: Any) -> Any:
+    """Time a block of code; free when tracing is disabled."""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, category, attrs)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    """Start recording spans, discarding any recorded before."""
+    global _enabled
+    reset()
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def reset() -> None:
+    with _lock:
+        _spans.clear()
+
+
+def spans() -> list[Span]:
+    with _lock:
+        return list(_spans)
+
+
+def phase_breakdown(wall: float) -> list[tuple[str, int, float]]:
+    """Self time per category as ``(category, span_count, seconds)``.
+
+    Main-thread rows plus ``other`` (time outside any span) add up to
+    ``wall``. Spans from worker threads overlap the main thread, so they're
+    reported as separate ``<category> (threads)`` rows.
+    """
+    main = threading.main_thread().ident
+    counts: dict[str, int] = defaultdict(int)
+    seconds: dict[str, float] = defaultdict(float)
+    covered = 0.0
+    for s in spans():
+        key = s.category
+        if s.thread_id == main:
+            covered += s.self_time
+        else:
+            key += " (threads)"
+        counts[key] += 1
+        seconds[key] += s.self_time
+    rows = sorted(((c, counts[c], seconds[c]) for c in counts), key=lambda r: -r[2])
+    rows.append(("other", 0, max(wall - covered, 0.0)))
+    return rows
+
+
+def format_profile(wall: float, top: int = 8) -> str:
+    """Human-readable per-phase breakdown plus the slowest span names."""
+    lines = ["", f"=== Profile ({wall * 1000:.1f} ms) ===", "", "Phase                  Spans    Self ms      %"]
+    for category, count, secs in phase_breakdown(wall):
+        share = secs / wall * 100 if wall else 0.0
+        lines.append(f"  {category:20} {count:>5} {secs * 1000:>10.1f} {share:>6.1f}")
+
+    by_name: dict[tuple[str, str], list[float]] = defaultdict(list)
+    for s in spans():
+        by_name[(s.category, s.name)].append(s.duration)
+    slowest = sorted(by_name.items(), key=lambda kv: -sum(kv[1]))[:top]
+    if slowest:
+        lines += ["", "Top spans (total ms, calls)"]
+        for (category, name), durations in slowest:
+            lines.append(f"  [{category}] {name}: {sum(durations) * 1000:.1f} ms × {len(durations)}")
+    return "\n".join(lines)
+
+
+def write_chrome_trace(path: Path) -> None:
+    """Write recorded spans in Chrome trace-event format (chrome://tracing, Perfetto)."""
+    pid = os.getpid()
+    events = [
+        {
+            "name": s.name,
+            "cat": s.category,
+            "ph": "X",
+            "ts": (s.start - _origin) * 1e6,
+            "dur": s.duration * 1e6,
+            "pid": pid,
+            "tid": s.thread_id,
+            "args": {k: v if isinstance(v, (int, float, str, bool)) or v is None else str(v)
+                     for k, v in s.attrs.items()},
+        }
+        for s in spans()
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+
+def current_span() -> Optional[Span]:
+    stack = _stack.get()
+    return stack[-1] if stack else None
@@ -0,0 +1,169 @@
+"""Publer workspaces managed by the engine.
+
+Workspaces are read from ``config/workspaces.json``::
+
+    {
+      "acme":  {"id": "5f2a9c...", "requests_per_second": 2},
+      "beta":  {"id": "6a01c3...", "api_key_env": "BETA_PUBLER_API_KEY"}
+    }
+
+or, without that file, from ``PUBLER_WORKSPACE_ID`` (comma-separated ids or
+``name=id`` pairs). With neither, there is one workspace, ``default``, that
+sends no workspace header, so Publer uses the API key's default workspace.
+
+Each workspace has its own client (connection pool and rate limiter) and
+account registry. Commands run once per selected workspace with
+``fan_out``; code that talks to Publer finds the workspace it is running for
+with ``current()``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+from dotenv import load_dotenv
+
+from src.publer.accounts import AccountRegistry, shared_registry
+from src.publer.client import PublerClient, PublerClientConfig, base_url_from_env, shared_client
+
+PROJECT_ROOT = Path(__file__).parent.parent
+WORKSPACES_CONFIG = PROJECT_ROOT / "config" / "workspaces.json"
+DEFAULT_WORKSPACE = "default"
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+
+load_dotenv(PROJECT_ROOT / "config" / ".env")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Workspace:
+    """One Publer workspace and how to reach it."""
+
+    name: str
+    id: Optional[str] = None
+    api_key_env: str = "PUBLER_API_KEY"
+    requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND
+
+    def client_config(self) -> PublerClientConfig:
+        return PublerClientConfig(
+            api_key=os.getenv(self.api_key_env, ""),
+            workspace_id=self.id,
+            base_url=base_url_from_env(),
+            requests_per_second=self.requests_per_second,
+        )
+
+    def client(self) -> PublerClient:
+        """The process-wide client for this workspace."""
+        return shared_client(self.client_config())
+
+    def registry(self) -> AccountRegistry:
+        """The process-wide account registry for this workspace."""
+        return shared_registry(self.client())
+
+
+def load_workspaces(path: Optional[Path] = None) -> list[Workspace]:
+    """Configured workspaces, in config order."""
+    path = path or WORKSPACES_CONFIG
+    if path.exists():
+        return [
+            Workspace(
+                name=name,
+                id=data.get("id"),
+                api_key_env=data.get("api_key_env", "PUBLER_API_KEY"),
+                requests_per_second=data.get("requests_per_second", DEFAULT_REQUESTS_PER_SECOND),
+            )
+            for name, data in json.loads(path.read_text()).items()
+        ]
+    ids = [part.strip() for part in os.getenv("PUBLER_WORKSPACE_ID", "").split(",") if part.strip()]
+    if not ids:
+        return [Workspace(DEFAULT_WORKSPACE)]
+    workspaces = []
+    for part in ids:
+        name, _, workspace_id = part.rpartition("=")
+        workspaces.append(Workspace(name=name or (DEFAULT_WORKSPACE if len(ids) == 1 else workspace_id),
+                                    id=workspace_id))
+    return workspaces
+
+
+def select(names: Optional[Iterable[str]] = None) -> list[Workspace]:
+    """Workspaces named in ``names`` (comma-separated entries allowed), or all of them."""
+    workspaces = load_workspaces()
+    wanted = [n.strip() for name in names or () for n in name.split(",") if n.strip()]
+    if not wanted or wanted == ["all"]:
+        return workspaces
+    by_name = {w.name: w for w in workspaces}
+    unknown = [name for name in wanted if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown workspace(s): {', '.join(unknown)} (configured: {', '.join(by_name)})")
+    return [by_name[name] for name in dict.fromkeys(wanted)]
+
+
+_current: ContextVar[Optional[Workspace]] = ContextVar("workspace", default=None)
+
+
+def current() -> Workspace:
+    """The workspace the caller is running for (the first configured one by default)."""
+    return _current.get() or load_workspaces()[0]
+
+
+@contextmanager
+def use(workspace: Workspace) -> Iterator[Workspace]:
+    """Make ``workspace`` current for the enclosed code."""
+    token = _current.set(workspace)
+    try:
+        yield workspace
+    finally:
+        _current.reset(token)
+
+
+def fan_out(
+    workspaces: list[Workspace],
+    task: Callable[[Workspace], T],
+    max_workers: Optional[int] = None,
+) -> tuple[dict[str, T], dict[str, Exception]]:
+    """Run ``task`` once per workspace, concurrently, each with its workspace current.
+
+    Returns ``(results, errors)`` keyed by workspace name; one workspace
+    failing does not stop the others. A single workspace runs inline.
+    """
+    def run(workspace: Workspace) -> T:
+        with use(workspace):
+            return task(workspace)
+
+    results: dict[str, T] = {}
+    errors: dict[str, Exception] = {}
+    if len(workspaces) == 1:
+        try:
+            results[workspaces[0].name] = run(workspaces[0])
+        except Exception as e:
+            errors[workspaces[0].name] = e
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(workspaces)) as pool:
+        futures = {w.name: pool.submit(copy_context().run, run, w) for w in workspaces}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+    return results, errors
+
+
+def merge_results(parts: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Concatenate the list values of per-workspace result dicts."""
+    merged: dict[str, Any] = {}
+    for part in parts:
+        for key, value in part.items():
+            if isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+            else:
+                merged.setdefault(key, value)
+    return merged
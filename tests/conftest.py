@@ -0,0 +1,32 @@
+"""Shared fixtures: an isolated workspace and, when needed, a fake Publer API."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.fake_publer import FakeConfig, FakePublerServer  # noqa: E402
+from benchmarks.workspace import isolated_workspace  # noqa: E402
+
+
+@pytest.fixture
+def workspace() -> Iterator[Path]:
+    """A temp dir holding every state path, with no API configured."""
+    with isolated_workspace() as root:
+        yield root
+
+
+@pytest.fixture
+def publer() -> Iterator[FakePublerServer]:
+    """A fake Publer API (no latency, jobs resolve at once) and an isolated workspace pointed at it."""
+    server = FakePublerServer(FakeConfig(latency=0, job_delay=0)).start()
+    try:
+        with isolated_workspace(server.base_url):
+            yield server
+    finally:
+        server.stop()
@@ -0,0 +1,44 @@
+"""Chunked conflict checks of streamed (.jsonl) plans."""
+
+from __future__ import annotations
+
+from argparse import Namespace
+
+import social
+from src.conflicts import validate_plan
+from src.planner import iter_plan, load_plan, save_plan
+from src.records import PlanItem
+
+
+def _plan() -> dict:
+    # Posts 10 minutes apart on one account, two per chunk of 2 items.
+    items = [
+        PlanItem(f"drafts/{i}.md", "twitter", f"2030-01-0{1 + i // 3}T09:{i % 3 * 10:02d}:00+00:00", "acct")
+        for i in range(6)
+    ]
+    return {"timezone": "UTC", "items": items}
+
+
+def test_streamed_check_matches_whole_plan_check(workspace, monkeypatch):
+    monkeypatch.setattr("src.planner.PLAN_CHUNK_SIZE", 2)
+    args = Namespace(min_gap="30m", max_per_day=2)
+    path = save_plan(_plan(), workspace / "plan.jsonl")
+
+    streamed = social._check_plan_file(path, args)
+    whole = validate_plan(load_plan(path), [], social._density_rules(args))
+
+    assert not streamed.ok
+    assert streamed.conflicts == whole.conflicts
+
+
+def test_streamed_fix_rewrites_the_plan(workspace, monkeypatch):
+    monkeypatch.setattr("src.planner.PLAN_CHUNK_SIZE", 2)
+    args = Namespace(min_gap="30m", max_per_day=2)
+    path = save_plan(_plan(), workspace / "plan.jsonl")
+
+    fixed = social._check_plan_file(path, args, fix=True)
+
+    items = [item for _, item in iter_plan(path)]
+    assert fixed.shifted == len([item for item in items if item.shifted_from]) > 0
+    assert [item.draft for item in items] == [item.draft for item in _plan()["items"]]
+    assert social._check_plan_file(path, args).ok
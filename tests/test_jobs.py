@@ -0,0 +1,42 @@
+"""Settling schedule jobs, including ones submitted outside a plan."""
+
+from __future__ import annotations
+
+from src.planner import resume_pending_jobs, settle_jobs
+from src.publer.jobs import COMPLETE, FAILED, PENDING, JobTracker, TrackedJob
+from src.publer.scheduler import PublerScheduler, ScheduleRequest
+from src.workspaces import load_workspaces
+
+
+def test_settle_jobs_reports_jobs_without_item_context(workspace):
+    posts = [{"network": "linkedin", "account_id": "acct-1", "scheduled_at": "2030-01-01T09:00:00+00:00"}]
+    jobs = [
+        TrackedJob("done", 0.0, {"posts": posts}, state=COMPLETE, duration=1.5),
+        TrackedJob("bad", 0.0, {}, state=FAILED, response={"payload": {"failures": {"acct-1": "rejected"}}}),
+        TrackedJob("running", 0.0, {}, state=PENDING),
+    ]
+
+    results = settle_jobs(jobs)
+
+    assert [s["job_id"] for s in results["successes"]] == ["done"]
+    assert "linkedin 2030-01-01T09:00:00+00:00" in results["successes"][0]["draft"]
+    assert len(results["failures"]) == 1 and "rejected" in results["failures"][0]["error"]
+    assert [p["job_id"] for p in results["pending"]] == ["running"]
+
+
+def test_jobs_clears_pending_jobs_without_item_context(publer):
+    account = publer.state.accounts[0]
+    client = load_workspaces()[0].client()
+    tracker = JobTracker(client)
+    request = ScheduleRequest(network=account["provider"], account_id=account["id"], text="hello",
+                              scheduled_at="2030-01-01T09:00:00+00:00")
+    # No wait: the job is saved as pending, as scripts/publish.py leaves it on a timeout.
+    [result] = PublerScheduler(client).schedule_many([request], job_timeout=0, tracker=tracker)
+    assert result.state == PENDING
+    assert tracker._read_state()
+
+    results = resume_pending_jobs(timeout=10)
+
+    assert [s["job_id"] for s in results["successes"]] == [result.job_id]
+    assert not results["pending"]
+    assert not tracker._read_state()
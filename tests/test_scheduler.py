@@ -0,0 +1,56 @@
+"""Per-post outcomes of schedule_many when Publer rejects some posts."""
+
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.fake_publer import FakeConfig, FakePublerServer
+from benchmarks.workspace import isolated_workspace
+from src.publer.jobs import COMPLETE, FAILED, TrackedJob
+from src.publer.scheduler import PublerScheduler, ScheduleRequest, _batch_results
+from src.workspaces import load_workspaces
+
+
+@pytest.fixture
+def rejecting_publer():
+    server = FakePublerServer(FakeConfig(latency=0, job_delay=0, reject_text="REJECT")).start()
+    try:
+        with isolated_workspace(server.base_url):
+            yield server
+    finally:
+        server.stop()
+
+
+def _requests(account_id: str) -> list[ScheduleRequest]:
+    return [
+        ScheduleRequest("linkedin", account_id, "fine", "2030-01-01T09:00:00+00:00"),
+        ScheduleRequest("linkedin", account_id, "REJECT me", "2030-01-01T10:00:00+00:00"),
+        ScheduleRequest("linkedin", account_id, "also fine", "2030-01-01T11:00:00+00:00"),
+    ]
+
+
+def test_one_rejected_post_does_not_fail_the_accounts_other_posts(rejecting_publer):
+    account = rejecting_publer.state.accounts[0]["id"]
+    client = load_workspaces()[0].client()
+
+    results = PublerScheduler(client).schedule_many(_requests(account), job_timeout=10)
+
+    assert [r.state for r in results] == [COMPLETE, FAILED, COMPLETE]
+    assert results[0].post_id and results[2].post_id
+    assert len(rejecting_publer.state.posts) == 2
+
+
+def test_batch_failures_map_to_posts_when_the_payload_identifies_them():
+    requests = _requests("acct-1")
+    job = TrackedJob("job", 0.0, state=FAILED, duration=1.0, response={"payload": {
+        "failures": {"acct-1": "Post rejected"},
+        "posts": [
+            {"id": "p1", "account_id": "acct-1", "scheduled_at": "2030-01-01T09:00:00+00:00"},
+            {"id": "p3", "account_id": "acct-1", "scheduled_at": "2030-01-01T11:00:00+00:00"},
+        ],
+    }})
+
+    results = _batch_results(requests, {"job_id": "job"}, None, job, waited=True)
+
+    assert [(r.state, r.post_id) for r in results] == [(COMPLETE, "p1"), (FAILED, None), (COMPLETE, "p3")]
+    assert results[1].error == "Post rejected"